@@ -0,0 +1,80 @@
+import argparse
+
+from src.benchmark import load_clips, run_benchmark, synthetic_clips, write_results
+from src.logger import logger
+from src.profiles import DEFAULT_LANGUAGE, PROFILES, decoding_options, parse_overrides
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark transcription speed, memory and accuracy")
+
+    parser.add_argument("--clips-dir", dest="clips_dir", default=None,
+                        help="Directory with audio clips; CLIP.txt next to CLIP.wav is its reference (default: synthetic clips)")
+
+    parser.add_argument("--models", dest="models", default="tiny,base,small",
+                        help="Comma-separated model sizes (default: tiny,base,small)")
+
+    parser.add_argument("--compute-types", dest="compute_types", default="int8,float32",
+                        help="Comma-separated compute types (default: int8,float32)")
+
+    parser.add_argument("--beam-sizes", dest="beam_sizes", default="1,5",
+                        help="Comma-separated beam sizes (default: 1,5)")
+
+    parser.add_argument("--profile", dest="profile", default=None, choices=list(PROFILES),
+                        help="Decoding profile for the other options; --beam-sizes still sets the beam (default: accurate)")
+
+    parser.add_argument("--language", dest="language", default=DEFAULT_LANGUAGE,
+                        help="Language code, or auto to detect it (default: pt)")
+
+    parser.add_argument("--decode-option", dest="decode_option", action="append", default=None, metavar="KEY=VALUE",
+                        help="Override a WhisperModel.transcribe option, e.g. vad_filter=false (repeatable)")
+
+    parser.add_argument("--device", dest="device", default="cpu", choices=["cpu", "cuda"],
+                        help="Processing device (default: cpu)")
+
+    parser.add_argument("--cpu-threads", dest="cpu_threads", type=int, default=0,
+                        help="CPU threads (default: 0 = all cores)")
+
+    parser.add_argument("--model-dir", dest="model_dir", default=None,
+                        help="Local model directory; models are loaded offline from it")
+
+    parser.add_argument("--output-json", dest="output_json", default="benchmark.json",
+                        help="JSON results file (default: benchmark.json)")
+
+    parser.add_argument("--output-csv", dest="output_csv", default="benchmark.csv",
+                        help="CSV results file (default: benchmark.csv)")
+
+    parser.add_argument("--no-isolate", dest="isolate", action="store_false",
+                        help="Run all combinations in this process (faster, but load times are warm and RSS is shared)")
+
+    args = parser.parse_args()
+
+    try:
+        clips = load_clips(args.clips_dir) if args.clips_dir else synthetic_clips()
+        if not clips:
+            logger.error("No clips to benchmark")
+            exit(1)
+
+        results = run_benchmark(
+            clips,
+            models=args.models.split(","),
+            compute_types=args.compute_types.split(","),
+            beam_sizes=[int(size) for size in args.beam_sizes.split(",")],
+            device=args.device,
+            cpu_threads=args.cpu_threads,
+            model_dir=args.model_dir,
+            isolate=args.isolate,
+            options=decoding_options(args.profile, args.language, parse_overrides(args.decode_option)),
+        )
+        write_results(results, args.output_json, args.output_csv)
+
+        if any(result.error for result in results):
+            exit(1)
+        logger.success("Benchmark completed!")
+    except Exception as e:
+        logger.error(f"Benchmark failed: {str(e)}")
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,116 @@
 import argparse
+import os
+from src.autotune import resolve_device
+from src.batch import collect_inputs, process_batch
+from src.cascade import DEFAULT_DRAFT_MODEL
+from src.writers import FORMATS, resolve_format
 from src.processor import process_input
+from src.profiles import DEFAULT_LANGUAGE, PROFILES, get_profile, parse_overrides
+from src.metrics import metrics
 from src.logger import logger
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Convert MP3 to text with faster-whisper")
-    parser.add_argument("--input", required=True, help="Input file path (MP3/WAV)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="Input file path (MP3/WAV)")
+    source.add_argument("--input-dir", dest="input_dir", help="Batch mode: directory with audio files")
+    source.add_argument("--manifest", dest="manifest", help="Batch mode: text file with one input path per line")
     parser.add_argument("--output", dest="output", default="transcription.txt", help="Output file for transcription")
-    parser.add_argument("--model", dest="model", default="large-v3", help="Whisper model (tiny, base, small, medium, large-v3)")
-    parser.add_argument("--device", dest="device", default="cpu", choices=["cpu", "cuda"], help="Processing device")
-    parser.add_argument("--compute-type", dest="compute_type", default="int8",
+    parser.add_argument("--format", dest="format", default=None, choices=FORMATS,
+                        help="Output format: txt, jsonl (timings and scores), srt, vtt (default: from --output extension, else txt)")
+    parser.add_argument("--glob", dest="glob", default="*",
+                        help="Batch mode: glob pattern inside --input-dir, ** is recursive (default: audio files)")
+    parser.add_argument("--output-dir", dest="output_dir", default="transcriptions",
+                        help="Batch mode: directory for transcriptions (default: transcriptions/)")
+    parser.add_argument("--summary", dest="summary", default=None,
+                        help="Batch mode: per-file summary file, .csv or .json (default: OUTPUT_DIR/summary.csv)")
+    parser.add_argument("--overwrite", dest="overwrite", action="store_true",
+                        help="Batch mode: transcribe again files whose output already exists")
+    parser.add_argument("--profile", dest="profile", default=None, choices=list(PROFILES),
+                        help="Decoding profile: fast (greedy, small), balanced (medium) or accurate (beam 5, large-v3, default)")
+    parser.add_argument("--model", dest="model", default=None,
+                        help="Whisper model (tiny, base, small, medium, large-v3; default: the profile's model)")
+    parser.add_argument("--language", dest="language", default=DEFAULT_LANGUAGE,
+                        help="Language code (pt, en, ...), or auto to detect it per file (default: pt)")
+    parser.add_argument("--decode-option", dest="decode_option", action="append", default=None, metavar="KEY=VALUE",
+                        help="Override a WhisperModel.transcribe option, e.g. beam_size=3 or vad_filter=false (repeatable)")
+    parser.add_argument("--device", dest="device", default="cpu", choices=["cpu", "cuda", "auto"],
+                        help="Processing device; auto calibrates once and reuses the fastest device/compute type/threads")
+    parser.add_argument("--compute-type", dest="compute_type", default=None,
                         choices=["int8", "int8_float16", "float16", "float32"],
-                        help="Quantization type (int8 recommended for CPU, float16 for GPU)")
+                        help="Quantization type (default: int8, or the tuned one with --device auto)")
+    parser.add_argument("--retune", dest="retune", action="store_true",
+                        help="With --device auto, calibrate again instead of using the stored result")
     parser.add_argument("--keep-wav", dest="keep_wav", action="store_true", help="Keep WAV file after conversion")
+    parser.add_argument("--cpu-threads", dest="cpu_threads", type=int, default=0,
+                        help="CPU threads for transcription, split between workers (default: 0 = all cores)")
+    parser.add_argument("--no-cache", dest="no_cache", action="store_true",
+                        help="Always transcribe, ignoring and not storing cached results")
+    parser.add_argument("--no-resume", dest="resume", action="store_false",
+                        help="Start over instead of resuming from the checkpoint of an interrupted run")
+    parser.add_argument("--chunk-workers", dest="chunk_workers", type=int, default=1,
+                        help="Long-audio mode: split at silences and transcribe N chunks in parallel (default: 1 = off)")
+    parser.add_argument("--cascade", dest="draft_model", nargs="?", const=DEFAULT_DRAFT_MODEL, default=None,
+                        choices=["tiny", "base", "small", "medium"], metavar="DRAFT_MODEL",
+                        help="Two-pass mode: draft with a fast model (default: small) and re-decode low-confidence "
+                             "parts with --model")
+    parser.add_argument("--preprocess", dest="preprocess", action="store_true",
+                        help="Trim silence, shorten long pauses and normalize loudness before transcribing")
+    parser.add_argument("--denoise", dest="denoise", action="store_true",
+                        help="Also apply spectral-gating noise reduction (implies --preprocess)")
+    parser.add_argument("--metrics-events", dest="metrics_events", default=None, metavar="PATH",
+                        help="Append per-stage timing events as JSON lines to PATH (- for stderr)")
+    parser.add_argument("--metrics-file", dest="metrics_file", default=None, metavar="PATH",
+                        help="Keep Prometheus text metrics in PATH (for node_exporter's textfile collector)")
+    parser.add_argument("--workers", dest="workers", type=int, default=1,
+                        help="Batch mode: parallel worker processes, each with its own model (default: 1)")
     
     args = parser.parse_args()
+    metrics.configure(args.metrics_events, args.metrics_file)
+    args.model = args.model or get_profile(args.profile).model
+    try:
+        args.decode_options = parse_overrides(args.decode_option)
+    except ValueError as e:
+        parser.error(str(e))
 
     try:
+        args.device, args.compute_type, args.cpu_threads = resolve_device(
+            args.model, args.device, args.compute_type, args.cpu_threads, args.retune
+        )
+
+        if args.input is None:
+            inputs = collect_inputs(args.input_dir, args.glob, args.manifest)
+            results = process_batch(
+                inputs,
+                args.output_dir,
+                model=args.model,
+                device=args.device,
+                compute_type=args.compute_type,
+                keep_wav=args.keep_wav,
+                overwrite=args.overwrite,
+                input_dir=args.input_dir,
+                summary_path=args.summary or os.path.join(args.output_dir, "summary.csv"),
+                workers=args.workers,
+                cpu_threads=args.cpu_threads,
+                no_cache=args.no_cache,
+                chunk_workers=args.chunk_workers,
+                output_format=args.format or "txt",
+                preprocess=args.preprocess,
+                denoise=args.denoise,
+                profile=args.profile,
+                language=args.language,
+                decode_options=args.decode_options,
+                resume=args.resume,
+                draft_model=args.draft_model,
+            )
+            if any(result.status == "failed" for result in results):
+                exit(1)
+            logger.success(f"Batch completed! Results saved to: {args.output_dir}")
+            return
+
+        args.format = resolve_format(args.output, args.format)
+        args.model_workers = 1
         process_input(args)
         logger.success(f"Transcription completed! Result saved to: {args.output}")
     except Exception as e:
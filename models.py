@@ -0,0 +1,80 @@
+import argparse
+
+from src.logger import logger
+from src.model_store import DEFAULT_STORE_DIR, ModelStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the local store of Whisper models")
+    parser.add_argument("--store", dest="store", default=DEFAULT_STORE_DIR,
+                        help="Model store directory (default: SPEECH2TEXT_MODEL_DIR or ~/.cache/speech2text/models)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="Download models into the store and record their checksums")
+    fetch.add_argument("models", nargs="+", help="Model sizes (tiny ... large-v3) or CTranslate2 hub repositories")
+    fetch.add_argument("--convert-from", dest="convert_from", default=None,
+                       help="Convert this Transformers Whisper checkpoint instead (needs transformers; one model)")
+    fetch.add_argument("--quantization", dest="quantization", default=None,
+                       choices=["int8", "int8_float16", "float16", "float32"],
+                       help="Weight type when converting with --convert-from (default: float16)")
+
+    verify = commands.add_parser("verify", help="Check stored files against their sizes and checksums")
+    verify.add_argument("models", nargs="*", help="Models to verify (default: all)")
+
+    warm = commands.add_parser("warm", help="Read stored models into the page cache (e.g. at boot)")
+    warm.add_argument("models", nargs="+", help="Models to warm")
+
+    commands.add_parser("list", help="List stored models")
+
+    remove = commands.add_parser("remove", help="Delete models from the store")
+    remove.add_argument("models", nargs="+", help="Models to delete")
+
+    args = parser.parse_args()
+    store = ModelStore(args.store)
+
+    try:
+        if args.command == "fetch":
+            if args.convert_from and len(args.models) > 1:
+                parser.error("--convert-from converts a single model")
+            if args.quantization and not args.convert_from:
+                parser.error("--quantization only applies with --convert-from")
+            for model in args.models:
+                store.fetch(model, args.convert_from, args.quantization)
+
+        elif args.command == "verify":
+            failed = False
+            for model in args.models or [stored.name for stored in store.models()]:
+                problems = store.verify(model)
+                for problem in problems:
+                    logger.error(f"{model}: {problem}")
+                if not problems:
+                    logger.success(f"{model}: OK")
+                failed = failed or bool(problems)
+            if failed:
+                exit(1)
+
+        elif args.command == "warm":
+            for model in args.models:
+                if not store.warm(model):
+                    logger.warning(f"{model} is not in the store")
+
+        elif args.command == "list":
+            stored = store.models()
+            if not stored:
+                logger.info(f"No models in {store.root}")
+            for model in stored:
+                logger.info(f"{model.name:<12} {model.size_bytes / 1e6:>8.0f}MB  {model.source}")
+
+        elif args.command == "remove":
+            for model in args.models:
+                if store.remove(model):
+                    logger.info(f"Removed {model}")
+                else:
+                    logger.warning(f"{model} is not in the store")
+    except Exception as e:
+        logger.error(f"{args.command.capitalize()} failed: {str(e)}")
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
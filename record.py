@@ -1,6 +1,7 @@
 import argparse
 from typing import Optional
-from src.audio_recorder import record_system_audio, record_microphone, list_audio_devices
+from src.audio_recorder import record_system_audio, record_microphone, list_audio_devices, set_input_stream
+from src.replay_device import replay_stream_factory
 from src.logger import logger
 from datetime import datetime
 import os
@@ -14,10 +15,17 @@ def main() -> None:
                         help="Recording mode: 'system' for PC output, 'microphone'/'mic' for mic input")
 
     parser.add_argument("--output", dest="output", default=None,
-                        help="Output WAV file (default: recording_TIMESTAMP.wav)")
+                        help="Output WAV/FLAC file (default: recording_TIMESTAMP.<format>)")
 
     parser.add_argument("--duration", dest="duration", type=int, default=10,
-                        help="Recording duration in seconds (default: 10)")
+                        help="Recording duration in seconds, 0 = until Ctrl+C/SIGTERM (default: 10)")
+
+    parser.add_argument("--format", dest="format", default="wav", choices=["wav", "flac"],
+                        help="File format for the default output name (default: wav)")
+
+    parser.add_argument("--subtype", dest="subtype", default="PCM_16",
+                        choices=["PCM_16", "PCM_24", "FLOAT"],
+                        help="Sample format written to disk (default: PCM_16)")
 
     parser.add_argument("--sample-rate", dest="sample_rate", type=int, default=16000,
                         help="Sample rate in Hz (default: 16000, optimal for Whisper)")
@@ -28,6 +36,12 @@ def main() -> None:
     parser.add_argument("--list-devices", dest="list_devices", action="store_true",
                         help="List all available audio devices and exit")
 
+    parser.add_argument("--replay", dest="replay", default=None, metavar="FILE",
+                        help="Simulate the input device by replaying an audio file (no audio hardware needed)")
+
+    parser.add_argument("--replay-speed", dest="replay_speed", type=float, default=1.0,
+                        help="Replay rate: 1 = real time, 10 = ten times faster, 0 = as fast as possible (default: 1)")
+
     args = parser.parse_args()
 
     # List devices and exit if requested
@@ -35,10 +49,13 @@ def main() -> None:
         list_audio_devices()
         return
 
+    if args.replay:
+        set_input_stream(replay_stream_factory(args.replay, args.replay_speed))
+
     # Generate default output filename if not provided
     if args.output is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        args.output = f"recording_{timestamp}.wav"
+        args.output = f"recording_{timestamp}.{args.format}"
 
     # Ensure output directory exists
     output_dir = os.path.dirname(args.output)
@@ -50,15 +67,17 @@ def main() -> None:
         if args.mode == "system":
             success = record_system_audio(
                 args.output,
-                duration=args.duration,
+                duration=args.duration or None,
                 sample_rate=args.sample_rate,
-                device=args.device
+                device=args.device,
+                subtype=args.subtype
             )
         else:  # microphone or mic
             success = record_microphone(
                 args.output,
-                duration=args.duration,
-                sample_rate=args.sample_rate
+                duration=args.duration or None,
+                sample_rate=args.sample_rate,
+                subtype=args.subtype
             )
 
         if success:
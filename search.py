@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+from dataclasses import asdict
+
+from src.logger import logger
+from src.transcript_index import (
+    DEFAULT_INDEX_PATH,
+    TranscriptIndex,
+    default_index_path,
+    load_transcript,
+    parse_timestamp,
+)
+from src.writers import format_timestamp
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Search the index of transcripts")
+    parser.add_argument("--index", dest="index", default=None,
+                        help=f"Index database (default: SPEECH2TEXT_INDEX or {DEFAULT_INDEX_PATH})")
+    parser.add_argument("--json", dest="json", action="store_true",
+                        help="Print one JSON object per result (timestamps in milliseconds)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    find = commands.add_parser("find", help="Segments containing all the words, best matches first")
+    find.add_argument("query", nargs="+", help="Words to search for")
+    find.add_argument("--source", dest="source", default=None,
+                      help="Only sources matching this glob, e.g. '/archive/2024-*'")
+    find.add_argument("--model", dest="model", default=None, help="Only transcripts made with this model")
+    find.add_argument("--limit", dest="limit", type=int, default=20, help="Most results (default: 20)")
+    find.add_argument("--raw", dest="raw", action="store_true",
+                      help="Use FTS5 query syntax: \"exact phrase\", OR, NOT, NEAR(a b), prefix*")
+
+    at = commands.add_parser("at", help="What was said in a recording at a time or between two times")
+    at.add_argument("source", help="Indexed source (audio path)")
+    at.add_argument("start", help="Time as seconds or [HH:]MM:SS[.mmm]")
+    at.add_argument("end", nargs="?", default=None, help="End of the range (default: the start instant)")
+
+    add = commands.add_parser("add", help="Index existing transcripts (txt, jsonl, srt or vtt outputs)")
+    add.add_argument("files", nargs="+", help="Transcript files; each is indexed under its own path")
+
+    commands.add_parser("list", help="List indexed transcripts")
+
+    remove = commands.add_parser("remove", help="Remove sources from the index")
+    remove.add_argument("sources", nargs="+", help="Sources to remove")
+
+    commands.add_parser("optimize", help="Merge the full-text index after large imports")
+
+    args = parser.parse_args()
+    path = args.index or default_index_path()
+    if path is None:
+        parser.error("indexing is off (SPEECH2TEXT_INDEX); pass --index")
+    index = TranscriptIndex(path)
+
+    try:
+        if args.command == "find":
+            hits = index.search(" ".join(args.query), args.limit, args.source, args.model, args.raw)
+            for hit in hits:
+                if args.json:
+                    print(json.dumps(asdict(hit), ensure_ascii=False))
+                else:
+                    print(f"{hit.source}  {format_timestamp(hit.start_ms / 1000)} --> "
+                          f"{format_timestamp(hit.end_ms / 1000)} [{hit.start_ms}ms]  {hit.snippet}")
+            if not hits:
+                logger.info("No matches")
+
+        elif args.command == "at":
+            start_ms = round(parse_timestamp(args.start) * 1000)
+            end_ms = round(parse_timestamp(args.end) * 1000) if args.end else None
+            for hit in index.at(os.path.abspath(args.source) if os.path.exists(args.source) else args.source,
+                                start_ms, end_ms):
+                if args.json:
+                    print(json.dumps(asdict(hit), ensure_ascii=False))
+                else:
+                    print(f"{format_timestamp(hit.start_ms / 1000)} --> {format_timestamp(hit.end_ms / 1000)}  "
+                          f"{hit.text}")
+
+        elif args.command == "add":
+            for file in args.files:
+                segments = load_transcript(file)
+                index.add(os.path.abspath(file), segments, output=os.path.abspath(file))
+                logger.info(f"Indexed {file} ({len(segments)} segments)")
+
+        elif args.command == "list":
+            for transcript in index.transcripts():
+                if args.json:
+                    print(json.dumps(asdict(transcript), ensure_ascii=False))
+                else:
+                    print(f"{transcript.source}  {transcript.segments} segments, "
+                          f"{format_timestamp(transcript.duration_ms / 1000)}  {transcript.model}")
+
+        elif args.command == "remove":
+            for source in args.sources:
+                if index.remove(source):
+                    logger.info(f"Removed {source}")
+                else:
+                    logger.warning(f"{source} is not in the index")
+
+        elif args.command == "optimize":
+            index.optimize()
+            logger.success(f"Optimized {path}")
+    except Exception as e:
+        logger.error(f"{args.command.capitalize()} failed: {str(e)}")
+        exit(1)
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import asyncio
+
+from src.autotune import resolve_device
+from src.logger import logger
+from src.metrics import metrics
+from src.profiles import DEFAULT_LANGUAGE, PROFILES, decoding_options, get_profile, parse_overrides
+from src.server import TranscriptionServer, TranscriptionService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local HTTP transcription service with a warm model")
+
+    parser.add_argument("--host", dest="host", default="127.0.0.1",
+                        help="Address to listen on (default: 127.0.0.1)")
+
+    parser.add_argument("--port", dest="port", type=int, default=8000,
+                        help="Port to listen on (default: 8000)")
+
+    parser.add_argument("--profile", dest="profile", default=None, choices=list(PROFILES),
+                        help="Default decoding profile: fast, balanced or accurate (default: accurate)")
+
+    parser.add_argument("--model", dest="model", default=None,
+                        choices=["tiny", "base", "small", "medium", "large-v3"],
+                        help="Whisper model kept loaded (default: the profile's model)")
+
+    parser.add_argument("--language", dest="language", default=DEFAULT_LANGUAGE,
+                        help="Default language code, or auto to detect it per job (default: pt)")
+
+    parser.add_argument("--decode-option", dest="decode_option", action="append", default=None, metavar="KEY=VALUE",
+                        help="Override a WhisperModel.transcribe option, e.g. beam_size=3 (repeatable)")
+
+    parser.add_argument("--device", dest="device", default="cpu", choices=["cpu", "cuda", "auto"],
+                        help="Processing device; auto uses the fastest calibrated configuration (default: cpu)")
+
+    parser.add_argument("--compute-type", dest="compute_type", default=None,
+                        choices=["int8", "int8_float16", "float16", "float32"],
+                        help="Quantization type (default: int8, or the tuned one with --device auto)")
+
+    parser.add_argument("--retune", dest="retune", action="store_true",
+                        help="With --device auto, calibrate again instead of using the stored result")
+
+    parser.add_argument("--workers", dest="workers", type=int, default=2,
+                        help="Jobs decoded concurrently on the shared model (default: 2)")
+
+    parser.add_argument("--cpu-threads", dest="cpu_threads", type=int, default=0,
+                        help="Total CPU threads, split between workers (default: 0 = all cores)")
+
+    parser.add_argument("--max-queue", dest="max_queue", type=int, default=32,
+                        help="Jobs waiting before new ones are refused with 503 (default: 32)")
+
+    parser.add_argument("--batch-size", dest="batch_size", type=int, default=8,
+                        help="Short clips decoded together in one batch, 1 = no batching (default: 8)")
+
+    parser.add_argument("--batch-window-ms", dest="batch_window_ms", type=int, default=50,
+                        help="How long a short clip waits for others to batch with (default: 50)")
+
+    parser.add_argument("--metrics-events", dest="metrics_events", default=None, metavar="PATH",
+                        help="Append per-stage timing events as JSON lines to PATH (- for stderr)")
+
+    parser.add_argument("--max-upload-mb", dest="max_upload_mb", type=int, default=512,
+                        help="Largest accepted upload (default: 512)")
+
+    args = parser.parse_args()
+    metrics.configure(args.metrics_events)
+
+    try:
+        options = decoding_options(args.profile, args.language, parse_overrides(args.decode_option))
+    except ValueError as e:
+        parser.error(str(e))
+
+    model = args.model or get_profile(args.profile).model
+    device, compute_type, cpu_threads = resolve_device(
+        model, args.device, args.compute_type, args.cpu_threads, args.retune
+    )
+
+    service = TranscriptionService(
+        model=model,
+        device=device,
+        compute_type=compute_type,
+        workers=args.workers,
+        cpu_threads=cpu_threads,
+        max_queue=args.max_queue,
+        batch_size=args.batch_size,
+        batch_window=args.batch_window_ms / 1000,
+        options=options,
+    )
+    server = TranscriptionServer(service, max_upload_mb=args.max_upload_mb)
+
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        logger.info("Server stopped")
+    except Exception as e:
+        logger.error(f"Server failed: {str(e)}")
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,22 @@
 import os
 import subprocess
+from collections.abc import Iterator
+from math import gcd
+from typing import TYPE_CHECKING
 
+import numpy as np
+import soundfile as sf
+
+from .lazy import lazy_import
 from .logger import logger
 
+if TYPE_CHECKING:
+    import av
+else:
+    av = lazy_import("av")
+
+SAMPLE_RATE = 16000
+
 
 def converter_mp3_to_wav(input_mp3: str, output_wav: str) -> bool:
     """Converts MP3 file to WAV with optimized configuration for transcription"""
@@ -44,6 +58,13 @@ def verify_audio(wav_path: str) -> bool:
             return False
 
         logger.info("Verifying WAV file...")
+        try:
+            info = sf.info(wav_path)
+            logger.debug(f"sample_rate={info.samplerate} channels={info.channels} subtype={info.subtype}")
+            return True
+        except Exception:
+            pass  # not readable by libsndfile, ask ffprobe
+
         cmd = [
             'ffprobe',
             '-v', 'error',
@@ -59,4 +80,157 @@ def verify_audio(wav_path: str) -> bool:
         return False
     except Exception as e:
         logger.error(f"Error during checking: {str(e)}")
-        return False
\ No newline at end of file
+        return False
+
+
+def resample_poly(audio: np.ndarray, orig_rate: int, target_rate: int) -> np.ndarray:
+    """Resample with a windowed-sinc polyphase filter (vectorized, no SciPy)
+
+    The rate ratio is reduced to up/down integers. Output samples k, k + up,
+    k + 2*up... use the same filter phase and input positions `down` apart,
+    so each of the `up` phases is one matrix-vector product over a strided
+    (zero-copy) view of the input.
+
+    Args:
+        audio: Mono float32 samples
+        orig_rate: Input sample rate in Hz
+        target_rate: Output sample rate in Hz
+    """
+    if orig_rate == target_rate or len(audio) == 0:
+        return audio.astype(np.float32, copy=False)
+
+    g = gcd(orig_rate, target_rate)
+    up, down = target_rate // g, orig_rate // g
+    ratio = max(up, down)
+
+    # Low-pass at the lower Nyquist frequency, with gain `up` to undo zero-stuffing
+    half = 10 * ratio
+    i = np.arange(-half, half + 1)
+    h = (up / ratio) * np.sinc(i / ratio) * np.kaiser(2 * half + 1, 5.0)
+
+    # Filter bank: row p holds the taps for output phase p = (k * down) % up
+    phases = np.arange(up)
+    first = -((half - phases) // up)  # first input offset relative to k*down//up
+    taps = (2 * half) // up + 1
+    index = phases[:, None] - (first[:, None] + np.arange(taps)) * up + half
+    valid = (index >= 0) & (index <= 2 * half)
+    bank = np.where(valid, h[np.clip(index, 0, 2 * half)], 0.0).astype(np.float32)
+
+    n_out = -(-len(audio) * up // down)
+    pad = int(-first.min())
+    padded = np.concatenate([np.zeros(pad, np.float32), audio.astype(np.float32, copy=False),
+                             np.zeros(pad + taps, np.float32)])
+    step = padded.strides[0]
+
+    out = np.empty(n_out, dtype=np.float32)
+    for k in range(min(up, n_out)):
+        t = k * down
+        phase = t % up
+        start = t // up + first[phase] + pad
+        count = (n_out - 1 - k) // up + 1
+        windows = np.lib.stride_tricks.as_strided(
+            padded[start:], shape=(count, taps), strides=(down * step, step), writeable=False
+        )
+        out[k::up] = windows @ bank[phase]
+    return out
+
+
+def _read_soundfile(input_path: str) -> tuple[np.ndarray, int]:
+    """Decode with libsndfile (WAV, FLAC, OGG, MP3) and mix down to mono"""
+    data, rate = sf.read(input_path, dtype='float32', always_2d=True)
+    return data.mean(axis=1) if data.shape[1] > 1 else data[:, 0], int(rate)
+
+
+def iter_pyav(
+    input_path: str,
+    sample_format: str = "fltp",
+    rate: int | None = None,
+    layout: str | None = None,
+) -> Iterator[tuple[np.ndarray, int]]:
+    """Decode the first audio stream with PyAV, yielding (samples, sample rate) blocks
+
+    Args:
+        input_path: Any file the bundled FFmpeg libraries can open (M4A, AAC, Opus, video...)
+        sample_format: PyAV sample format; planar formats (fltp, s16p) give (channels, n) blocks
+        rate: Output sample rate (None = the stream's own rate)
+        layout: Output channel layout, e.g. mono (None = the stream's own layout)
+    """
+    with av.open(input_path) as container:
+        stream = container.streams.audio[0]
+        resampler = av.AudioResampler(format=sample_format, layout=layout, rate=rate or stream.rate)
+        for frame in container.decode(stream):
+            for out in resampler.resample(frame):
+                yield out.to_ndarray(), out.sample_rate
+        for out in resampler.resample(None):
+            yield out.to_ndarray(), out.sample_rate
+
+
+def _read_pyav(input_path: str) -> tuple[np.ndarray, int]:
+    """Decode with PyAV at the native rate and mix down to mono like _read_soundfile"""
+    blocks = list(iter_pyav(input_path))
+    if not blocks:
+        raise ValueError("no audio frames")
+    audio = np.concatenate([samples for samples, _ in blocks], axis=1).mean(axis=0)
+    return audio.astype(np.float32, copy=False), blocks[0][1]
+
+
+def _decode_ffmpeg(input_path: str, sample_rate: int) -> np.ndarray | None:
+    """Decode through an ffmpeg subprocess writing 16-bit PCM to a pipe"""
+    try:
+        cmd = [
+            'ffmpeg',
+            '-nostdin',
+            '-i', input_path,
+            '-f', 's16le',
+            '-ar', str(sample_rate),
+            '-ac', '1',
+            '-acodec', 'pcm_s16le',
+            '-loglevel', 'error',
+            '-'
+        ]
+
+        result = subprocess.run(cmd, check=True, capture_output=True)
+        return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Error in decoding:\n{e.stderr.decode(errors='replace')}")
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+
+    return None
+
+
+def decode_audio(input_path: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray | None:
+    """Decode an audio file in memory to a mono float32 array for transcription
+
+    Decoding happens in-process: libsndfile for WAV/FLAC/OGG/MP3, then PyAV
+    for other containers (M4A, AAC, video). The ffmpeg binary is only run if
+    both fail. Audio is resampled to sample_rate with resample_poly.
+
+    Args:
+        input_path: Audio file path
+        sample_rate: Target sample rate in Hz
+
+    Returns:
+        Samples in [-1, 1] as float32, or None if decoding failed
+    """
+    if not os.path.exists(input_path):
+        logger.error(f"File {input_path} not found!")
+        return None
+
+    logger.info("Decoding audio...")
+
+    audio: np.ndarray | None = None
+    for read in (_read_soundfile, _read_pyav):
+        try:
+            decoded, rate = read(input_path)
+            audio = resample_poly(decoded, rate, sample_rate)
+            break
+        except Exception as e:
+            logger.debug(f"{read.__name__} could not decode {input_path}: {str(e)}")
+    else:
+        audio = _decode_ffmpeg(input_path, sample_rate)
+
+    if audio is not None:
+        logger.success(f"Decoding completed: {len(audio) / sample_rate:.1f}s ({sample_rate // 1000}kHz, mono)")
+    return audio
@@ -1,13 +1,141 @@
-from typing import Optional, Tuple, List, Any
+import queue
+import signal
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
-import sounddevice as sd
 import soundfile as sf
 import numpy as np
 from datetime import datetime
+from .lazy import lazy_import
 from .logger import logger
+from .metrics import metrics
+from .replay_device import replay_from_env
 
+if TYPE_CHECKING:
+    import sounddevice as sd
+else:
+    sd = lazy_import("sounddevice")
 
-def list_audio_devices() -> List[Any]:
+# Replaces sd.InputStream when set (see src.replay_device), e.g. to run without audio hardware
+_input_stream: Callable[..., Any] | None = None
+
+
+def set_input_stream(factory: Callable[..., Any] | None) -> None:
+    """Open input streams with factory (same arguments as sd.InputStream); None restores real devices"""
+    global _input_stream
+    _input_stream = factory
+
+
+def simulated_input() -> bool:
+    """True when input comes from a replay device instead of sounddevice"""
+    return _input_stream is not None or replay_from_env() is not None
+
+
+def open_input_stream(**kwargs: Any) -> Any:
+    """sd.InputStream, or the simulated device set with set_input_stream or SPEECH2TEXT_REPLAY_INPUT"""
+    factory = _input_stream or replay_from_env()
+    if factory is None:
+        return sd.InputStream(**kwargs)
+    return factory(**kwargs)
+
+
+@dataclass
+class CaptureStats:
+    """Health of an input stream, updated from its callback
+
+    Overflows and underflows are the flags PortAudio reports. Dropped frames
+    are gaps between the ADC timestamps of consecutive blocks, which also
+    catches audio lost without a flag; gaps up to half a block are timestamp
+    jitter and not counted. Jitter is the spread of the intervals
+    between callbacks; latency is how long a block waited in the host buffer
+    before its callback ran. max_queue_blocks is the high-water mark of
+    blocks waiting for the writer.
+    """
+
+    sample_rate: int = 16000
+    callbacks: int = 0
+    frames: int = 0
+    overflows: int = 0
+    underflows: int = 0
+    dropped_frames: int = 0
+    max_queue_blocks: int = 0
+    max_latency_ms: float = 0.0
+    max_interval_ms: float = 0.0
+    _intervals: int = field(default=0, repr=False)
+    _interval_mean: float = field(default=0.0, repr=False)
+    _interval_m2: float = field(default=0.0, repr=False)
+    _last_callback: float | None = field(default=None, repr=False)
+    _next_adc: float | None = field(default=None, repr=False)
+
+    def on_callback(self, frames: int, time_info: Any, status: Any, now: float | None = None) -> None:
+        now = time.perf_counter() if now is None else now
+        self.callbacks += 1
+        self.frames += frames
+        if getattr(status, "input_overflow", False):
+            self.overflows += 1
+        if getattr(status, "input_underflow", False):
+            self.underflows += 1
+
+        if self._last_callback is not None:
+            # Welford's running variance of the callback interval
+            interval = now - self._last_callback
+            self._intervals += 1
+            delta = interval - self._interval_mean
+            self._interval_mean += delta / self._intervals
+            self._interval_m2 += delta * (interval - self._interval_mean)
+            self.max_interval_ms = max(self.max_interval_ms, interval * 1000)
+        self._last_callback = now
+
+        adc = getattr(time_info, "inputBufferAdcTime", 0.0)
+        current = getattr(time_info, "currentTime", 0.0)
+        if current:  # some host APIs leave the timestamps at 0
+            if self._next_adc is not None:
+                gap = round((adc - self._next_adc) * self.sample_rate)
+                if gap > frames / 2:
+                    self.dropped_frames += gap
+            self._next_adc = adc + frames / self.sample_rate
+            self.max_latency_ms = max(self.max_latency_ms, (current - adc) * 1000)
+
+    def on_queue(self, depth: int) -> None:
+        self.max_queue_blocks = max(self.max_queue_blocks, depth)
+
+    @property
+    def jitter_ms(self) -> float:
+        """Standard deviation of the interval between callbacks"""
+        if self._intervals < 2:
+            return 0.0
+        return float((self._interval_m2 / (self._intervals - 1)) ** 0.5 * 1000)
+
+    @property
+    def dropouts(self) -> bool:
+        return bool(self.overflows or self.underflows or self.dropped_frames)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "callbacks": self.callbacks,
+            "frames": self.frames,
+            "overflows": self.overflows,
+            "underflows": self.underflows,
+            "dropped_frames": self.dropped_frames,
+            "max_queue_blocks": self.max_queue_blocks,
+            "jitter_ms": round(self.jitter_ms, 3),
+            "max_interval_ms": round(self.max_interval_ms, 3),
+            "max_latency_ms": round(self.max_latency_ms, 3),
+        }
+
+    def summary(self) -> str:
+        return (
+            f"{self.callbacks} blocks, {self.overflows} overflows, {self.underflows} underflows, "
+            f"{self.dropped_frames / self.sample_rate:.2f}s dropped, jitter {self.jitter_ms:.1f}ms "
+            f"(max gap {self.max_interval_ms:.0f}ms), queue high-water {self.max_queue_blocks} blocks"
+        )
+
+
+def list_audio_devices() -> list[Any]:
     """List all available audio devices"""
     logger.info("Available audio devices:")
     devices = sd.query_devices()
@@ -16,7 +144,7 @@ def list_audio_devices() -> List[Any]:
     return devices
 
 
-def find_monitor_device() -> Tuple[int, str]:
+def find_monitor_device() -> tuple[int, str]:
     """Find PulseAudio/PipeWire monitor device for system audio capture"""
     devices = sd.query_devices()
 
@@ -31,87 +159,194 @@ def find_monitor_device() -> Tuple[int, str]:
     return default_input['index'], default_input['name']
 
 
+@contextmanager
+def stop_on_signals(stop_event: threading.Event) -> Iterator[None]:
+    """Set stop_event on SIGINT/SIGTERM instead of raising, restoring handlers afterwards"""
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def handler(signum: int, frame: Any) -> None:
+        logger.info("Stop requested, finishing recording...")
+        stop_event.set()
+
+    previous = {sig: signal.signal(sig, handler) for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        yield
+    finally:
+        for sig, old in previous.items():
+            signal.signal(sig, old)
+
+
+def record_stream(
+    output_file: str,
+    duration: float | None = None,
+    sample_rate: int = 16000,
+    device: int | None = None,
+    subtype: str = "PCM_16",
+    stop_event: threading.Event | None = None,
+    block_duration: float = 0.5,
+    on_block: Callable[[np.ndarray], None] | None = None,
+    stats: CaptureStats | None = None,
+) -> bool:
+    """Record from an input device straight to disk, block by block
+
+    Memory use is constant regardless of length and everything captured so
+    far is on disk if the process dies. The file format follows the output
+    extension (.wav, .flac, .ogg).
+
+    Args:
+        output_file: Path to save the recording
+        duration: Recording duration in seconds (None = until stopped)
+        sample_rate: Sample rate in Hz
+        device: Audio device index (None = default input)
+        subtype: soundfile subtype, e.g. PCM_16, PCM_24, FLOAT
+        stop_event: Event that ends the recording when set; SIGINT/SIGTERM set it too
+        block_duration: Seconds of audio per block handed to the writer
+        on_block: Called with each mono block after it is written (e.g. to transcribe while recording)
+        stats: Collects overflow, dropout, jitter and buffering counters (a fresh one if None)
+
+    Returns:
+        True if recording successful, False otherwise
+    """
+    stop_event = stop_event or threading.Event()
+    blocks: queue.Queue[np.ndarray] = queue.Queue()
+    max_frames = int(duration * sample_rate) if duration else None
+    stats = stats or CaptureStats(sample_rate=sample_rate)
+
+    def callback(indata: np.ndarray, frames: int, time_info: Any, status: Any) -> None:
+        stats.on_callback(frames, time_info, status)
+        if status:
+            logger.warning(f"Audio input status: {status}")
+        blocks.put(indata.copy())
+        stats.on_queue(blocks.qsize())
+
+    try:
+        written = 0
+        opened = time.perf_counter()
+        with (
+            sf.SoundFile(output_file, mode="w", samplerate=sample_rate, channels=1, subtype=subtype) as out,
+            stop_on_signals(stop_event),
+            open_input_stream(
+                samplerate=sample_rate,
+                channels=1,
+                device=device,
+                dtype='float32',
+                blocksize=int(block_duration * sample_rate),
+                callback=callback,
+            ) as stream,
+        ):
+            metrics.observe("device_open", time.perf_counter() - opened, device=device)
+            started = time.perf_counter()
+            while not stop_event.is_set() and (max_frames is None or written < max_frames):
+                try:
+                    block = blocks.get(timeout=0.1)
+                except queue.Empty:
+                    # A replayed file ends; blocks put before that are drained first
+                    if not getattr(stream, "active", True) and blocks.empty():
+                        break
+                    continue
+                if max_frames is not None:
+                    block = block[:max_frames - written]
+                out.write(block)
+                written += len(block)
+                if on_block is not None:
+                    on_block(block[:, 0])
+
+        metrics.observe("capture", time.perf_counter() - started, ok=not stats.dropouts, **stats.as_dict())
+        if stats.dropouts:
+            logger.warning(f"Audio dropouts while recording: {stats.summary()}")
+        else:
+            logger.debug(f"Capture: {stats.summary()}")
+        logger.success(f"Recording saved: {output_file} ({written / sample_rate:.1f}s)")
+        return True
+
+    except Exception as e:
+        logger.error(f"Recording failed: {str(e)}")
+        return False
+
+
+@metrics.timed("record")
 def record_system_audio(
     output_file: str,
-    duration: int = 10,
+    duration: int | None = 10,
     sample_rate: int = 16000,
-    device: Optional[int] = None,
+    device: int | None = None,
+    subtype: str = "PCM_16",
+    stop_event: threading.Event | None = None,
+    on_block: Callable[[np.ndarray], None] | None = None,
+    stats: CaptureStats | None = None,
 ) -> bool:
     """Record system audio output (what's playing on your computer)
 
     Args:
-        output_file: Path to save the recording (WAV format)
-        duration: Recording duration in seconds
+        output_file: Path to save the recording (WAV, or FLAC by extension)
+        duration: Recording duration in seconds (None = until stopped by signal or stop_event)
         sample_rate: Sample rate in Hz (16000 recommended for Whisper)
         device: Audio device index (None = auto-detect monitor)
+        subtype: soundfile subtype, e.g. PCM_16, PCM_24, FLOAT
+        stop_event: Event that ends an open-ended recording
+        on_block: Called with each recorded block, as soon as it is on disk
+        stats: Collects overflow, dropout, jitter and buffering counters
 
     Returns:
         True if recording successful, False otherwise
     """
     try:
-        if device is None:
+        if simulated_input():
+            logger.info("Using simulated input device")
+        elif device is None:
             device, device_name = find_monitor_device()
             logger.info(f"Auto-detected device: {device_name}")
         else:
             device_name = sd.query_devices(device)['name']
             logger.info(f"Using device: {device_name}")
-
-        logger.info(f"Recording system audio for {duration} seconds...")
-        logger.debug(f"Sample rate: {sample_rate}Hz")
-
-        # Record audio
-        recording = sd.rec(
-            int(duration * sample_rate),
-            samplerate=sample_rate,
-            channels=1,
-            device=device,
-            dtype='float32'
-        )
-
-        sd.wait()  # Wait until recording is finished
-
-        # Save to file
-        sf.write(output_file, recording, sample_rate)
-
-        logger.success(f"Recording saved: {output_file}")
-        return True
-
     except Exception as e:
         logger.error(f"Recording failed: {str(e)}")
         logger.info("Tip: Try listing devices with --list-devices to find the correct monitor device")
         return False
 
+    if duration:
+        logger.info(f"Recording system audio for {duration} seconds...")
+    else:
+        logger.info("Recording system audio until stopped (Ctrl+C)...")
+    logger.debug(f"Sample rate: {sample_rate}Hz")
+
+    success = record_stream(
+        output_file, duration, sample_rate, device, subtype, stop_event, on_block=on_block, stats=stats
+    )
+    if not success:
+        logger.info("Tip: Try listing devices with --list-devices to find the correct monitor device")
+    return success
 
-def record_microphone(output_file: str, duration: int = 10, sample_rate: int = 16000) -> bool:
+
+@metrics.timed("record")
+def record_microphone(
+    output_file: str,
+    duration: int | None = 10,
+    sample_rate: int = 16000,
+    subtype: str = "PCM_16",
+    stop_event: threading.Event | None = None,
+    stats: CaptureStats | None = None,
+) -> bool:
     """Record from microphone
 
     Args:
-        output_file: Path to save the recording (WAV format)
-        duration: Recording duration in seconds
+        output_file: Path to save the recording (WAV, or FLAC by extension)
+        duration: Recording duration in seconds (None = until stopped by signal or stop_event)
         sample_rate: Sample rate in Hz
+        subtype: soundfile subtype, e.g. PCM_16, PCM_24, FLOAT
+        stop_event: Event that ends an open-ended recording
+        stats: Collects overflow, dropout, jitter and buffering counters
 
     Returns:
         True if recording successful, False otherwise
     """
-    try:
+    if duration:
         logger.info(f"Recording from microphone for {duration} seconds...")
-        logger.debug(f"Sample rate: {sample_rate}Hz")
-
-        # Use default input device
-        recording = sd.rec(
-            int(duration * sample_rate),
-            samplerate=sample_rate,
-            channels=1,
-            dtype='float32'
-        )
-
-        sd.wait()
+    else:
+        logger.info("Recording from microphone until stopped (Ctrl+C)...")
+    logger.debug(f"Sample rate: {sample_rate}Hz")
 
-        sf.write(output_file, recording, sample_rate)
-
-        logger.success(f"Recording saved: {output_file}")
-        return True
-
-    except Exception as e:
-        logger.error(f"Recording failed: {str(e)}")
-        return False
+    # Use default input device
+    return record_stream(output_file, duration, sample_rate, None, subtype, stop_event, stats=stats)
@@ -0,0 +1,172 @@
+"""Memory-mapped 16kHz PCM audio, read and converted to float32 one window at a time"""
+import os
+import struct
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import replace
+
+import numpy as np
+import soundfile as sf
+
+from .logger import logger
+from .preprocess import quietest_cut
+from .transcriber import TranscriptSegment
+
+SAMPLE_RATE = 16000
+RAW_EXTENSIONS = (".raw", ".pcm")
+WINDOW_S = 600.0  # audio handed to the decoder at a time
+SEARCH_S = 5.0  # window tail searched for a quiet cut point
+
+_WAVE_FORMAT_PCM = 1
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _wav_layout(path: str) -> tuple[int, int, int, int, int, int]:
+    """Parse a RIFF/WAVE header: (format, channels, rate, bits, data offset, data size)
+
+    A data size of 0 or past the end of the file (a recording that was never
+    closed) is replaced by the bytes actually present.
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+        if riff != b"RIFF" or wave != b"WAVE":
+            raise ValueError("not a RIFF/WAVE file")
+
+        fmt: tuple[int, int, int, int] | None = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError("no data chunk")
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                body = f.read(size)
+                audio_format, channels, rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+                if audio_format == _WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    audio_format = struct.unpack("<H", body[24:26])[0]
+                fmt = (audio_format, channels, rate, bits)
+                f.seek(size % 2, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError("data chunk before fmt chunk")
+                offset = f.tell()
+                if size == 0 or offset + size > file_size:
+                    size = file_size - offset
+                return (*fmt, offset, size)
+            else:
+                f.seek(size + size % 2, os.SEEK_CUR)
+
+
+class AudioSource:
+    """16kHz 16-bit PCM samples backed by numpy.memmap
+
+    Nothing is read until a window is requested: slicing returns mono
+    float32 samples for that window only, and view() returns a zero-copy
+    sub-source. A 10-hour recording can be scanned and transcribed window by
+    window while memory stays bounded by the window size.
+    """
+
+    def __init__(self, samples: np.ndarray, path: str = "") -> None:
+        """
+        Args:
+            samples: int16 samples, shaped (frames,) or (frames, channels)
+            path: File the samples are mapped from
+        """
+        self.samples = samples
+        self.path = path
+
+    @classmethod
+    def open(cls, path: str) -> "AudioSource":
+        """Map a 16kHz PCM16 WAV file, or headerless 16kHz mono s16le (.raw/.pcm)
+
+        Raises:
+            ValueError: The file is not 16kHz 16-bit PCM
+        """
+        if path.lower().endswith(RAW_EXTENSIONS):
+            frames = os.path.getsize(path) // 2
+            return cls(np.memmap(path, dtype="<i2", mode="r", shape=(frames,)) if frames else np.zeros(0, "<i2"), path)
+
+        audio_format, channels, rate, bits, offset, size = _wav_layout(path)
+        if audio_format != _WAVE_FORMAT_PCM or bits != 16 or rate != SAMPLE_RATE or channels < 1:
+            raise ValueError(f"expected {SAMPLE_RATE}Hz 16-bit PCM, got format {audio_format}, {rate}Hz, {bits}-bit")
+        frames = size // (2 * channels)
+        if frames == 0:
+            return cls(np.zeros(0, "<i2"), path)
+        shape = (frames,) if channels == 1 else (frames, channels)
+        return cls(np.memmap(path, dtype="<i2", mode="r", offset=offset, shape=shape), path)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / SAMPLE_RATE
+
+    def __getitem__(self, key: slice) -> np.ndarray:
+        """Samples of a window as mono float32 in [-1, 1] (only this window is read and converted)"""
+        if not isinstance(key, slice):
+            raise TypeError("AudioSource only supports slicing")
+        window = self.samples[key]
+        if window.ndim == 2:
+            window = np.mean(window, axis=1, dtype=np.float32)
+        converted: np.ndarray = np.multiply(window, np.float32(1 / 32768.0), dtype=np.float32)
+        return converted
+
+    def view(self, start: int = 0, end: int | None = None) -> "AudioSource":
+        """Sub-source over samples [start, end), sharing the mapping"""
+        return AudioSource(self.samples[start:end], self.path)
+
+    def windows(
+        self, window_s: float = WINDOW_S, search_s: float = SEARCH_S
+    ) -> Iterator[tuple[int, np.ndarray]]:
+        """Yield (start sample, float32 window), cutting each window at the quietest point of its tail"""
+        window = int(window_s * SAMPLE_RATE)
+        search = min(int(search_s * SAMPLE_RATE), window // 2)
+        frame = SAMPLE_RATE // 10
+        start = 0
+        while start < len(self):
+            end = min(start + window, len(self))
+            audio = self[start:end]
+            if end < len(self):
+                cut = quietest_cut(audio, len(audio) - search, len(audio), frame)
+                audio, end = audio[:cut], start + cut
+            yield start, audio
+            start = end
+
+
+def open_source(path: str) -> AudioSource | None:
+    """Memory-map path if it is 16kHz PCM16 WAV or raw audio, else None (decode it instead)"""
+    if not path.lower().endswith((".wav", *RAW_EXTENSIONS)):
+        return None
+    try:
+        return AudioSource.open(path)
+    except (ValueError, OSError, struct.error) as e:
+        logger.debug(f"Not memory-mapping {path}: {str(e)}")
+        return None
+
+
+def transcribe_windows(
+    source: AudioSource,
+    transcribe: Callable[[np.ndarray], Iterable[TranscriptSegment]],
+    window_s: float = WINDOW_S,
+) -> Iterator[TranscriptSegment]:
+    """Transcribe a source window by window, shifting segments to source time
+
+    Args:
+        source: Audio to transcribe
+        transcribe: Decodes one float32 window, e.g. a partial of iter_segments
+        window_s: Seconds of audio decoded at a time
+    """
+    for start, window in source.windows(window_s):
+        shift = start / SAMPLE_RATE
+        for segment in transcribe(window):
+            yield replace(segment, start=segment.start + shift, end=segment.end + shift) if shift else segment
+
+
+def write_wav(path: str, audio: np.ndarray | AudioSource, window_s: float = WINDOW_S) -> None:
+    """Write 16kHz PCM16 WAV, window by window for a source"""
+    if isinstance(audio, np.ndarray):
+        sf.write(path, audio, SAMPLE_RATE, subtype="PCM_16")
+        return
+    with sf.SoundFile(path, mode="w", samplerate=SAMPLE_RATE, channels=1, subtype="PCM_16") as out:
+        for _, window in audio.windows(window_s, search_s=0):
+            out.write(window)
@@ -0,0 +1,262 @@
+"""Automatic device, compute type and thread selection from a one-time calibration run"""
+import json
+import os
+import platform
+import time
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .benchmark import synthetic_clips
+from .lazy import lazy_import
+from .logger import logger
+from .model_cache import estimate_model_memory
+from .model_store import model_store
+from .transcriber import TRANSCRIBE_OPTIONS, ComputeType, DeviceType
+
+if TYPE_CHECKING:
+    import ctranslate2
+    import faster_whisper
+else:
+    ctranslate2 = lazy_import("ctranslate2")
+    faster_whisper = lazy_import("faster_whisper")
+
+DEFAULT_TUNE_PATH = os.environ.get(
+    "SPEECH2TEXT_AUTOTUNE_PATH", os.path.join(os.path.expanduser("~"), ".cache", "speech2text", "autotune.json")
+)
+
+# Compute types worth trying on each device, fastest first when several tie
+CANDIDATE_COMPUTE_TYPES: dict[str, tuple[ComputeType, ...]] = {
+    "cpu": ("int8", "float32"),
+    "cuda": ("float16", "int8_float16", "int8"),
+}
+
+# Loaded model plus activations must fit in this share of the available memory
+MEMORY_HEADROOM = 1.5
+
+
+@dataclass
+class Capabilities:
+    """What this machine offers for inference"""
+
+    cpu_threads: int
+    cuda_devices: int
+    compute_types: dict[str, list[str]] = field(default_factory=dict)
+    memory_mb: int | None = None  # available system memory, None when unknown
+
+    def fingerprint(self) -> dict[str, Any]:
+        """Properties that invalidate a tuned configuration when they change"""
+        return {
+            "machine": platform.machine(),
+            "cpu_threads": self.cpu_threads,
+            "cuda_devices": self.cuda_devices,
+            "ctranslate2": ctranslate2.__version__,
+        }
+
+
+@dataclass
+class TunedConfig:
+    """A device / compute type / thread count combination and its measured speed"""
+
+    device: DeviceType
+    compute_type: ComputeType
+    cpu_threads: int
+    rtf: float = 0.0  # calibration transcribe time / audio time
+
+
+def available_cores() -> int:
+    """CPU cores this process may run on (respects affinity masks and cgroup pinning)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def available_memory_mb() -> int | None:
+    """Available system memory in MB (MemAvailable on Linux), None when unknown"""
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def probe_capabilities() -> Capabilities:
+    """Probe cores, CUDA devices, CTranslate2 compute types and memory"""
+    cuda_devices = ctranslate2.get_cuda_device_count()
+    compute_types = {"cpu": sorted(ctranslate2.get_supported_compute_types("cpu"))}
+    if cuda_devices:
+        compute_types["cuda"] = sorted(ctranslate2.get_supported_compute_types("cuda"))
+    return Capabilities(available_cores(), cuda_devices, compute_types, available_memory_mb())
+
+
+def candidate_configs(model: str, caps: Capabilities, compute_type: ComputeType | None = None) -> list[TunedConfig]:
+    """Configurations worth calibrating on this machine
+
+    On CPU both all cores and half of them are tried, since with SMT the
+    physical core count is often faster. Compute types the device does not
+    support, or whose model would not fit in memory, are left out.
+    """
+    candidates: list[TunedConfig] = []
+    for device, supported in caps.compute_types.items():
+        for candidate in CANDIDATE_COMPUTE_TYPES.get(device, ()):
+            if candidate not in supported or (compute_type and candidate != compute_type):
+                continue
+            if device == "cpu" and caps.memory_mb is not None:
+                if estimate_model_memory(model, candidate) * MEMORY_HEADROOM > caps.memory_mb:
+                    logger.info(f"Skipping {candidate} on CPU: {model} would not fit in {caps.memory_mb}MB")
+                    continue
+            if device == "cuda":
+                candidates.append(TunedConfig("cuda", candidate, 0))
+                continue
+            threads = sorted({caps.cpu_threads, max(1, caps.cpu_threads // 2)}, reverse=True)
+            candidates.extend(TunedConfig("cpu", candidate, count) for count in threads)
+    return candidates
+
+
+def calibrate(
+    model: str,
+    candidates: list[TunedConfig],
+    audio: np.ndarray | None = None,
+    options: dict[str, Any] | None = None,
+) -> list[TunedConfig]:
+    """Transcribe a calibration clip with every candidate, fastest first
+
+    Each candidate loads its own model (load time is not measured) and
+    decodes the clip once to warm up and once timed. Voice activity
+    filtering and temperature fallback are turned off so every candidate
+    decodes the same amount of audio. Candidates that fail are dropped.
+    """
+    if audio is None:
+        audio = synthetic_clips((10.0,))[0].audio
+    seconds = len(audio) / 16000
+    options = {**(options or TRANSCRIBE_OPTIONS), "vad_filter": False, "temperature": 0.0}
+    options.pop("vad_parameters", None)
+
+    path = model_store.resolve(model)
+    measured: list[TunedConfig] = []
+    for candidate in candidates:
+        label = f"{candidate.device}/{candidate.compute_type}/{candidate.cpu_threads or 'default'} threads"
+        try:
+            whisper = faster_whisper.WhisperModel(
+                path,
+                device=candidate.device,
+                compute_type=candidate.compute_type,
+                cpu_threads=candidate.cpu_threads,
+                local_files_only=path != model,
+            )
+            list(whisper.transcribe(audio[:16000], **options)[0])
+            start = time.perf_counter()
+            list(whisper.transcribe(audio, **options)[0])
+            elapsed = time.perf_counter() - start
+            del whisper
+        except Exception as e:
+            logger.warning(f"Calibration of {label} failed: {str(e)}")
+            continue
+
+        candidate.rtf = elapsed / seconds
+        logger.info(f"Calibration {label}: real-time factor {candidate.rtf:.3f}")
+        measured.append(candidate)
+
+    return sorted(measured, key=lambda config: config.rtf)
+
+
+def load_tuned(model: str, caps: Capabilities, path: str = DEFAULT_TUNE_PATH) -> TunedConfig | None:
+    """Return the stored configuration for model, unless the machine has changed"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    entry = stored.get(model)
+    if not entry or entry.get("host") != caps.fingerprint():
+        return None
+    try:
+        return TunedConfig(**entry["config"])
+    except (KeyError, TypeError):
+        return None
+
+
+def save_tuned(model: str, caps: Capabilities, config: TunedConfig, path: str = DEFAULT_TUNE_PATH) -> None:
+    """Store the configuration for model, keeping other models' entries"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        stored = {}
+
+    stored[model] = {"host": caps.fingerprint(), "config": asdict(config), "tuned_at": time.time()}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(stored, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def autotune(
+    model: str,
+    compute_type: ComputeType | None = None,
+    retune: bool = False,
+    path: str = DEFAULT_TUNE_PATH,
+) -> TunedConfig:
+    """Fastest configuration for model on this machine, calibrating on first use
+
+    Args:
+        model: Model size to tune for
+        compute_type: Only consider this compute type (None = any supported)
+        retune: Ignore a stored result and calibrate again
+        path: JSON file with stored results (SPEECH2TEXT_AUTOTUNE_PATH)
+    """
+    caps = probe_capabilities()
+    if not retune:
+        stored = load_tuned(model, caps, path)
+        if stored is not None and (compute_type is None or stored.compute_type == compute_type):
+            logger.info(
+                f"Auto device: {stored.device}/{stored.compute_type}, {stored.cpu_threads or 'default'} threads (stored)"
+            )
+            return stored
+
+    candidates = candidate_configs(model, caps, compute_type)
+    logger.info(
+        f"Calibrating {model} on {len(candidates)} configuration(s) "
+        f"({caps.cpu_threads} cores, {caps.cuda_devices} CUDA device(s)); this runs once"
+    )
+    measured = calibrate(model, candidates)
+    if not measured:
+        fallback = TunedConfig("cpu", compute_type or "int8", 0)
+        logger.warning(f"Calibration failed, using {fallback.device}/{fallback.compute_type}")
+        return fallback
+
+    best = measured[0]
+    save_tuned(model, caps, best, path)
+    logger.info(f"Auto device: {best.device}/{best.compute_type}, {best.cpu_threads or 'default'} threads")
+    return best
+
+
+def resolve_device(
+    model: str,
+    device: str,
+    compute_type: ComputeType | None,
+    cpu_threads: int = 0,
+    retune: bool = False,
+) -> tuple[DeviceType, ComputeType, int]:
+    """CLI helper: replace device "auto" (and unset settings) with the tuned configuration
+
+    An explicit compute type limits tuning to that type, and an explicit
+    thread count is kept. Other devices pass through, with int8 as the
+    default compute type.
+    """
+    if device != "auto":
+        resolved_device: DeviceType = "cuda" if device == "cuda" else "cpu"
+        return resolved_device, compute_type or "int8", cpu_threads
+
+    tuned = autotune(model, compute_type, retune)
+    return tuned.device, tuned.compute_type, cpu_threads or tuned.cpu_threads
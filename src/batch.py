@@ -0,0 +1,227 @@
+"""Batch transcription over directories, globs and manifests"""
+import csv
+import glob
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from .logger import logger
+from .metrics import metrics
+from .model_cache import get_model
+from .processor import process_input
+from .scheduler import TranscriptionScheduler, audio_duration
+from .transcriber import ComputeType, DeviceType, ModelSize, resolve_compute_type
+
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".flac", ".ogg", ".m4a")
+
+
+@dataclass
+class BatchItemArgs:
+    """Arguments for a single file, compatible with ProcessArgs"""
+
+    input: str
+    output: str
+    model: ModelSize
+    device: DeviceType
+    compute_type: ComputeType
+    keep_wav: bool
+    cpu_threads: int = 0
+    no_cache: bool = False
+    chunk_workers: int = 1
+    format: str = "txt"
+    preprocess: bool = False
+    denoise: bool = False
+    profile: str | None = None
+    language: str | None = "pt"
+    decode_options: dict[str, Any] = field(default_factory=dict)
+    resume: bool = True
+    draft_model: ModelSize | None = None
+    model_workers: int = 1  # replicas of the shared model when files are transcribed on threads
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one file in a batch"""
+
+    input: str
+    output: str
+    status: str  # done, skipped or failed
+    seconds: float = 0.0
+    audio_seconds: float = 0.0
+    error: str = ""
+
+
+def collect_inputs(input_dir: str | None = None, pattern: str = "*", manifest: str | None = None) -> list[str]:
+    """Collect audio files from a directory glob and/or a manifest
+
+    Args:
+        input_dir: Directory to search (pattern is relative to it, ** is recursive)
+        pattern: Glob pattern; with the default "*" only known audio extensions are kept
+        manifest: Text file with one input path per line (# comments allowed)
+
+    Returns:
+        Sorted list of unique file paths
+    """
+    files: list[str] = []
+
+    if input_dir is not None:
+        if not os.path.isdir(input_dir):
+            raise FileNotFoundError(f"Directory {input_dir} not found!")
+        for path in glob.glob(os.path.join(input_dir, pattern), recursive=True):
+            if not os.path.isfile(path):
+                continue
+            if pattern == "*" and not path.lower().endswith(AUDIO_EXTENSIONS):
+                continue
+            files.append(path)
+
+    if manifest is not None:
+        with open(manifest, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    files.append(line)
+
+    return sorted(set(files))
+
+
+def output_path_for(
+    input_path: str, output_dir: str, input_dir: str | None = None, output_format: str = "txt"
+) -> str:
+    """Build the transcription path for an input: its full name plus the format extension
+
+    Subdirectories of input_dir are mirrored. Without an input directory
+    (manifest entries), relative paths below the working directory are
+    mirrored as given, and any other file goes under a short hash of its
+    parent directory, so a/x.mp3, b/x.mp3 and x.wav never share an output.
+    """
+    if input_dir is not None:
+        relative = os.path.relpath(input_path, input_dir)
+    else:
+        relative = os.path.relpath(input_path)
+        if os.path.isabs(relative) or relative.split(os.sep)[0] == os.pardir:
+            parent = os.path.dirname(os.path.abspath(input_path))
+            relative = os.path.join(hashlib.sha256(parent.encode()).hexdigest()[:8], os.path.basename(input_path))
+    return os.path.join(output_dir, relative + "." + output_format)
+
+
+def write_summary(results: list[BatchResult], summary_path: str) -> None:
+    """Write per-file results as CSV, or JSON when the path ends with .json"""
+    os.makedirs(os.path.dirname(summary_path) or ".", exist_ok=True)
+    rows = [asdict(result) for result in results]
+
+    if summary_path.lower().endswith(".json"):
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        return
+
+    with open(summary_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["input", "output", "status", "seconds", "audio_seconds", "error"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _process_serially(jobs: list[BatchItemArgs]) -> list[BatchResult]:
+    """Run jobs one after another in this process"""
+    if jobs:
+        # Load once up front so per-file timings only measure the pipeline
+        first = jobs[0]
+        get_model(first.model, first.device, resolve_compute_type(first.device, first.compute_type), first.cpu_threads)
+
+    results: list[BatchResult] = []
+    for index, job in enumerate(jobs, start=1):
+        logger.info(f"[{index}/{len(jobs)}] {job.input}")
+        duration = audio_duration(job.input)
+
+        start = time.perf_counter()
+        try:
+            process_input(job)
+            results.append(BatchResult(job.input, job.output, "done", time.perf_counter() - start, duration))
+        except Exception as e:
+            logger.error(f"Failed to process {job.input}: {str(e)}")
+            results.append(BatchResult(job.input, job.output, "failed", time.perf_counter() - start, duration, str(e)))
+    return results
+
+
+def process_batch(
+    inputs: list[str],
+    output_dir: str,
+    model: ModelSize = "large-v3",
+    device: DeviceType = "cpu",
+    compute_type: ComputeType = "int8",
+    keep_wav: bool = False,
+    overwrite: bool = False,
+    input_dir: str | None = None,
+    summary_path: str | None = None,
+    workers: int = 1,
+    cpu_threads: int = 0,
+    no_cache: bool = False,
+    chunk_workers: int = 1,
+    output_format: str = "txt",
+    preprocess: bool = False,
+    denoise: bool = False,
+    profile: str | None = None,
+    language: str | None = "pt",
+    decode_options: dict[str, Any] | None = None,
+    resume: bool = True,
+    draft_model: ModelSize | None = None,
+) -> list[BatchResult]:
+    """Transcribe many files with a single warm model
+
+    Files whose transcription already exists are skipped unless overwrite is set.
+    A failure on one file is recorded and the batch continues. With more than
+    one worker, files are handed to a TranscriptionScheduler process pool.
+
+    Returns:
+        One BatchResult per input, in order
+    """
+    jobs: list[BatchItemArgs] = []
+    skipped: dict[str, BatchResult] = {}
+
+    for path in inputs:
+        output = output_path_for(path, output_dir, input_dir, output_format)
+        if not overwrite and os.path.exists(output):
+            skipped[path] = BatchResult(path, output, "skipped")
+        else:
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+            jobs.append(
+                BatchItemArgs(
+                    path, output, model, device, compute_type, keep_wav, cpu_threads, no_cache, chunk_workers, output_format,
+                    preprocess, denoise, profile, language, dict(decode_options or {}), resume, draft_model
+                )
+            )
+
+    logger.info(f"Batch: {len(inputs)} files, {len(jobs)} to transcribe, {len(skipped)} already done")
+
+    batch_start = time.perf_counter()
+    if workers > 1 and jobs:
+        scheduler = TranscriptionScheduler(workers, model, device, compute_type, cpu_threads)
+        finished = [
+            BatchResult(r.input, r.output, r.status, r.seconds, r.audio_seconds, r.error) for r in scheduler.run(list(jobs))
+        ]
+        for result in finished:
+            metrics.observe("transcribe", result.seconds, ok=result.status == "done", input=result.input,
+                            audio_seconds=result.audio_seconds, worker=True)
+    else:
+        finished = _process_serially(jobs)
+    elapsed = time.perf_counter() - batch_start
+
+    by_input = {result.input: result for result in finished}
+    results = [skipped.get(path) or by_input[path] for path in inputs]
+
+    done = sum(1 for result in results if result.status == "done")
+    failed = sum(1 for result in results if result.status == "failed")
+    rate = done / elapsed if elapsed > 0 else 0.0
+    audio_total = sum(result.audio_seconds for result in results if result.status == "done")
+    rtf = elapsed / audio_total if audio_total > 0 else 0.0
+    logger.info(
+        f"Batch finished in {elapsed:.1f}s: {done} done, {failed} failed ({rate:.2f} files/s, real-time factor {rtf:.3f})"
+    )
+
+    if summary_path:
+        write_summary(results, summary_path)
+        logger.info(f"Summary written to: {summary_path}")
+
+    return results
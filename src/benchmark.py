@@ -0,0 +1,249 @@
+"""Benchmark harness: speed, memory and accuracy across models and compute types"""
+import csv
+import glob
+import json
+import multiprocessing
+import os
+import re
+import time
+from dataclasses import asdict, dataclass, fields
+from itertools import product
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .lazy import lazy_import
+from .logger import logger
+from .metrics import peak_rss_mb
+from .model_store import model_store
+from .transcriber import TRANSCRIBE_OPTIONS
+
+if TYPE_CHECKING:
+    import faster_whisper
+else:
+    faster_whisper = lazy_import("faster_whisper")
+
+SAMPLE_RATE = 16000
+
+
+@dataclass
+class BenchmarkClip:
+    """A clip to transcribe, with its reference text when available"""
+
+    name: str
+    audio: np.ndarray
+    reference: str | None = None
+    vad_filter: bool = True  # synthetic signals would be stripped by the speech detector
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / SAMPLE_RATE
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for one model / compute type / beam size combination"""
+
+    model: str
+    compute_type: str
+    beam_size: int
+    device: str
+    clips: int
+    audio_seconds: float
+    load_time: float
+    first_segment_time: float  # mean over clips
+    transcribe_time: float
+    rtf: float  # transcribe_time / audio_seconds
+    peak_rss_mb: float
+    wer: float | None  # None when no clip has a reference
+    error: str = ""
+
+
+def normalize_text(text: str) -> list[str]:
+    """Lowercase and strip punctuation for word error rate scoring"""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_errors(reference: str, hypothesis: str) -> tuple[int, int]:
+    """Return (edit distance in words, number of reference words)"""
+    ref = normalize_text(reference)
+    hyp = normalize_text(hypothesis)
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, start=1):
+            current[j] = min(
+                previous[j] + 1,  # deletion
+                current[j - 1] + 1,  # insertion
+                previous[j - 1] + (ref_word != hyp_word),  # substitution
+            )
+        previous = current
+    return previous[-1], len(ref)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word error rate of a hypothesis against a reference"""
+    errors, words = word_errors(reference, hypothesis)
+    return errors / words if words else float(errors > 0)
+
+
+def load_clips(clips_dir: str) -> list[BenchmarkClip]:
+    """Load audio clips from a directory; a same-named .txt file is the reference"""
+    clips = []
+    for path in sorted(glob.glob(os.path.join(clips_dir, "*"))):
+        stem, ext = os.path.splitext(path)
+        if ext.lower() not in (".wav", ".mp3", ".flac", ".ogg", ".m4a"):
+            continue
+
+        reference = None
+        if os.path.exists(stem + ".txt"):
+            with open(stem + ".txt", encoding="utf-8") as f:
+                reference = f.read().strip()
+
+        clips.append(BenchmarkClip(os.path.basename(path), faster_whisper.decode_audio(path, sampling_rate=SAMPLE_RATE), reference))
+
+    logger.info(f"Loaded {len(clips)} clips ({sum(c.duration for c in clips):.0f}s) from {clips_dir}")
+    return clips
+
+
+def synthetic_clips(durations: tuple[float, ...] = (5.0, 15.0, 30.0)) -> list[BenchmarkClip]:
+    """Generate speech-like test signals (no references, so WER is not measured)"""
+    rng = np.random.default_rng(0)
+    clips = []
+    for duration in durations:
+        t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+        # Harmonic "voice" with a syllable-rate envelope over background noise
+        envelope = 0.5 * (1 + np.sin(2 * np.pi * 4 * t)) * (np.sin(2 * np.pi * 0.3 * t) > -0.3)
+        voice = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 6))
+        audio = 0.1 * envelope * voice + 0.005 * rng.standard_normal(len(t))
+        clips.append(BenchmarkClip(f"synthetic_{duration:g}s", audio.astype(np.float32), vad_filter=False))
+    return clips
+
+
+def resolve_model_path(model: str, model_dir: str | None) -> tuple[str, dict[str, object]]:
+    """Return the model argument and loader options for WhisperModel
+
+    With a model directory, a converted model in MODEL_DIR/<model> is used
+    directly; otherwise MODEL_DIR is treated as a download cache and only
+    local files are allowed, so the benchmark never touches the network.
+    Without one, models in the model store load from there.
+    """
+    if model_dir is None:
+        path = model_store.resolve(model)
+        return path, {"local_files_only": True} if path != model else {}
+    local = os.path.join(model_dir, model)
+    if os.path.isfile(os.path.join(local, "model.bin")):
+        return local, {}
+    return model, {"download_root": model_dir, "local_files_only": True}
+
+
+def run_combination(
+    clips: list[BenchmarkClip],
+    model: str,
+    compute_type: str,
+    beam_size: int,
+    device: str = "cpu",
+    cpu_threads: int = 0,
+    model_dir: str | None = None,
+    options: dict[str, Any] | None = None,
+) -> BenchmarkResult:
+    """Load a model and transcribe every clip, measuring each stage
+
+    options are the base decoding options (default: TRANSCRIBE_OPTIONS);
+    beam_size replaces their beam size and best_of. Clips without
+    vad_filter decode with VAD off whatever the options say.
+    """
+    audio_seconds = sum(clip.duration for clip in clips)
+    result = BenchmarkResult(model, compute_type, beam_size, device, len(clips), audio_seconds,
+                             0.0, 0.0, 0.0, 0.0, 0.0, None)
+    try:
+        model_path, loader_options = resolve_model_path(model, model_dir)
+        start = time.perf_counter()
+        whisper = faster_whisper.WhisperModel(
+            model_path, device=device, compute_type=compute_type, cpu_threads=cpu_threads, **loader_options
+        )
+        result.load_time = time.perf_counter() - start
+
+        options = {**(options or TRANSCRIBE_OPTIONS), "beam_size": beam_size, "best_of": beam_size}
+        first_segment_times = []
+        errors = words = 0
+        for clip in clips:
+            start = time.perf_counter()
+            clip_options = options if clip.vad_filter else {**options, "vad_filter": False}
+            segments, _ = whisper.transcribe(clip.audio, **clip_options)
+            texts: list[str] = []
+            for segment in segments:
+                if not texts:
+                    first_segment_times.append(time.perf_counter() - start)
+                texts.append(segment.text)
+            result.transcribe_time += time.perf_counter() - start
+
+            if clip.reference is not None:
+                clip_errors, clip_words = word_errors(clip.reference, " ".join(texts))
+                errors += clip_errors
+                words += clip_words
+
+        result.first_segment_time = float(np.mean(first_segment_times)) if first_segment_times else 0.0
+        result.rtf = result.transcribe_time / audio_seconds if audio_seconds else 0.0
+        result.wer = errors / words if words else None
+    except Exception as e:
+        result.error = str(e)
+        logger.error(f"Benchmark {model}/{compute_type}/beam {beam_size} failed: {str(e)}")
+
+    result.peak_rss_mb = peak_rss_mb()
+    return result
+
+
+def run_benchmark(
+    clips: list[BenchmarkClip],
+    models: list[str],
+    compute_types: list[str],
+    beam_sizes: list[int],
+    device: str = "cpu",
+    cpu_threads: int = 0,
+    model_dir: str | None = None,
+    isolate: bool = True,
+    options: dict[str, Any] | None = None,
+) -> list[BenchmarkResult]:
+    """Run every model x compute type x beam size combination
+
+    With isolate, each combination runs in a fresh process so load time is
+    cold and peak RSS belongs to that combination alone.
+    """
+    results = []
+    combinations = list(product(models, compute_types, beam_sizes))
+    for index, (model, compute_type, beam_size) in enumerate(combinations, start=1):
+        logger.info(f"[{index}/{len(combinations)}] {model} / {compute_type} / beam {beam_size}")
+        args = (clips, model, compute_type, beam_size, device, cpu_threads, model_dir, options)
+        if isolate:
+            with multiprocessing.get_context("spawn").Pool(1) as pool:
+                result = pool.apply(run_combination, args)
+        else:
+            result = run_combination(*args)
+
+        if not result.error:
+            wer = f"{result.wer:.1%}" if result.wer is not None else "n/a"
+            logger.info(
+                f"load {result.load_time:.2f}s, first segment {result.first_segment_time:.2f}s, "
+                f"RTF {result.rtf:.3f}, peak RSS {result.peak_rss_mb:.0f}MB, WER {wer}"
+            )
+        results.append(result)
+    return results
+
+
+def write_results(results: list[BenchmarkResult], json_path: str | None = None, csv_path: str | None = None) -> None:
+    """Write results as JSON and/or CSV for regression tracking"""
+    rows = [asdict(result) for result in results]
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        logger.info(f"Results written to: {json_path}")
+
+    if csv_path:
+        with open(csv_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(BenchmarkResult)])
+            writer.writeheader()
+            writer.writerows(rows)
+        logger.info(f"Results written to: {csv_path}")
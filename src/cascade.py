@@ -0,0 +1,229 @@
+"""Two-pass cascade decoding: a fast draft model, with low-confidence ranges re-decoded by the full model"""
+import math
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+from typing import Any
+
+import numpy as np
+
+from .audio_source import AudioSource, transcribe_windows
+from .logger import logger
+from .metrics import metrics
+from .transcriber import ComputeType, DeviceType, ModelSize, TranscriptSegment, iter_segments
+
+SAMPLE_RATE = 16000
+WINDOW_S = 30.0  # Whisper pads every input to a 30s encoder window
+DEFAULT_DRAFT_MODEL: ModelSize = "small"
+
+
+@dataclass(frozen=True)
+class CascadeThresholds:
+    """Decoder scores below which a draft segment is re-decoded
+
+    Stricter than Whisper's own fallback thresholds (-1.0 logprob, 2.4
+    compression, 0.6 no-speech), which only catch outright failures.
+    """
+
+    min_avg_logprob: float = -0.6
+    max_compression_ratio: float = 2.2
+    max_no_speech_prob: float = 0.4
+    padding_s: float = 0.5  # silence added around a re-decoded range, when available
+    merge_gap_s: float = 3.0  # ranges closer than this are re-decoded as one
+
+
+@dataclass
+class CascadeStats:
+    """How much of the audio was escalated, and what the cascade saved"""
+
+    audio_seconds: float = 0.0
+    escalated_seconds: float = 0.0
+    escalated_windows: int = 0  # 30s encoder windows the full model ran on
+    draft_seconds: float = 0.0
+    refine_seconds: float = 0.0
+    segments: int = 0
+    escalated_segments: int = 0
+
+    @property
+    def escalated_fraction(self) -> float:
+        return self.escalated_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    @property
+    def speedup(self) -> float | None:
+        """Estimated speedup over decoding everything with the full model
+
+        Every re-decoded range costs at least a full 30s encoder window, so
+        the full model's time per window (not per second of range) is
+        extrapolated to the windows of the whole recording. This is an
+        estimate, not a measured full pass; None when nothing was escalated.
+        """
+        if not self.escalated_windows or not self.refine_seconds:
+            return None
+        full_seconds = self.refine_seconds / self.escalated_windows * math.ceil(self.audio_seconds / WINDOW_S)
+        return full_seconds / (self.draft_seconds + self.refine_seconds)
+
+
+def needs_escalation(segment: TranscriptSegment, thresholds: CascadeThresholds) -> bool:
+    """True if the draft decoder was not confident about this segment"""
+    return (
+        segment.avg_logprob < thresholds.min_avg_logprob
+        or segment.compression_ratio > thresholds.max_compression_ratio
+        or segment.no_speech_prob > thresholds.max_no_speech_prob
+    )
+
+
+def escalation_ranges(
+    segments: list[TranscriptSegment],
+    thresholds: CascadeThresholds,
+    duration: float,
+    previous_end: float = 0.0,
+) -> list[tuple[int, int, float, float]]:
+    """Group consecutive low-confidence segments into ranges to re-decode
+
+    Returns (first index, last index + 1, start, end) per range. Ranges are
+    padded into the surrounding silence but never into a kept segment, so
+    the re-decoded text cannot repeat words the draft already has. Runs less
+    than merge_gap_s apart become one range, confident segments between them
+    included, since each range costs the full model a whole 30s window.
+    previous_end is the end of the kept text before segments[0].
+    """
+    ranges: list[tuple[int, int, float, float]] = []
+    index = 0
+    while index < len(segments):
+        if not needs_escalation(segments[index], thresholds):
+            index += 1
+            continue
+        first = index
+        while index < len(segments) and needs_escalation(segments[index], thresholds):
+            index += 1
+
+        if ranges and segments[first].start - segments[ranges[-1][1] - 1].end < thresholds.merge_gap_s:
+            first, _, start, _ = ranges.pop()
+        else:
+            before = segments[first - 1].end if first > 0 else previous_end
+            start = max(before, segments[first].start - thresholds.padding_s)
+        next_start = segments[index].start if index < len(segments) else duration
+        end = min(next_start, segments[index - 1].end + thresholds.padding_s)
+        ranges.append((first, index, start, end))
+    return ranges
+
+
+def transcribe_cascade(
+    audio: np.ndarray | AudioSource,
+    model: ModelSize = "large-v3",
+    draft_model: ModelSize = DEFAULT_DRAFT_MODEL,
+    device: DeviceType = "cpu",
+    compute_type: ComputeType = "int8",
+    cpu_threads: int = 0,
+    options: dict[str, Any] | None = None,
+    draft_options: dict[str, Any] | None = None,
+    thresholds: CascadeThresholds | None = None,
+    stats: CascadeStats | None = None,
+    num_workers: int = 1,
+) -> Iterator[TranscriptSegment]:
+    """Transcribe with draft_model, re-decoding low-confidence ranges with model
+
+    Segments are yielded in order as they are settled: confident draft
+    segments right away, a low-confidence run once the draft has moved past
+    it and it has been re-decoded.
+
+    Args:
+        audio: 16kHz mono float32 samples, or a memory-mapped source (drafted window by window)
+        model: Full model used for the escalated ranges
+        draft_model: Fast model used for the first pass
+        device: Processing device (cpu or cuda)
+        compute_type: Quantization type
+        cpu_threads: Number of CPU threads (0 = CTranslate2 default)
+        options: WhisperModel.transcribe options for the full model
+        draft_options: WhisperModel.transcribe options for the draft model (default: options)
+        thresholds: Scores that trigger escalation
+        stats: Filled with the escalated fraction and timings
+        num_workers: CTranslate2 replicas of both models, when several threads transcribe at once
+    """
+    thresholds = thresholds or CascadeThresholds()
+    stats = stats if stats is not None else CascadeStats()
+    options = dict(options or {})
+    duration = len(audio) / SAMPLE_RATE
+    stats.audio_seconds = duration
+
+    draft_options = draft_options or options
+
+    def transcribe_draft(samples: np.ndarray) -> Iterator[TranscriptSegment]:
+        return iter_segments(samples, draft_model, device, compute_type, cpu_threads, draft_options, num_workers)
+
+    draft: Iterator[TranscriptSegment]
+    if isinstance(audio, AudioSource):
+        draft = transcribe_windows(audio, transcribe_draft)
+    else:
+        draft = transcribe_draft(audio)
+
+    recent: list[TranscriptSegment] = []  # last settled segments, the context for re-decoding
+
+    def emit(segments: list[TranscriptSegment]) -> Iterator[TranscriptSegment]:
+        for segment in segments:
+            recent[:] = recent[-4:] + [segment]
+            yield segment
+
+    def settle(pending: list[TranscriptSegment]) -> Iterator[TranscriptSegment]:
+        """Yield pending draft segments, with their low-confidence runs re-decoded"""
+        kept = 0
+        previous_end = recent[-1].end if recent else 0.0
+        for first, last, range_start, range_end in escalation_ranges(pending, thresholds, duration, previous_end):
+            yield from emit(pending[kept:first])
+            kept = last
+
+            # Give the full model the preceding text as context, like Whisper does between windows
+            range_options = dict(options)
+            if "initial_prompt" not in options and options.get("condition_on_previous_text", True):
+                context = "".join(segment.text for segment in recent).strip()
+                if context:
+                    range_options["initial_prompt"] = context
+
+            start = time.perf_counter()
+            samples = audio[int(range_start * SAMPLE_RATE):int(range_end * SAMPLE_RATE)]
+            refined = list(iter_segments(samples, model, device, compute_type, cpu_threads, range_options, num_workers))
+            stats.refine_seconds += time.perf_counter() - start
+            stats.escalated_seconds += range_end - range_start
+            stats.escalated_windows += math.ceil((range_end - range_start) / WINDOW_S)
+            stats.escalated_segments += last - first
+            yield from emit([replace(s, start=s.start + range_start, end=s.end + range_start) for s in refined])
+        yield from emit(pending[kept:])
+
+    # A low-confidence run is held back until a confident segment starts more
+    # than merge_gap_s after it, so a close run can still join its range;
+    # confident segments with nothing pending pass through.
+    pending: list[TranscriptSegment] = []
+    escalated_end: float | None = None
+    while True:
+        start = time.perf_counter()
+        segment = next(draft, None)
+        stats.draft_seconds += time.perf_counter() - start
+        if segment is None:
+            break
+        stats.segments += 1
+        pending.append(segment)
+        if needs_escalation(segment, thresholds):
+            escalated_end = segment.end
+        elif escalated_end is None or segment.start - escalated_end >= thresholds.merge_gap_s:
+            yield from settle(pending)
+            pending, escalated_end = [], None
+    if pending:
+        yield from settle(pending)
+
+    speedup = stats.speedup
+    logger.info(
+        f"Cascade: {stats.escalated_segments}/{stats.segments} segments, "
+        f"{stats.escalated_fraction:.0%} of the audio re-decoded with {model}"
+        + (f", estimated {speedup:.1f}x faster than {model} alone (not measured)" if speedup else "")
+    )
+    metrics.observe(
+        "cascade",
+        stats.draft_seconds + stats.refine_seconds,
+        draft_model=draft_model,
+        model=model,
+        audio_seconds=duration,
+        draft_seconds=round(stats.draft_seconds, 4),
+        refine_seconds=round(stats.refine_seconds, 4),
+        escalated_fraction=round(stats.escalated_fraction, 4),
+        estimated_speedup=round(speedup, 2) if speedup else None,
+    )
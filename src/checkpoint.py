@@ -0,0 +1,120 @@
+"""Resumable transcription: an append-only log of decoded segments next to the output"""
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict
+from typing import IO, Any
+
+from .logger import logger
+from .result_cache import ResultCache
+from .transcriber import TranscriptSegment
+
+CHECKPOINT_SUFFIX = ".ckpt"
+
+
+def checkpoint_key(input_path: str, params: dict[str, Any]) -> str:
+    """Identify the input file (path, size, mtime) and the transcription parameters
+
+    A stat is enough here: a checkpoint only has to detect that the input or
+    the settings changed since it was written, not recognise re-encoded audio.
+    """
+    stat = os.stat(input_path)
+    identity = f"{os.path.abspath(input_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return ResultCache.make_key(identity, params)
+
+
+class Checkpoint:
+    """Records segments as they are decoded so an interrupted run can resume
+
+    The file is JSON lines: a header with the key, then one segment per line.
+    Each line is flushed as it is written and the file is fsynced every
+    `interval` seconds, so after a crash at most that much decoding is
+    repeated. A torn last line is ignored when loading. Segments are stored
+    in the decoder's timeline, and `offset` (the end of the last one) is where
+    the next run resumes decoding.
+    """
+
+    def __init__(self, path: str, key: str, segments: list[TranscriptSegment], interval: float = 30.0) -> None:
+        self.path = path
+        self.key = key
+        self.segments = segments
+        self.interval = interval
+        self._file: IO[str] | None = None
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def open(cls, output_path: str, key: str, resume: bool = True, interval: float = 30.0) -> "Checkpoint":
+        """Load the checkpoint for output_path if it matches key, else start an empty one"""
+        path = output_path + CHECKPOINT_SUFFIX
+        segments = cls.load(path, key) if resume else None
+        checkpoint = cls(path, key, segments or [], interval)
+
+        if segments:
+            logger.info(f"Resuming from checkpoint at {checkpoint.offset:.1f}s ({len(segments)} segments)")
+
+        # Rewrite before appending, so a torn line from the crash is dropped
+        partial = path + ".tmp"
+        with open(partial, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key}) + "\n")
+            for segment in checkpoint.segments:
+                f.write(json.dumps(asdict(segment), ensure_ascii=False) + "\n")
+        os.replace(partial, path)
+        checkpoint._file = open(path, "a", encoding="utf-8")
+        return checkpoint
+
+    @staticmethod
+    def load(path: str, key: str) -> list[TranscriptSegment] | None:
+        """Segments recorded in path, or None if it is missing or belongs to other settings"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().split("\n")
+        except FileNotFoundError:
+            return None
+
+        try:
+            header = json.loads(lines[0])
+        except json.JSONDecodeError:
+            return None
+        if header.get("key") != key:
+            logger.info("Ignoring checkpoint written for a different input or settings")
+            return None
+
+        segments = []
+        for line in lines[1:]:
+            try:
+                segments.append(TranscriptSegment(**json.loads(line)))
+            except (json.JSONDecodeError, TypeError):
+                break  # empty or torn last line
+        return segments
+
+    @property
+    def offset(self) -> float:
+        """Decoder time (seconds) reached by the recorded segments"""
+        return self.segments[-1].end if self.segments else 0.0
+
+    def track(self, segments: Iterable[TranscriptSegment]) -> Iterator[TranscriptSegment]:
+        """Record each newly decoded segment, then pass it on"""
+        for segment in segments:
+            self.append(segment)
+            yield segment
+
+    def append(self, segment: TranscriptSegment) -> None:
+        assert self._file is not None
+        self.segments.append(segment)
+        self._file.write(json.dumps(asdict(segment), ensure_ascii=False) + "\n")
+        self._file.flush()
+        if time.monotonic() - self._last_sync >= self.interval:
+            os.fsync(self._file.fileno())
+            self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        """Delete the checkpoint once the output is complete"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
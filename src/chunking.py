@@ -0,0 +1,237 @@
+"""Long-audio mode: split at silences, transcribe chunks in parallel, stitch timestamps"""
+import re
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any
+
+import numpy as np
+
+from .audio_source import AudioSource
+from .logger import logger
+from .model_cache import get_model, partition_threads
+from .transcriber import (
+    TRANSCRIBE_OPTIONS,
+    ComputeType,
+    DeviceType,
+    ModelSize,
+    TranscriptSegment,
+    resolve_compute_type,
+)
+
+SAMPLE_RATE = 16000
+VAD_WINDOW_S = 1800.0  # audio scanned by the VAD at a time for memory-mapped sources
+
+
+@dataclass
+class Chunk:
+    """A slice of the recording, in samples"""
+
+    start: int
+    end: int
+    overlap: int = 0  # samples shared with the previous chunk (hard cuts only)
+
+
+def plan_chunks(
+    speech: list[dict[str, int]],
+    total_samples: int,
+    target_samples: int,
+    max_samples: int,
+    overlap_samples: int,
+) -> list[Chunk]:
+    """Group speech regions into chunks cut in the middle of silences
+
+    A chunk is closed at the first silence after it reaches target_samples.
+    If speech runs past max_samples without a pause, it is cut hard and the
+    next chunk starts overlap_samples earlier so no word is lost at the cut.
+
+    Args:
+        speech: Speech regions as {"start": sample, "end": sample}, sorted
+        total_samples: Length of the audio
+        target_samples: Preferred chunk length
+        max_samples: Longest chunk allowed before a hard cut
+        overlap_samples: Overlap added after a hard cut
+
+    Raises:
+        ValueError: If the overlap is not shorter than the longest chunk, as
+            hard cuts would then never advance
+    """
+    if max_samples <= overlap_samples:
+        raise ValueError(f"Chunk limit ({max_samples} samples) must exceed the overlap ({overlap_samples} samples)")
+    if not speech:
+        return [Chunk(0, total_samples)] if total_samples else []
+
+    chunks: list[Chunk] = []
+    start = 0
+    overlap = 0
+
+    for current, following in zip(speech, speech[1:] + [None], strict=True):
+        # Hard cuts inside a region longer than the chunk limit
+        while current["end"] - start > max_samples:
+            cut = start + max_samples
+            chunks.append(Chunk(start, cut, overlap))
+            start, overlap = cut - overlap_samples, overlap_samples
+
+        if following is None:
+            break
+        if current["end"] - start >= target_samples:
+            cut = (current["end"] + following["start"]) // 2
+            chunks.append(Chunk(start, cut, overlap))
+            start, overlap = cut, 0
+
+    if start < total_samples:
+        chunks.append(Chunk(start, total_samples, overlap))
+    return chunks
+
+
+def _words(text: str) -> list[str]:
+    return re.sub(r"[^\w\s']", "", text.lower()).split()
+
+
+def dedupe_boundary(previous: list[TranscriptSegment], segment: TranscriptSegment, max_words: int = 8) -> str:
+    """Drop words at the start of a segment that repeat the end of the previous text"""
+    tail = _words(" ".join(s.text for s in previous[-3:]))[-max_words:]
+    words = segment.text.split()
+    head = _words(segment.text)
+    if len(head) != len(words):
+        return segment.text
+
+    for k in range(min(len(tail), len(head)), 0, -1):
+        if tail[-k:] == head[:k]:
+            return " " + " ".join(words[k:]) if k < len(words) else ""
+    return segment.text
+
+
+def stitch_chunk(
+    stitched: list[TranscriptSegment], chunk: Chunk, segments: list[TranscriptSegment]
+) -> list[TranscriptSegment]:
+    """Shift one chunk's segments to global time and append them after the stitched ones
+
+    Segments are expected with timestamps relative to their chunk. Inside an
+    overlap, segments that start before the middle of the overlap are
+    dropped, and repeated boundary words are removed. Returns the segments
+    appended.
+    """
+    offset = chunk.start / SAMPLE_RATE
+    boundary = (chunk.start + chunk.overlap / 2) / SAMPLE_RATE
+    added = len(stitched)
+
+    first = True
+    for segment in segments:
+        shifted = replace(segment, start=segment.start + offset, end=segment.end + offset)
+        if chunk.overlap:
+            if shifted.end <= boundary:
+                continue
+            if stitched and (first or shifted.start < stitched[-1].end):
+                shifted.text = dedupe_boundary(stitched, shifted)
+                shifted.start = max(shifted.start, stitched[-1].end)
+        first = False
+        if shifted.text.strip():
+            stitched.append(shifted)
+    return stitched[added:]
+
+
+def stitch_segments(chunks: list[Chunk], results: list[list[TranscriptSegment]]) -> list[TranscriptSegment]:
+    """Stitch every chunk's segments into one list with global timestamps"""
+    stitched: list[TranscriptSegment] = []
+    for chunk, segments in zip(chunks, results, strict=True):
+        stitch_chunk(stitched, chunk, segments)
+    return stitched
+
+
+def speech_timestamps(audio: np.ndarray | AudioSource, vad: Any) -> list[dict[str, int]]:
+    """Silero VAD speech regions; a memory-mapped source is scanned VAD_WINDOW_S at a time"""
+    from faster_whisper.vad import get_speech_timestamps
+
+    if isinstance(audio, np.ndarray):
+        return list(get_speech_timestamps(audio, vad, sampling_rate=SAMPLE_RATE))
+
+    window = int(VAD_WINDOW_S * SAMPLE_RATE)
+    min_silence = vad.min_silence_duration_ms * SAMPLE_RATE // 1000
+    speech: list[dict[str, int]] = []
+    for start in range(0, len(audio), window):
+        for region in get_speech_timestamps(audio[start:start + window], vad, sampling_rate=SAMPLE_RATE):
+            region = {"start": region["start"] + start, "end": region["end"] + start}
+            # Speech running across a window boundary comes back as two regions
+            if speech and region["start"] - speech[-1]["end"] < min_silence:
+                speech[-1]["end"] = region["end"]
+            else:
+                speech.append(region)
+    return speech
+
+
+def find_chunks(
+    audio: np.ndarray | AudioSource,
+    target_chunk_s: float = 60.0,
+    max_chunk_s: float = 120.0,
+    overlap_s: float = 2.0,
+) -> list[Chunk]:
+    """Detect speech with Silero VAD and plan chunks that end in silences"""
+    from faster_whisper.vad import VadOptions
+
+    vad = VadOptions(min_silence_duration_ms=300, speech_pad_ms=100)
+    speech = speech_timestamps(audio, vad)
+    return plan_chunks(
+        speech,
+        len(audio),
+        int(target_chunk_s * SAMPLE_RATE),
+        int(max_chunk_s * SAMPLE_RATE),
+        int(overlap_s * SAMPLE_RATE),
+    )
+
+
+def transcribe_chunked(
+    audio: np.ndarray | AudioSource,
+    model: ModelSize = "large-v3",
+    device: DeviceType = "cpu",
+    compute_type: ComputeType = "int8",
+    workers: int = 4,
+    cpu_threads: int = 0,
+    target_chunk_s: float = 60.0,
+    options: dict[str, Any] | None = None,
+) -> Iterator[TranscriptSegment]:
+    """Transcribe a long recording as parallel chunks, yielding segments with global timestamps
+
+    One model is loaded with `workers` CTranslate2 replicas sharing the CPU
+    threads, and chunks are decoded concurrently from a thread pool (the
+    decoder releases the GIL). Segments are yielded in order as soon as
+    their chunk and every chunk before it are done.
+
+    Args:
+        audio: 16kHz mono float32 samples, or a memory-mapped source (read chunk by chunk)
+        model: Model size (tiny, base, small, medium, large-v3)
+        device: Processing device (cpu or cuda)
+        compute_type: Quantization type
+        workers: Number of chunks decoded at the same time
+        cpu_threads: Total CPU threads to split between workers (0 = all cores)
+        target_chunk_s: Preferred chunk length in seconds
+        options: WhisperModel.transcribe options (default: TRANSCRIBE_OPTIONS)
+    """
+    compute_type = resolve_compute_type(device, compute_type)
+    options = options or TRANSCRIBE_OPTIONS
+    threads = partition_threads(workers, cpu_threads or None)
+    whisper = get_model(model, device, compute_type, threads, workers)
+
+    chunks = find_chunks(audio, target_chunk_s, max_chunk_s=2 * target_chunk_s)
+    logger.info(f"Transcribing {len(audio) / SAMPLE_RATE:.0f}s in {len(chunks)} chunks on {workers} workers...")
+
+    def transcribe_chunk(chunk: Chunk) -> list[TranscriptSegment]:
+        segments, _ = whisper.transcribe(audio[chunk.start:chunk.end], **options)
+        return [TranscriptSegment.from_whisper(segment) for segment in segments]
+
+    start = time.perf_counter()
+    stitched: list[TranscriptSegment] = []
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(transcribe_chunk, chunk) for chunk in chunks]
+        for chunk, future in zip(chunks, futures, strict=True):
+            yield from stitch_chunk(stitched, chunk, future.result())
+    finally:
+        # A consumer that stops early (or a failed chunk) cancels the chunks not started yet
+        pool.shutdown(cancel_futures=True)
+    elapsed = time.perf_counter() - start
+
+    duration = len(audio) / SAMPLE_RATE
+    rtf = elapsed / duration if duration else 0.0
+    logger.info(f"Chunks transcribed in {elapsed:.1f}s (real-time factor {rtf:.3f})")
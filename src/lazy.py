@@ -0,0 +1,50 @@
+"""Deferred imports for heavy optional dependencies (faster-whisper, sounddevice)"""
+import importlib
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+from typing import Any
+
+_lock = threading.Lock()
+_pending: dict[str, "_LazyModule"] = {}
+
+
+class _LazyModule(ModuleType):
+    """Stand-in that imports the real module on first attribute access
+
+    The real import goes through the regular import system, so a failure
+    leaves nothing behind in sys.modules and every later access raises the
+    same error again. The first access is serialized so threads racing to
+    use the module import it once.
+    """
+
+    def __getattr__(self, attr: str) -> Any:
+        with _lock:
+            if type(self) is _LazyModule:
+                module = importlib.import_module(self.__name__)
+                self.__dict__.update(module.__dict__)
+                object.__setattr__(self, "__class__", ModuleType)  # later lookups are plain attributes
+                _pending.pop(self.__name__, None)
+        return getattr(self, attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return a module that is only executed on first attribute access
+
+    Importing faster_whisper pulls in CTranslate2, tokenizers and PyAV, and
+    importing sounddevice initializes PortAudio. Deferring them keeps
+    `--help`, `--list-devices` and cache hits from paying for either, and an
+    import error surfaces where the module is actually used.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    with _lock:
+        if name in _pending:
+            return _pending[name]
+        spec = importlib.util.find_spec(name)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"No module named '{name}'")
+        module = _pending[name] = _LazyModule(name)
+    return module
@@ -0,0 +1,317 @@
+"""Streaming real-time transcription of system audio"""
+import queue
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from .audio_recorder import CaptureStats, find_monitor_device, open_input_stream, simulated_input
+from .logger import logger
+from .model_cache import get_model
+from .profiles import decoding_options
+from .transcriber import ComputeType, DeviceType, ModelSize, resolve_compute_type
+
+TextCallback = Callable[[str, bool], None]
+
+
+class RingBuffer:
+    """Fixed-size float32 buffer written by the audio callback and drained by a reader
+
+    If the reader falls behind by more than the capacity, the oldest unread
+    samples are overwritten and counted in `dropped`.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.dropped = 0
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self._write_pos = 0  # total samples ever written
+        self._read_pos = 0  # total samples ever read
+        self._lock = threading.Lock()
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples (called from the audio callback, so it only copies)"""
+        truncated = max(0, len(samples) - self.capacity)
+        samples = samples[truncated:]
+        n = len(samples)
+        with self._lock:
+            self._write_pos += truncated
+            start = self._write_pos % self.capacity
+            first = min(n, self.capacity - start)
+            self._data[start:start + first] = samples[:first]
+            self._data[:n - first] = samples[first:]
+            self._write_pos += n
+            overrun = self._write_pos - self._read_pos - self.capacity
+            if overrun > 0:
+                self.dropped += overrun
+                self._read_pos += overrun
+
+    def read(self) -> np.ndarray:
+        """Return all unread samples, oldest first"""
+        with self._lock:
+            n = self._write_pos - self._read_pos
+            start = self._read_pos % self.capacity
+            indices = (start + np.arange(n)) % self.capacity
+            self._read_pos = self._write_pos
+            unread: np.ndarray = self._data[indices]
+            return unread
+
+
+class UtteranceChunker:
+    """Energy-based voice activity detector that cuts a stream into utterances
+
+    Audio is analysed in short frames; an utterance starts at the first voiced
+    frame and ends after `min_silence_ms` of silence or `max_utterance_s` of
+    audio. While an utterance is open, a partial chunk is emitted every
+    `partial_interval_s` so text can be shown before the speaker pauses.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        threshold_db: float = -45.0,
+        frame_ms: int = 30,
+        min_silence_ms: int = 500,
+        min_speech_ms: int = 250,
+        max_utterance_s: float = 15.0,
+        partial_interval_s: float = 1.0,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.threshold = 10 ** (threshold_db / 20)
+        self.frame = sample_rate * frame_ms // 1000
+        self.min_silence_frames = max(1, min_silence_ms // frame_ms)
+        self.min_speech = sample_rate * min_speech_ms // 1000
+        self.max_utterance = int(sample_rate * max_utterance_s)
+        self.partial_interval = int(sample_rate * partial_interval_s)
+
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._utterance: list[np.ndarray] = []
+        self._length = 0
+        self._silent_frames = 0
+        self._last_partial = 0
+
+    def feed(self, samples: np.ndarray) -> list[tuple[np.ndarray, bool]]:
+        """Consume samples and return (audio, final) chunks ready for transcription"""
+        audio = np.concatenate([self._pending, samples.astype(np.float32, copy=False)])
+        usable = len(audio) - len(audio) % self.frame
+        self._pending = audio[usable:]
+        if usable == 0:
+            return []
+
+        frames = audio[:usable].reshape(-1, self.frame)
+        voiced = np.sqrt(np.mean(frames ** 2, axis=1)) > self.threshold
+
+        chunks: list[tuple[np.ndarray, bool]] = []
+        for frame, is_voiced in zip(frames, voiced, strict=True):
+            if not self._utterance and not is_voiced:
+                continue
+
+            self._utterance.append(frame)
+            self._length += len(frame)
+            self._silent_frames = 0 if is_voiced else self._silent_frames + 1
+
+            if self._silent_frames >= self.min_silence_frames or self._length >= self.max_utterance:
+                final = self._close()
+                if final is not None:
+                    chunks.append((final, True))
+            elif self._length - self._last_partial >= self.partial_interval:
+                self._last_partial = self._length
+                chunks.append((np.concatenate(self._utterance), False))
+
+        return chunks
+
+    def flush(self) -> np.ndarray | None:
+        """Close the current utterance, if any, at the end of the stream"""
+        return self._close()
+
+    def _close(self) -> np.ndarray | None:
+        """Finish the open utterance, discarding it if it is too short to be speech"""
+        if not self._utterance:
+            return None
+
+        audio = np.concatenate(self._utterance)
+        speech = self._length - self._silent_frames * self.frame
+        self._utterance = []
+        self._length = 0
+        self._silent_frames = 0
+        self._last_partial = 0
+        return audio if speech >= self.min_speech else None
+
+
+class LiveTranscriber:
+    """Transcribes an input device continuously, emitting partial and final text
+
+    The sounddevice callback only copies blocks into a ring buffer. A chunker
+    thread runs voice activity detection over the buffer and queues utterances,
+    and a transcription thread decodes them with a warm model. Stale partials
+    are skipped when newer audio is already waiting, so the transcription
+    thread never falls behind the speaker.
+    """
+
+    def __init__(
+        self,
+        model: ModelSize = "small",
+        device: DeviceType = "cpu",
+        compute_type: ComputeType = "int8",
+        cpu_threads: int = 0,
+        language: str | None = "pt",
+        sample_rate: int = 16000,
+        input_device: int | None = None,
+        on_text: TextCallback | None = None,
+        chunker: UtteranceChunker | None = None,
+        options: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Args:
+            model: Model size kept warm for the session
+            device: Processing device (cpu or cuda)
+            compute_type: Quantization type
+            cpu_threads: CPU threads for the model (0 = all cores)
+            language: Language code, None to detect it (used when options is not given)
+            sample_rate: Capture sample rate in Hz
+            input_device: Audio device index (None = auto-detect monitor)
+            on_text: Called with (text, final) for partial and final transcriptions
+            chunker: Utterance segmentation (default: UtteranceChunker at sample_rate)
+            options: WhisperModel.transcribe options for final passes (default: the default
+                profile in language); partial passes use greedy decoding on top of them
+        """
+        self.model = model
+        self.device = device
+        self.compute_type = resolve_compute_type(device, compute_type)
+        self.cpu_threads = cpu_threads
+        self.language = language
+        # The chunker has already isolated the speech, and utterances need no timestamps
+        self.options = {
+            **(options if options is not None else decoding_options(None, language)),
+            "vad_filter": False,
+            "without_timestamps": True,
+        }
+        self.partial_options = {
+            **self.options,
+            "beam_size": 1,
+            "best_of": 1,
+            "temperature": 0.0,
+            "condition_on_previous_text": False,
+        }
+        self.sample_rate = sample_rate
+        self.input_device = input_device
+        self.on_text = on_text or _log_text
+        self.chunker = chunker or UtteranceChunker(sample_rate)
+
+        self.ring = RingBuffer(sample_rate * 60)
+        self.finals: list[str] = []
+        self._jobs: queue.Queue[tuple[np.ndarray, bool] | None] = queue.Queue()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._stream: Any = None
+        self.stats = CaptureStats(sample_rate=sample_rate)
+
+    def start(self) -> None:
+        """Load the model, open the input stream and start the worker threads"""
+        get_model(self.model, self.device, self.compute_type, self.cpu_threads)
+
+        if self.input_device is None and not simulated_input():
+            self.input_device, device_name = find_monitor_device()
+            logger.info(f"Auto-detected device: {device_name}")
+
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._chunk_loop, name="live-chunker", daemon=True),
+            threading.Thread(target=self._transcribe_loop, name="live-transcriber", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+        self._stream = open_input_stream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype='float32',
+            device=self.input_device,
+            blocksize=self.sample_rate // 10,
+            callback=self._callback,
+        )
+        self._stream.start()
+        logger.info("Live transcription started")
+
+    def stop(self) -> str:
+        """Stop capturing, transcribe what is left and return the final text"""
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+        if self.ring.dropped:
+            logger.warning(f"Live transcription dropped {self.ring.dropped / self.sample_rate:.1f}s of audio")
+        if self.stats.dropouts:
+            logger.warning(f"Audio dropouts during live transcription: {self.stats.summary()}")
+        return " ".join(self.finals).strip()
+
+    def run(self, duration: float = 0) -> str:
+        """Transcribe for `duration` seconds (0 = until interrupted) and return the text"""
+        self.start()
+        try:
+            deadline = time.monotonic() + duration if duration > 0 else None
+            while deadline is None or time.monotonic() < deadline:
+                time.sleep(0.1)
+        except KeyboardInterrupt:
+            logger.warning("Live transcription interrupted by user")
+        return self.stop()
+
+    def _callback(self, indata: np.ndarray, frames: int, time_info: Any, status: Any) -> None:
+        """sounddevice callback: copy the block and return immediately"""
+        self.stats.on_callback(frames, time_info, status)
+        self.ring.write(indata[:, 0])
+
+    def _chunk_loop(self) -> None:
+        """Run VAD over newly captured audio and queue utterances"""
+        while not self._stop.is_set():
+            for chunk in self.chunker.feed(self.ring.read()):
+                self._jobs.put(chunk)
+            time.sleep(0.05)
+
+        for chunk in self.chunker.feed(self.ring.read()):
+            self._jobs.put(chunk)
+        remainder = self.chunker.flush()
+        if remainder is not None:
+            self._jobs.put((remainder, True))
+        self._jobs.put(None)
+
+    def _transcribe_loop(self) -> None:
+        """Decode queued utterances and emit their text"""
+        whisper = get_model(self.model, self.device, self.compute_type, self.cpu_threads)
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+
+            audio, final = job
+            if not final and not self._jobs.empty():
+                continue  # a newer partial or the final version is already waiting
+
+            try:
+                segments, _ = whisper.transcribe(audio, **(self.options if final else self.partial_options))
+                text = " ".join(segment.text.strip() for segment in segments).strip()
+            except Exception as e:
+                logger.error(f"Live transcription error: {str(e)}")
+                continue
+
+            if not text:
+                continue
+            if final:
+                self.finals.append(text)
+            self.on_text(text, final)
+
+
+def _log_text(text: str, final: bool) -> None:
+    """Default callback: log partial and final text"""
+    if final:
+        logger.success(text)
+    else:
+        logger.info(f"... {text}")
@@ -19,6 +19,7 @@ logger.add(
     rotation="1 day",
     retention="7 days",
     level="WARNING",
+    delay=True,  # create logs/ only when something is logged
     format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
 )
 
@@ -0,0 +1,194 @@
+"""Per-stage timers exported as JSON events and Prometheus text metrics"""
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from .logger import logger
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@dataclass
+class StageStats:
+    """Totals for one stage since the process started"""
+
+    runs: int = 0
+    failures: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seconds: float = 0.0
+
+
+class Metrics:
+    """Collects stage timings and counters, and exports them
+
+    Every observation is emitted as one JSON event: appended to events_path
+    ("-" for stderr) when configured, logged at DEBUG otherwise. When
+    prometheus_path is set, the Prometheus text exposition is rewritten there
+    after each observation (for node_exporter's textfile collector); the same
+    text is served by the transcription server at GET /metrics.
+    """
+
+    def __init__(self, events_path: str | None = None, prometheus_path: str | None = None) -> None:
+        self.events_path = events_path
+        self.prometheus_path = prometheus_path
+        self._stages: dict[str, StageStats] = {}
+        self._counters = {"audio_seconds": 0.0, "segments": 0.0}
+        self._last_rtf = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, events_path: str | None = None, prometheus_path: str | None = None) -> None:
+        """Set where events and the Prometheus text file go (None leaves a setting unchanged)"""
+        if events_path is not None:
+            self.events_path = events_path
+        if prometheus_path is not None:
+            self.prometheus_path = prometheus_path
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self._counters = {"audio_seconds": 0.0, "segments": 0.0}
+            self._last_rtf = 0.0
+
+    def observe(self, stage: str, seconds: float, ok: bool = True, **fields: Any) -> None:
+        """Record one run of a stage
+
+        audio_seconds and segments in fields are added to the totals, and a
+        real-time factor is derived from audio_seconds.
+        """
+        event: dict[str, Any] = {"ts": round(time.time(), 3), "stage": stage, "seconds": round(seconds, 4), "ok": ok}
+        event.update(fields)
+        audio_seconds = fields.get("audio_seconds")
+        if audio_seconds:
+            event["rtf"] = round(seconds / audio_seconds, 4)
+        event["peak_rss_mb"] = round(peak_rss_mb(), 1)
+
+        with self._lock:
+            stats = self._stages.setdefault(stage, StageStats())
+            stats.runs += 1
+            stats.failures += 0 if ok else 1
+            stats.seconds += seconds
+            stats.last_seconds = seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            if stage == "transcribe" and ok:
+                self._counters["audio_seconds"] += audio_seconds or 0.0
+                self._counters["segments"] += fields.get("segments", 0)
+                if audio_seconds:
+                    self._last_rtf = event["rtf"]
+
+        self._emit(event)
+        if self.prometheus_path:
+            self.write_prometheus(self.prometheus_path)
+
+    @contextmanager
+    def stage(self, name: str, **fields: Any) -> Iterator[dict[str, Any]]:
+        """Time a block; the yielded dict collects extra fields for the event"""
+        event = dict(fields)
+        start = time.perf_counter()
+        try:
+            yield event
+        except BaseException as e:
+            event.pop("ok", None)
+            self.observe(name, time.perf_counter() - start, ok=False, error=str(e) or type(e).__name__, **event)
+            raise
+        self.observe(name, time.perf_counter() - start, ok=event.pop("ok", True), **event)
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        """Decorator timing every call of a function as a stage
+
+        The wrapped function behaves exactly as before; a False or None return
+        value (how the recording and conversion helpers report errors) or an
+        exception counts as a failure.
+        """
+        def decorator(function: F) -> F:
+            @functools.wraps(function)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.stage(name) as event:
+                    result = function(*args, **kwargs)
+                    event["ok"] = result is not False and result is not None
+                return result
+            return wrapper  # type: ignore[return-value]
+        return decorator
+
+    def snapshot(self) -> dict[str, Any]:
+        """Current totals as plain data"""
+        with self._lock:
+            return {
+                "stages": {name: vars(stats).copy() for name, stats in self._stages.items()},
+                "audio_seconds": self._counters["audio_seconds"],
+                "segments": int(self._counters["segments"]),
+                "last_rtf": self._last_rtf,
+            }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        snapshot = self.snapshot()
+        stages = snapshot["stages"]
+        lines: list[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP speech2text_{name} {help_text}")
+            lines.append(f"# TYPE speech2text_{name} {kind}")
+            lines.extend(f"speech2text_{name}{labels} {value:g}" for labels, value in samples)
+
+        family("stage_seconds_total", "counter", "Time spent in each pipeline stage",
+               [(f'{{stage="{name}"}}', stats["seconds"]) for name, stats in stages.items()])
+        family("stage_runs_total", "counter", "Completed runs of each pipeline stage",
+               [(f'{{stage="{name}"}}', stats["runs"]) for name, stats in stages.items()])
+        family("stage_failures_total", "counter", "Failed runs of each pipeline stage",
+               [(f'{{stage="{name}"}}', stats["failures"]) for name, stats in stages.items()])
+        family("stage_last_seconds", "gauge", "Duration of the latest run of each stage",
+               [(f'{{stage="{name}"}}', stats["last_seconds"]) for name, stats in stages.items()])
+        family("audio_seconds_total", "counter", "Audio transcribed", [("", snapshot["audio_seconds"])])
+        family("segments_total", "counter", "Segments transcribed", [("", snapshot["segments"])])
+        family("last_real_time_factor", "gauge", "Transcription time / audio time of the latest transcription",
+               [("", snapshot["last_rtf"])])
+        family("peak_rss_bytes", "gauge", "Peak resident set size of the process", [("", peak_rss_mb() * 1024 * 1024)])
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Atomically rewrite the Prometheus text file"""
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(partial, "w", encoding="utf-8") as f:
+                f.write(self.render_prometheus())
+            os.replace(partial, path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics file {path}: {str(e)}")
+
+    def _emit(self, event: dict[str, Any]) -> None:
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        if not self.events_path:
+            logger.debug(line)
+            return
+        with self._lock:
+            if self.events_path == "-":
+                sys.stderr.write(line + "\n")
+                sys.stderr.flush()
+                return
+            try:
+                with open(self.events_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                logger.warning(f"Could not write metrics event to {self.events_path}: {str(e)}")
+
+
+# Process-wide metrics, configured from the environment or the CLI flags
+metrics = Metrics(
+    events_path=os.environ.get("SPEECH2TEXT_METRICS_EVENTS") or None,
+    prometheus_path=os.environ.get("SPEECH2TEXT_METRICS_FILE") or None,
+)
@@ -0,0 +1,229 @@
+"""Process-wide cache of loaded WhisperModel instances with LRU eviction"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
+
+from .lazy import lazy_import
+from .logger import logger
+from .metrics import metrics
+from .model_store import model_store, offline_mode
+
+if TYPE_CHECKING:
+    import faster_whisper
+else:
+    faster_whisper = lazy_import("faster_whisper")
+
+ModelKey = tuple[str, str, str, int, int]
+
+# Approximate size in MB of the float16 CTranslate2 weights for each model
+MODEL_MEMORY_MB = {
+    "tiny": 75,
+    "base": 145,
+    "small": 485,
+    "medium": 1530,
+    "large-v3": 3100,
+}
+
+# Relative size of each quantization compared to float16 weights
+COMPUTE_TYPE_FACTOR = {
+    "int8": 0.5,
+    "int8_float16": 0.5,
+    "float16": 1.0,
+    "float32": 2.0,
+}
+
+DEFAULT_MODEL_MEMORY_MB = 1530
+DEFAULT_MEMORY_BUDGET_MB = int(os.environ.get("SPEECH2TEXT_MODEL_CACHE_MB", "8192"))
+
+
+def estimate_model_memory(model: str, compute_type: str) -> int:
+    """Estimate the resident memory (MB) of a loaded model"""
+    base = MODEL_MEMORY_MB.get(model, DEFAULT_MODEL_MEMORY_MB)
+    return int(base * COMPUTE_TYPE_FACTOR.get(compute_type, 1.0))
+
+
+def partition_threads(workers: int, total_threads: int | None = None) -> int:
+    """Split the available CPU threads evenly between workers"""
+    total = total_threads or os.cpu_count() or 1
+    return max(1, total // max(1, workers))
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    load_time: float = 0.0
+
+
+class ModelCache:
+    """Keeps loaded models warm, evicting the least recently used over a memory budget
+
+    Models are keyed by (model, device, compute_type, cpu_threads, num_workers),
+    so the same weights loaded with different settings are cached separately.
+    The cache lock only covers bookkeeping: a load runs outside it, so hits
+    on loaded models never wait behind another model's load, and concurrent
+    requests for a model that is loading wait for that load instead of
+    starting their own.
+    """
+
+    def __init__(self, max_memory_mb: int = DEFAULT_MEMORY_BUDGET_MB) -> None:
+        self.max_memory_mb = max_memory_mb
+        self._models: OrderedDict[ModelKey, tuple[faster_whisper.WhisperModel, int]] = OrderedDict()
+        self._loading: dict[ModelKey, Future[faster_whisper.WhisperModel]] = {}
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the cache counters"""
+        with self._lock:
+            return replace(self._stats)
+
+    @property
+    def memory_mb(self) -> int:
+        """Estimated memory held by cached models"""
+        with self._lock:
+            return sum(size for _, size in self._models.values())
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._models
+
+    def get(
+        self,
+        model: str,
+        device: str = "cpu",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+    ) -> "faster_whisper.WhisperModel":
+        """Return a loaded model, loading it on a cache miss
+
+        Args:
+            model: Model size, hub repository or path (stored models load from the model store)
+            device: Processing device (cpu or cuda)
+            compute_type: Quantization type
+            cpu_threads: Number of CPU threads per worker (0 = CTranslate2 default)
+            num_workers: Number of concurrent transcribe calls the model can serve
+        """
+        key: ModelKey = (model, device, compute_type, cpu_threads, num_workers)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self._stats.hits += 1
+                return self._models[key][0]
+
+            pending = self._loading.get(key)
+            if pending is None:
+                self._stats.misses += 1
+                size = estimate_model_memory(model, compute_type)
+                self._evict(size)
+                loading: Future[faster_whisper.WhisperModel] = Future()
+                self._loading[key] = loading
+            else:
+                self._stats.hits += 1
+
+        if pending is not None:
+            return pending.result()
+
+        try:
+            loaded = self._load(model, device, compute_type, cpu_threads, num_workers)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            loading.set_exception(e)
+            raise
+
+        with self._lock:
+            self._models[key] = (loaded, size)
+            del self._loading[key]
+        loading.set_result(loaded)
+        return loaded
+
+    def _load(
+        self, model: str, device: str, compute_type: str, cpu_threads: int, num_workers: int
+    ) -> "faster_whisper.WhisperModel":
+        # Stored models load from their directory without any hub lookup, after
+        # their files are read ahead into the page cache
+        path = model_store.resolve(model)
+        model_store.warm(model)
+        logger.info(f"Loading model {model} ({device.upper()}, {compute_type})...")
+        start = time.perf_counter()
+        loaded = faster_whisper.WhisperModel(
+            path,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
+            local_files_only=path != model or offline_mode(),
+        )
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._stats.load_time += elapsed
+        logger.debug(f"Model {model} loaded in {elapsed:.2f}s")
+        metrics.observe("model_load", elapsed, model=model, device=device, compute_type=compute_type)
+        return loaded
+
+    def clear(self) -> None:
+        """Drop all cached models"""
+        with self._lock:
+            self._models.clear()
+
+    def _evict(self, incoming_mb: int) -> None:
+        """Evict least recently used models until the incoming one fits"""
+        if incoming_mb > self.max_memory_mb:
+            logger.warning(f"Model needs ~{incoming_mb}MB, above the cache budget of {self.max_memory_mb}MB")
+
+        used = sum(size for _, size in self._models.values())
+        while self._models and used + incoming_mb > self.max_memory_mb:
+            evicted_key, (_, size) = self._models.popitem(last=False)
+            used -= size
+            self._stats.evictions += 1
+            logger.info(f"Evicted model {evicted_key[0]} ({evicted_key[1]}, {evicted_key[2]}) from cache")
+
+
+# Shared cache used by transcribe_audio
+model_cache = ModelCache()
+
+
+def get_model(
+    model: str,
+    device: str = "cpu",
+    compute_type: str = "int8",
+    cpu_threads: int = 0,
+    num_workers: int = 1,
+) -> "faster_whisper.WhisperModel":
+    """Return a warm model from the process-wide cache"""
+    return model_cache.get(model, device, compute_type, cpu_threads, num_workers)
+
+
+def prewarm_model(
+    model: str,
+    device: str = "cpu",
+    compute_type: str = "int8",
+    cpu_threads: int = 0,
+    num_workers: int = 1,
+) -> threading.Thread:
+    """Load a model into the shared cache on a background thread
+
+    A get_model call with the same settings made while the load is running
+    waits for it instead of loading the model a second time.
+    """
+    def load() -> None:
+        try:
+            get_model(model, device, compute_type, cpu_threads, num_workers)
+        except Exception as e:
+            logger.warning(f"Model prewarm failed: {str(e)}")
+
+    thread = threading.Thread(target=load, name="model-prewarm", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,229 @@
+"""Local store of CTranslate2 Whisper models: fetched once, checksummed, loaded offline"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .lazy import lazy_import
+from .logger import logger
+
+if TYPE_CHECKING:
+    import faster_whisper
+else:
+    faster_whisper = lazy_import("faster_whisper")
+
+DEFAULT_STORE_DIR = os.environ.get(
+    "SPEECH2TEXT_MODEL_DIR", os.path.join(os.path.expanduser("~"), ".cache", "speech2text", "models")
+)
+MANIFEST_NAME = "manifest.json"
+HASH_BLOCK_BYTES = 1 << 24  # also the read size when warming the page cache
+
+# Files WhisperModel needs (besides the optional vocabulary.* and preprocessor_config.json)
+REQUIRED_FILES = ("model.bin", "config.json")
+
+
+def offline_mode() -> bool:
+    """True when models must never be looked up on the Hugging Face hub"""
+    return any(
+        os.environ.get(name, "").lower() in ("1", "true", "yes")
+        for name in ("SPEECH2TEXT_OFFLINE", "HF_HUB_OFFLINE")
+    )
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(HASH_BLOCK_BYTES):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@dataclass
+class StoredModel:
+    """Manifest of a model directory in the store"""
+
+    name: str
+    source: str
+    files: dict[str, dict[str, Any]] = field(default_factory=dict)  # relative path -> size, sha256
+    quantization: str | None = None
+    fetched: float = 0.0
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(entry["size"] for entry in self.files.values())
+
+
+class ModelStore:
+    """A fixed directory of pre-converted models, one subdirectory per model
+
+    Each model directory holds the CTranslate2 files and a manifest with
+    their sizes and SHA-256 checksums. Models are fetched into a temporary
+    directory and renamed into place once complete, so a directory in the
+    store is never partial.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR) -> None:
+        self.root = root
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.root, name.replace("/", "--"))
+
+    def manifest(self, name: str) -> StoredModel | None:
+        """The stored model's manifest, or None if it is not in the store"""
+        try:
+            with open(os.path.join(self.path(name), MANIFEST_NAME), encoding="utf-8") as f:
+                return StoredModel(**json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            return None
+
+    def models(self) -> list[StoredModel]:
+        """Every model in the store"""
+        if not os.path.isdir(self.root):
+            return []
+        found = [self.manifest(entry.replace("--", "/")) for entry in sorted(os.listdir(self.root))]
+        return [stored for stored in found if stored is not None]
+
+    def fetch(self, name: str, convert_from: str | None = None, quantization: str | None = None) -> StoredModel:
+        """Download (or convert) a model into the store and record its checksums
+
+        Args:
+            name: Model size (tiny ... large-v3) or CTranslate2 repository on the hub
+            convert_from: Transformers Whisper checkpoint to convert instead of downloading
+                pre-converted weights (needs the transformers package)
+            quantization: Weight type to convert to, e.g. int8 or float16 (conversion only)
+        """
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".fetch-", dir=self.root)
+        try:
+            start = time.perf_counter()
+            if convert_from:
+                import ctranslate2.converters
+
+                logger.info(f"Converting {convert_from} to CTranslate2 ({quantization or 'float16'})...")
+                converter = ctranslate2.converters.TransformersConverter(
+                    convert_from, copy_files=["tokenizer.json", "preprocessor_config.json"]
+                )
+                converter.convert(staging, quantization=quantization, force=True)
+            else:
+                logger.info(f"Downloading {name}...")
+                faster_whisper.download_model(name, output_dir=staging)
+            shutil.rmtree(os.path.join(staging, ".cache"), ignore_errors=True)  # hub download metadata
+
+            missing = [required for required in REQUIRED_FILES if not os.path.exists(os.path.join(staging, required))]
+            if missing:
+                raise RuntimeError(f"{name} is missing {', '.join(missing)}")
+
+            stored = StoredModel(
+                name=name,
+                source=convert_from or name,
+                files={relative: {"size": os.path.getsize(os.path.join(staging, relative)),
+                                  "sha256": file_sha256(os.path.join(staging, relative))}
+                       for relative in _walk(staging)},
+                quantization=quantization,
+                fetched=time.time(),
+            )
+            with open(os.path.join(staging, MANIFEST_NAME), "w", encoding="utf-8") as f:
+                json.dump(vars(stored), f, indent=2)
+
+            target = self.path(name)
+            if os.path.exists(target):
+                shutil.rmtree(target)
+            os.replace(staging, target)
+            logger.success(
+                f"Stored {name} in {target} ({stored.size_bytes / 1e6:.0f}MB, {time.perf_counter() - start:.1f}s)"
+            )
+            return stored
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def verify(self, name: str, checksums: bool = True) -> list[str]:
+        """Problems with a stored model: missing files, wrong sizes and (optionally) wrong checksums"""
+        stored = self.manifest(name)
+        if stored is None:
+            return [f"{name} is not in the store ({self.root})"]
+
+        problems = []
+        for relative, entry in stored.files.items():
+            path = os.path.join(self.path(name), relative)
+            if not os.path.exists(path):
+                problems.append(f"{relative} is missing")
+            elif os.path.getsize(path) != entry["size"]:
+                problems.append(f"{relative} has {os.path.getsize(path)} bytes, expected {entry['size']}")
+            elif checksums and file_sha256(path) != entry["sha256"]:
+                problems.append(f"{relative} does not match its checksum")
+        return problems
+
+    def resolve(self, model: str) -> str:
+        """Directory to load model from
+
+        A directory path is returned as is, and a stored model resolves to its
+        store directory after a size check (checksums are left to verify()).
+        Anything else is returned unchanged for faster-whisper to find on the
+        hub, unless offline mode is on.
+
+        Raises:
+            FileNotFoundError: Offline and the model is not in the store
+            RuntimeError: The stored model is incomplete
+        """
+        if os.path.isdir(model):
+            return model
+        if self.manifest(model) is not None:
+            problems = self.verify(model, checksums=False)
+            if problems:
+                raise RuntimeError(
+                    f"Stored model {model} is damaged ({'; '.join(problems)}); fetch it again with: "
+                    f"python models.py fetch {model}"
+                )
+            return self.path(model)
+        if offline_mode():
+            raise FileNotFoundError(
+                f"Model {model} is not in the model store ({self.root}); "
+                f"fetch it on a connected machine with: python models.py fetch {model}"
+            )
+        return model
+
+    def warm(self, model: str) -> int:
+        """Read a stored model's files so its weights are in the page cache before the first load
+
+        Returns:
+            Bytes read (0 if the model is not in the store)
+        """
+        stored = self.manifest(model)
+        if stored is None:
+            return 0
+
+        start = time.perf_counter()
+        buffer = bytearray(HASH_BLOCK_BYTES)
+        total = 0
+        for relative in stored.files:
+            with open(os.path.join(self.path(model), relative), "rb", buffering=0) as f:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                while read := f.readinto(buffer):
+                    total += read
+        elapsed = time.perf_counter() - start
+        logger.info(f"Warmed {model}: {total / 1e6:.0f}MB in {elapsed:.2f}s")
+        return total
+
+    def remove(self, name: str) -> bool:
+        target = self.path(name)
+        if not os.path.isdir(target):
+            return False
+        shutil.rmtree(target)
+        return True
+
+
+def _walk(directory: str) -> list[str]:
+    """Files under directory as sorted relative paths"""
+    files: list[str] = []
+    for parent, _, names in os.walk(directory):
+        files.extend(os.path.relpath(os.path.join(parent, name), directory) for name in names)
+    return sorted(files)
+
+
+# Store used by the model cache (SPEECH2TEXT_MODEL_DIR)
+model_store = ModelStore()
@@ -0,0 +1,175 @@
+"""Pipelined record + transcribe: rolling windows are decoded while recording continues"""
+import queue
+import threading
+import time
+from typing import Any
+
+import numpy as np
+
+from .cascade import transcribe_cascade
+from .logger import logger
+from .model_cache import get_model
+from .preprocess import preprocess_audio, quietest_cut
+from .transcriber import (
+    TRANSCRIBE_OPTIONS,
+    ComputeType,
+    DeviceType,
+    ModelSize,
+    TranscriptSegment,
+    resolve_compute_type,
+)
+
+
+class PipelinedTranscriber:
+    """Consumes recorded blocks and transcribes rolling windows in the background
+
+    Blocks are appended as they are written to disk. Once window_s of audio
+    has accumulated, the window is cut at the quietest frame of its last
+    search_s (so words are rarely split) and queued for a worker thread that
+    decodes it with a warm model. When recording ends only the last window
+    is left to transcribe, so the total time approaches the recording time.
+    With a draft_model each window is cascade-decoded, and with preprocess
+    its silence is trimmed first (timestamps still follow the recording).
+    """
+
+    def __init__(
+        self,
+        model: ModelSize = "large-v3",
+        device: DeviceType = "cpu",
+        compute_type: ComputeType = "int8",
+        cpu_threads: int = 0,
+        sample_rate: int = 16000,
+        window_s: float = 30.0,
+        search_s: float = 5.0,
+        frame_ms: int = 30,
+        options: dict[str, Any] | None = None,
+        draft_model: ModelSize | None = None,
+        preprocess: bool = False,
+        denoise: bool = False,
+    ) -> None:
+        """
+        Args:
+            model: Model size (tiny, base, small, medium, large-v3)
+            device: Processing device (cpu or cuda)
+            compute_type: Quantization type
+            cpu_threads: Number of CPU threads (0 = CTranslate2 default)
+            sample_rate: Sample rate of the fed blocks (16000 for Whisper)
+            window_s: Audio per transcribed window
+            search_s: Window tail searched for a quiet cut point
+            frame_ms: Frame length used to measure loudness
+            options: WhisperModel.transcribe options (default: TRANSCRIBE_OPTIONS)
+            draft_model: Draft with this model and re-decode low-confidence ranges with model
+            preprocess: Trim silence and normalize loudness of each window before decoding
+            denoise: Also apply spectral-gating noise reduction (implies preprocess)
+        """
+        self.model = model
+        self.device = device
+        self.compute_type = resolve_compute_type(device, compute_type)
+        self.cpu_threads = cpu_threads
+        self.sample_rate = sample_rate
+        self.window = int(window_s * sample_rate)
+        self.search = int(search_s * sample_rate)
+        self.frame = sample_rate * frame_ms // 1000
+        self.options = options or TRANSCRIBE_OPTIONS
+        self.draft_model = draft_model
+        self.preprocess = preprocess or denoise
+        self.denoise = denoise
+
+        self.segments: list[TranscriptSegment] = []
+        self.windows = 0
+        self._blocks: list[np.ndarray] = []
+        self._pending = 0  # samples in _blocks
+        self._offset = 0  # absolute sample index of _blocks[0]
+        self._jobs: queue.Queue[tuple[int, np.ndarray] | None] = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._error: Exception | None = None
+
+    def start(self) -> None:
+        """Start the worker thread, which loads the model while recording begins"""
+        self._worker = threading.Thread(target=self._transcribe_loop, name="pipeline-transcriber", daemon=True)
+        self._worker.start()
+
+    def feed(self, block: np.ndarray) -> None:
+        """Append recorded samples, queueing a window when enough has accumulated"""
+        self._blocks.append(block.reshape(-1).astype(np.float32, copy=False))
+        self._pending += len(self._blocks[-1])
+        if self._pending < self.window:
+            return
+
+        audio = np.concatenate(self._blocks)
+        cut = quietest_cut(audio, max(0, self.window - self.search), self.window, self.frame)
+        self._jobs.put((self._offset, audio[:cut]))
+        self._offset += cut
+        self._blocks = [audio[cut:]]
+        self._pending = len(audio) - cut
+
+    def finish(self) -> list[TranscriptSegment]:
+        """Queue the remaining audio, wait for the worker and return all segments"""
+        if self._pending:
+            self._jobs.put((self._offset, np.concatenate(self._blocks)))
+            self._offset += self._pending
+            self._blocks, self._pending = [], 0
+
+        backlog = self._jobs.qsize()
+        if backlog:
+            logger.info(f"Recording finished, {backlog} window(s) left to transcribe...")
+        self._jobs.put(None)
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+        if self._error is not None:
+            raise RuntimeError(f"Transcription error: {str(self._error)}") from self._error
+        return self.segments
+
+    def _transcribe_loop(self) -> None:
+        """Decode queued windows in order, shifting segments to recording time"""
+        try:
+            whisper = get_model(self.model, self.device, self.compute_type, self.cpu_threads)
+            if self.draft_model:
+                get_model(self.draft_model, self.device, self.compute_type, self.cpu_threads)
+        except Exception as e:
+            self._error = e
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            if self._error is not None:
+                continue  # drain the queue so finish() can report the error
+
+            offset, audio = job
+            start = time.perf_counter()
+            try:
+                shift = offset / self.sample_rate
+                for transcript in self._transcribe_window(whisper, audio):
+                    transcript.start += shift
+                    transcript.end += shift
+                    self.segments.append(transcript)
+            except Exception as e:
+                self._error = e
+                continue
+
+            self.windows += 1
+            elapsed = time.perf_counter() - start
+            logger.info(
+                f"Window {self.windows} transcribed ({len(audio) / self.sample_rate:.1f}s of audio in {elapsed:.1f}s)"
+            )
+
+    def _transcribe_window(self, whisper: Any, audio: np.ndarray) -> list[TranscriptSegment]:
+        """Segments of one window, with times relative to the start of the window"""
+        time_map = None
+        if self.preprocess:
+            preprocessed = preprocess_audio(audio, self.sample_rate, denoise=self.denoise)
+            audio, time_map = preprocessed.audio, preprocessed.time_map
+            if len(audio) == 0:
+                return []
+
+        if self.draft_model:
+            segments = list(transcribe_cascade(
+                audio, self.model, self.draft_model, self.device, self.compute_type, self.cpu_threads, self.options
+            ))
+        else:
+            decoded, _ = whisper.transcribe(audio, **self.options)
+            segments = [TranscriptSegment.from_whisper(segment) for segment in decoded]
+        return [time_map.remap(segment) for segment in segments] if time_map else segments
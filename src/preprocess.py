@@ -0,0 +1,240 @@
+"""Vectorized preprocessing before transcription: silence removal, loudness normalization, denoise"""
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from .logger import logger
+from .transcriber import TranscriptSegment
+
+
+@dataclass
+class TimeMap:
+    """Maps times in the preprocessed audio back to the original recording"""
+
+    kept: np.ndarray  # (n, 2) [start, end) sample ranges of the original that were kept
+    sample_rate: int
+
+    def to_original(self, seconds: float, end: bool = False) -> float:
+        """Original time of a point in the processed audio
+
+        An end time that falls exactly on a removed gap stays at the end of
+        the range before the gap instead of jumping past it.
+        """
+        if len(self.kept) == 0:
+            return seconds
+        lengths = self.kept[:, 1] - self.kept[:, 0]
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        position = seconds * self.sample_rate
+        index = int(np.searchsorted(offsets, position, side="left" if end else "right")) - 1
+        index = min(max(index, 0), len(self.kept) - 1)
+        return float(self.kept[index, 0] + position - offsets[index]) / self.sample_rate
+
+    def remap(self, segment: TranscriptSegment) -> TranscriptSegment:
+        """Segment with its timestamps moved back to the original recording"""
+        return replace(segment, start=self.to_original(segment.start), end=self.to_original(segment.end, end=True))
+
+
+@dataclass
+class PreprocessResult:
+    """Processed audio with the bookkeeping needed to report and undo the cuts"""
+
+    audio: np.ndarray
+    time_map: TimeMap
+    original_seconds: float
+
+    @property
+    def removed_seconds(self) -> float:
+        return self.original_seconds - len(self.audio) / self.time_map.sample_rate
+
+
+def frame_db(audio: np.ndarray, frame: int) -> np.ndarray:
+    """RMS level in dBFS of consecutive frames (the last partial frame is padded)"""
+    padded = np.pad(audio, (0, -len(audio) % frame))
+    rms = np.sqrt(np.mean(padded.reshape(-1, frame) ** 2, axis=1))
+    db: np.ndarray = 20 * np.log10(np.maximum(rms, 1e-10))
+    return db
+
+
+def quietest_cut(audio: np.ndarray, start: int, end: int, frame: int) -> int:
+    """Return the sample index at the centre of the quietest frame in audio[start:end]"""
+    usable = (end - start) // frame * frame
+    if usable == 0:
+        return end
+    frames = audio[start:start + usable].reshape(-1, frame)
+    quietest = int(np.argmin(np.mean(frames ** 2, axis=1)))
+    return start + quietest * frame + frame // 2
+
+
+def silence_threshold(
+    levels: np.ndarray,
+    margin_db: float = 15.0,
+    floor_db: float = -80.0,
+    noise_percentile: float = 10.0,
+) -> float:
+    """Frame level (dBFS) above which this recording counts as speech
+
+    The noise floor is the noise_percentile-th frame level, and speech must
+    rise margin_db above it. A recording with no quieter stretch to measure
+    (nothing reaches noise floor + margin_db) is treated as speech throughout,
+    down to floor_db, so continuous quiet captures are not dropped.
+    """
+    noise_db = float(np.percentile(levels, noise_percentile)) if len(levels) else floor_db
+    if len(levels) and float(levels.max()) >= noise_db + margin_db:
+        return max(noise_db + margin_db, floor_db)
+    return floor_db
+
+
+def speech_ranges(
+    voiced: np.ndarray,
+    frame: int,
+    total: int,
+    pad_frames: int,
+    min_gap_frames: int,
+) -> np.ndarray:
+    """Sample ranges to keep: voiced frames plus padding, and gaps shorter than min_gap
+
+    Leading and trailing silence is cut down to pad_frames, and silent gaps
+    of at least min_gap_frames are shortened to pad_frames on each side.
+    """
+    n = len(voiced)
+    if not voiced.any():
+        return np.zeros((0, 2), dtype=np.int64)
+
+    index = np.arange(n)
+    voiced_index = np.where(voiced, index, -1)
+    previous = np.maximum.accumulate(voiced_index)  # last voiced frame at or before i (-1 if none)
+    following = np.where(voiced, index, n)
+    following = np.minimum.accumulate(following[::-1])[::-1]  # next voiced frame at or after i (n if none)
+
+    gap = following - previous - 1
+    interior = (previous >= 0) & (following < n)
+    keep = (
+        voiced
+        | (interior & (gap < min_gap_frames))
+        | ((previous >= 0) & (index - previous <= pad_frames))
+        | ((following < n) & (following - index <= pad_frames))
+    )
+
+    edges = np.diff(np.concatenate([[0], keep.astype(np.int8), [0]]))
+    starts = np.flatnonzero(edges == 1) * frame
+    ends = np.minimum(np.flatnonzero(edges == -1) * frame, total)
+    ranges: np.ndarray = np.stack([starts, ends], axis=1).astype(np.int64)
+    return ranges
+
+
+def normalize_loudness(audio: np.ndarray, level_db: float, target_db: float = -20.0, max_gain_db: float = 30.0) -> np.ndarray:
+    """Scale audio so its speech level reaches target_db without clipping"""
+    gain_db = min(target_db - level_db, max_gain_db)
+    peak = float(np.max(np.abs(audio))) if len(audio) else 0.0
+    if peak > 0:
+        gain_db = min(gain_db, 20 * np.log10(0.99 / peak))
+    return (audio * 10 ** (gain_db / 20)).astype(np.float32)
+
+
+def spectral_gate(
+    audio: np.ndarray,
+    n_fft: int = 1024,
+    hop: int = 256,
+    n_std: float = 2.0,
+    reduction: float = 0.9,
+    quiet_fraction: float = 0.1,
+    block_frames: int = 2048,
+) -> np.ndarray:
+    """Attenuate time-frequency bins that do not rise above the noise profile
+
+    The noise profile is the per-bin magnitude mean and standard deviation of
+    the quietest quiet_fraction of frames. Bins below mean + n_std * std are
+    reduced by `reduction`. The STFT is processed in blocks of frames so memory stays bounded for
+    long recordings.
+    """
+    if len(audio) < n_fft:
+        return audio
+
+    window = np.hanning(n_fft).astype(np.float32)
+    half = n_fft // 2
+    padded = np.pad(audio.astype(np.float32, copy=False), (half, half + n_fft))
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft)[::hop]
+    n_frames = (len(audio) + half) // hop + 1
+    frames = frames[:n_frames]
+
+    # Noise profile from the quietest frames
+    energy = np.einsum("ij,ij->i", frames, frames)
+    quiet = np.argsort(energy)[:max(1, int(n_frames * quiet_fraction))]
+    noise_magnitude = np.abs(np.fft.rfft(frames[quiet] * window, axis=1))
+    noise = noise_magnitude.mean(axis=0) + n_std * noise_magnitude.std(axis=0)
+
+    out = np.zeros(len(padded), dtype=np.float32)
+    norm = np.zeros(len(padded), dtype=np.float32)
+    overlaps = n_fft // hop
+    for first in range(0, n_frames, block_frames):
+        block = frames[first:first + block_frames]
+        spectrum = np.fft.rfft(block * window, axis=1)
+        gain = np.where(np.abs(spectrum) > noise, 1.0, 1.0 - reduction)
+        restored = (np.fft.irfft(spectrum * gain, n=n_fft, axis=1) * window).astype(np.float32)
+
+        # Overlap-add: frame k covers [k*hop, k*hop + n_fft); split each frame into hop-sized parts
+        parts = restored.reshape(len(block), overlaps, hop)
+        for r in range(overlaps):
+            start = (first + r) * hop
+            out[start:start + len(block) * hop] += parts[:, r, :].reshape(-1)
+            norm[start:start + len(block) * hop] += np.tile(window[r * hop:(r + 1) * hop] ** 2, len(block))
+
+    restored_audio: np.ndarray = out[half:half + len(audio)] / np.maximum(norm[half:half + len(audio)], 1e-3)
+    return restored_audio
+
+
+def preprocess_audio(
+    audio: np.ndarray,
+    sample_rate: int = 16000,
+    threshold_db: float | None = None,
+    min_gap_s: float = 1.0,
+    pad_s: float = 0.2,
+    target_db: float = -20.0,
+    denoise: bool = False,
+    frame_ms: int = 30,
+) -> PreprocessResult:
+    """Trim silence, shorten long gaps, normalize loudness and optionally denoise
+
+    Args:
+        audio: Mono float32 samples
+        sample_rate: Sample rate in Hz
+        threshold_db: Frames quieter than this (dBFS) are silence; by default
+            the threshold follows the recording's own noise floor
+        min_gap_s: Silent gaps at least this long are shortened
+        pad_s: Silence kept around speech at each cut
+        target_db: Speech level after normalization (dBFS)
+        denoise: Apply spectral-gating noise reduction first
+        frame_ms: Analysis frame length
+    """
+    original_seconds = len(audio) / sample_rate
+    if denoise:
+        audio = spectral_gate(audio)
+
+    frame = sample_rate * frame_ms // 1000
+    levels = frame_db(audio, frame)
+    if threshold_db is None:
+        threshold_db = silence_threshold(levels)
+        logger.debug(f"Silence threshold {threshold_db:.1f} dBFS")
+    voiced = levels > threshold_db
+    kept = speech_ranges(
+        voiced,
+        frame,
+        len(audio),
+        pad_frames=max(1, int(pad_s * sample_rate) // frame),
+        min_gap_frames=max(1, int(min_gap_s * sample_rate) // frame),
+    )
+
+    if len(kept):
+        processed = np.concatenate([audio[start:end] for start, end in kept])
+        speech_db = float(20 * np.log10(np.sqrt(np.mean(10 ** (levels[voiced] / 10)))))
+        processed = normalize_loudness(processed, speech_db, target_db)
+    else:
+        processed = np.zeros(0, dtype=np.float32)
+
+    result = PreprocessResult(processed, TimeMap(kept, sample_rate), original_seconds)
+    if original_seconds:
+        logger.info(
+            f"Preprocessing removed {result.removed_seconds:.1f}s of {original_seconds:.1f}s "
+            f"({result.removed_seconds / original_seconds:.0%})"
+        )
+    return result
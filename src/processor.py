@@ -1,10 +1,33 @@
 # TODO: double check on en-us
 import os
-from typing import Protocol
+import time
+from collections.abc import Iterable
+from dataclasses import replace
+from itertools import chain
+from typing import Any, Protocol
 
-from .audio_converter import converter_mp3_to_wav, verify_audio
-from .transcriber import transcribe_audio, ModelSize, DeviceType, ComputeType
+import numpy as np
+
+from .audio_converter import SAMPLE_RATE, decode_audio
+from .audio_source import AudioSource, open_source, transcribe_windows, write_wav
+from .cascade import transcribe_cascade
+from .checkpoint import Checkpoint, checkpoint_key
+from .chunking import transcribe_chunked
+from .preprocess import preprocess_audio
+from .profiles import decoding_options
+from .result_cache import ResultCache
+from .transcript_index import index_transcript
+from .transcriber import (
+    ComputeType,
+    DeviceType,
+    ModelSize,
+    TranscriptSegment,
+    iter_segments,
+    resolve_compute_type,
+)
+from .writers import get_writer
 from .logger import logger
+from .metrics import metrics
 
 
 class ProcessArgs(Protocol):
@@ -16,35 +39,189 @@ class ProcessArgs(Protocol):
     device: DeviceType
     compute_type: ComputeType
     keep_wav: bool
+    cpu_threads: int
+    no_cache: bool
+    chunk_workers: int
+    format: str
+    preprocess: bool
+    denoise: bool
+    profile: str | None
+    language: str | None
+    decode_options: dict[str, Any]
+    resume: bool
+    draft_model: ModelSize | None
+    model_workers: int
+
+
+def transcribe_input(
+    args: ProcessArgs,
+    options: dict[str, Any] | None = None,
+    checkpoint: Checkpoint | None = None,
+    stats: dict[str, Any] | None = None,
+) -> Iterable[TranscriptSegment]:
+    """Decode the input in-process and transcribe it, lazily when possible
+
+    With a checkpoint, decoding resumes after its last segment and every new
+    segment is recorded in it before being returned. The decoded duration is
+    stored in stats["audio_seconds"].
+    """
+    # 16kHz PCM WAV/raw files (recorder and converter output) are memory-mapped
+    # and read window by window, so memory does not grow with the recording.
+    # Preprocessing works on the whole recording, so it still decodes.
+    audio: np.ndarray | AudioSource | None = None
+    with metrics.stage("decode", input=args.input) as event:
+        if not (args.preprocess or args.denoise):
+            audio = open_source(args.input)
+            if audio is not None:
+                logger.info(f"Memory-mapped {args.input} ({audio.duration:.1f}s, 16kHz PCM)")
+        event["mapped"] = audio is not None
+        if audio is None:
+            # Decode to 16kHz mono in memory (no temporary WAV, no ffmpeg process
+            # for the formats libsndfile or PyAV can read)
+            audio = decode_audio(args.input, SAMPLE_RATE)
+        event["ok"] = audio is not None
+    if audio is None:
+        raise RuntimeError("Failed to decode audio")
+    if stats is not None:
+        stats["audio_seconds"] = len(audio) / SAMPLE_RATE
+
+    if args.keep_wav and not args.input.lower().endswith(".wav"):
+        wav_path = os.path.splitext(args.input)[0] + ".wav"
+        write_wav(wav_path, audio)
+        logger.info(f"WAV file kept: {wav_path}")
+
+    # Trim silence (and optionally noise) so the decoder sees less audio;
+    # timestamps are mapped back to the original recording afterwards
+    time_map = None
+    if isinstance(audio, np.ndarray) and (args.preprocess or args.denoise):
+        preprocessed = preprocess_audio(audio, SAMPLE_RATE, denoise=args.denoise)
+        audio, time_map = preprocessed.audio, preprocessed.time_map
+        if len(audio) == 0:
+            logger.warning("No speech found after preprocessing")
+            return []
+
+    # Resume by skipping the audio the checkpoint already covers. The samples
+    # are sliced rather than passed as clip_timestamps, which would disable
+    # the VAD filter.
+    resumed: list[TranscriptSegment] = list(checkpoint.segments) if checkpoint else []
+    offset = checkpoint.offset if checkpoint else 0.0
+    if offset:
+        skip = int(offset * SAMPLE_RATE)
+        audio = audio.view(skip) if isinstance(audio, AudioSource) else audio[skip:]
+
+    # Long-audio mode: transcribe parallel chunks of the decoded samples.
+    # Cascade mode: draft with a fast model, re-decode what it was unsure of.
+    segments: Iterable[TranscriptSegment]
+    if len(audio) == 0:
+        segments = []
+    elif args.draft_model:
+        if args.chunk_workers > 1:
+            logger.warning("Cascade mode decodes sequentially, ignoring --chunk-workers")
+        segments = transcribe_cascade(
+            audio, args.model, args.draft_model, args.device, args.compute_type, args.cpu_threads,
+            options=options,
+            draft_options=decoding_options("fast", args.language),
+            num_workers=args.model_workers,
+        )
+    elif args.chunk_workers > 1:
+        segments = transcribe_chunked(
+            audio, args.model, args.device, args.compute_type, args.chunk_workers, args.cpu_threads,
+            options=options,
+        )
+    else:
+        def transcribe(samples: np.ndarray) -> Iterable[TranscriptSegment]:
+            return iter_segments(
+                samples, args.model, args.device, args.compute_type, args.cpu_threads, options, args.model_workers
+            )
+
+        segments = transcribe_windows(audio, transcribe) if isinstance(audio, AudioSource) else transcribe(audio)
 
+    if offset:
+        segments = (replace(s, start=s.start + offset, end=s.end + offset) for s in segments)
+    if checkpoint is not None:
+        segments = chain(resumed, checkpoint.track(segments))
 
-def process_input(args: ProcessArgs) -> None:
-    """Main audio processing workflow"""
+    if time_map is not None:
+        return (time_map.remap(segment) for segment in segments)
+    return segments
+
+
+@metrics.timed("process")
+def process_input(args: ProcessArgs) -> list[TranscriptSegment]:
+    """Main audio processing workflow, returning the transcribed segments"""
     # Verify input file
     if not os.path.exists(args.input):
         raise FileNotFoundError(f"File {args.input} not found!")
 
-    path_audio = args.input
-    wav_temp = None
-
-    # Convert MP3 to WAV if necessary
-    if args.input.lower().endswith(".mp3"):
-        wav_temp = os.path.splitext(args.input)[0] + ".wav"
-        if not converter_mp3_to_wav(args.input, wav_temp):
-            raise RuntimeError("Failed to convert MP3 to WAV")
-        verify_audio(wav_temp)
-        path_audio = wav_temp
-    # Transcribe audio
-    text = transcribe_audio(path_audio, args.model, args.device, args.compute_type)
-
-    # Save transcription
-    with open(args.output, "w", encoding="utf-8") as f:
-        f.write(text)
-
-    # Clean temporary file
-    if wav_temp and not args.keep_wav:
-        try:
-            os.remove(wav_temp)
-            logger.info(f"Temporary file {wav_temp} removed")
-        except Exception as e:
-            logger.warning(f"Error removing temporary file: {str(e)}")
+    # Profile, language and overrides resolve to the options given to the decoder
+    options = decoding_options(args.profile, args.language, args.decode_options)
+
+    # Look up previous results for the same audio and parameters
+    cache = ResultCache()
+    cache_key = None
+    cached: list[TranscriptSegment] | None = None
+    params = {
+        "model": args.model,
+        "compute_type": resolve_compute_type(args.device, args.compute_type),
+        "chunked": args.chunk_workers > 1,
+        "preprocess": args.preprocess or args.denoise,
+        "denoise": args.denoise,
+        **options,
+    }
+    if args.draft_model:
+        params["draft_model"] = args.draft_model
+    if not args.no_cache:
+        cache_key = cache.key_for(args.input, params)
+        if cache_key:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info("Using cached transcription")
+
+    # Long runs record decoded segments next to the output, so a re-run after
+    # a crash or preemption continues where the last one stopped
+    checkpoint = None
+    if cached is None:
+        checkpoint = Checkpoint.open(args.output, checkpoint_key(args.input, params), args.resume)
+    stats: dict[str, Any] = {}
+    segments = cached if cached is not None else transcribe_input(args, options, checkpoint, stats)
+
+    # Write segments as they are decoded. Output goes to OUTPUT.part (which
+    # can be tailed) and is renamed when complete, so a finished output is
+    # never partial and batch runs can skip it safely.
+    collected: list[TranscriptSegment] = []
+    partial = args.output + ".part"
+    write_seconds = 0.0
+    started = time.perf_counter()
+    try:
+        with open(partial, "w", encoding="utf-8") as f:
+            writer = get_writer(args.format, f)
+            for segment in segments:
+                written = time.perf_counter()
+                writer.write(segment)
+                write_seconds += time.perf_counter() - written
+                collected.append(segment)
+            writer.close()
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    os.replace(partial, args.output)
+    if checkpoint is not None:
+        checkpoint.remove()
+
+    if cached is None:
+        metrics.observe(
+            "transcribe",
+            time.perf_counter() - started - write_seconds,
+            input=args.input,
+            model=args.model,
+            audio_seconds=stats.get("audio_seconds", 0.0),
+            segments=len(collected),
+        )
+    metrics.observe("write", write_seconds, output=args.output, format=args.format, segments=len(collected))
+
+    if cache_key and cached is None:
+        cache.put(cache_key, collected)
+
+    # Make the transcript searchable (search.py); SPEECH2TEXT_INDEX=off skips this
+    index_transcript(os.path.abspath(args.input), collected, output=os.path.abspath(args.output), params=params)
+    return collected
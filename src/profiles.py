@@ -0,0 +1,117 @@
+"""Named decoding profiles trading accuracy for speed, with language and per-option overrides"""
+import inspect
+import json
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .lazy import lazy_import
+from .transcriber import TRANSCRIBE_OPTIONS, ModelSize
+
+if TYPE_CHECKING:
+    import faster_whisper
+else:
+    faster_whisper = lazy_import("faster_whisper")
+
+DEFAULT_PROFILE = "accurate"
+DEFAULT_LANGUAGE = "pt"
+
+
+@dataclass(frozen=True)
+class DecodingProfile:
+    """A default model and the WhisperModel.transcribe options that go with it"""
+
+    name: str
+    model: ModelSize
+    description: str
+    options: dict[str, Any] = field(default_factory=dict)
+
+
+_BASE_OPTIONS = {k: v for k, v in TRANSCRIBE_OPTIONS.items() if k != "language"}
+
+PROFILES: dict[str, DecodingProfile] = {
+    "fast": DecodingProfile(
+        "fast",
+        "small",
+        "Greedy decoding, no temperature fallback, no conditioning on previous text",
+        {
+            **_BASE_OPTIONS,
+            "beam_size": 1,
+            "best_of": 1,
+            "temperature": 0.0,
+            "condition_on_previous_text": False,
+        },
+    ),
+    "balanced": DecodingProfile(
+        "balanced",
+        "medium",
+        "Small beam on a medium model",
+        {**_BASE_OPTIONS, "beam_size": 2, "best_of": 2},
+    ),
+    "accurate": DecodingProfile(
+        "accurate",
+        "large-v3",
+        "Beam search 5 on large-v3 (the original settings)",
+        dict(_BASE_OPTIONS),
+    ),
+}
+
+
+def get_profile(name: str | None) -> DecodingProfile:
+    """Look up a profile by name (None = the default profile)"""
+    profile = PROFILES.get(name or DEFAULT_PROFILE)
+    if profile is None:
+        raise ValueError(f"Unknown profile: {name} (choose from {', '.join(PROFILES)})")
+    return profile
+
+
+def parse_overrides(items: list[str] | None) -> dict[str, Any]:
+    """Parse KEY=VALUE decoding overrides; values are read as JSON when possible
+
+    Examples: beam_size=3, vad_filter=false, temperature=[0.0,0.2], initial_prompt=Reunião
+    """
+    overrides: dict[str, Any] = {}
+    for item in items or []:
+        key, sep, raw = item.partition("=")
+        if not sep or not key.strip():
+            raise ValueError(f"Expected KEY=VALUE, got: {item}")
+        try:
+            overrides[key.strip()] = json.loads(raw)
+        except json.JSONDecodeError:
+            overrides[key.strip()] = raw
+    return overrides
+
+
+def decoding_options(
+    profile: str | None = None,
+    language: str | None = DEFAULT_LANGUAGE,
+    overrides: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Build WhisperModel.transcribe options from a profile, a language and overrides
+
+    Args:
+        profile: Profile name (fast, balanced, accurate; None = accurate)
+        language: Language code such as pt or en; "auto" or None detects it per file
+        overrides: Options that replace the profile's values
+
+    Raises:
+        ValueError: Unknown profile or an override WhisperModel.transcribe does not accept
+    """
+    options = dict(get_profile(profile).options)
+    options["language"] = None if language in (None, "", "auto") else language
+    return apply_overrides(options, overrides)
+
+
+def apply_overrides(options: dict[str, Any], overrides: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Return a copy of options with overrides applied on top
+
+    Raises:
+        ValueError: An override WhisperModel.transcribe does not accept
+    """
+    options = dict(options)
+    if overrides:
+        accepted = inspect.signature(faster_whisper.WhisperModel.transcribe).parameters
+        unknown = sorted(set(overrides) - set(accepted))
+        if unknown:
+            raise ValueError(f"Unknown decoding option(s): {', '.join(unknown)}")
+        options.update(overrides)
+    return options
@@ -0,0 +1,179 @@
+"""Simulated input device: replays an audio file through a sounddevice-style callback"""
+import functools
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+import soundfile as sf
+
+from .audio_converter import decode_audio
+from .logger import logger
+
+REPLAY_ENV = "SPEECH2TEXT_REPLAY_INPUT"
+SPEED_ENV = "SPEECH2TEXT_REPLAY_SPEED"
+
+
+@dataclass
+class ReplayFlags:
+    """Stand-in for sounddevice.CallbackFlags"""
+
+    input_overflow: bool = False
+    input_underflow: bool = False
+
+    def __bool__(self) -> bool:
+        return self.input_overflow or self.input_underflow
+
+    def __str__(self) -> str:
+        return ", ".join(name for name in ("input_overflow", "input_underflow") if getattr(self, name))
+
+
+class ReplayInputStream:
+    """Drop-in for sounddevice.InputStream that plays a file instead of capturing
+
+    Blocks are delivered from a background thread, like PortAudio's callback
+    thread, at real time (speed=1), faster (speed>1) or as fast as the
+    callback returns (speed=0). When the thread falls more than a block
+    behind schedule (a slow callback, an overloaded machine), the late blocks
+    are skipped and the next one is flagged input_overflow, as a real device
+    would. time_info carries the position of the block in the file as
+    inputBufferAdcTime, so skipped audio shows up as a timestamp gap.
+    The stream becomes inactive at the end of the file unless loop is set.
+
+    Files libsndfile reads at the stream's rate are read block by block, so
+    replaying a long recording does not load it; anything else is decoded
+    (and resampled) up front.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        samplerate: float = 16000,
+        channels: int = 1,
+        blocksize: int = 0,
+        callback: Callable[[np.ndarray, int, Any, Any], None] | None = None,
+        dtype: str = "float32",
+        device: Any = None,
+        speed: float = 1.0,
+        loop: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        self._file: sf.SoundFile | None = None
+        self._audio: np.ndarray | None = None
+        try:
+            self._file = sf.SoundFile(path)
+            if self._file.samplerate != int(samplerate):
+                self._file.close()
+                self._file = None
+        except Exception:
+            self._file = None
+        if self._file is not None:
+            self._frames = self._file.frames
+        else:
+            self._audio = decode_audio(path, int(samplerate))
+            if self._audio is None:
+                raise RuntimeError(f"Cannot replay {path}")
+            self._frames = len(self._audio)
+        self.path = path
+        self.samplerate = int(samplerate)
+        self.channels = channels
+        self.blocksize = blocksize or self.samplerate // 10
+        self.callback = callback
+        self.dtype = dtype
+        self.speed = speed
+        self.loop = loop
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.active = False
+
+    def start(self) -> None:
+        self._stop.clear()
+        self.active = True
+        self._thread = threading.Thread(target=self._run, name="replay-device", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        self.active = False
+
+    def close(self) -> None:
+        self.stop()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self) -> "ReplayInputStream":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _read(self, position: int, frames: int) -> np.ndarray:
+        """Mono samples of the block at position, repeated on every channel"""
+        if self._file is not None:
+            self._file.seek(position)
+            data = self._file.read(frames, dtype="float32", always_2d=True)
+            mono = data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+        else:
+            assert self._audio is not None
+            mono = self._audio[position:position + frames]
+        return np.repeat(mono[:, None], self.channels, axis=1).astype(self.dtype, copy=False)
+
+    def _run(self) -> None:
+        block = self.blocksize
+        period = block / self.samplerate / self.speed if self.speed > 0 else 0.0
+        position = 0
+        started = time.monotonic()
+        overflow = False
+        try:
+            while not self._stop.is_set():
+                if position >= self._frames:
+                    if not self.loop or not self._frames:
+                        break
+                    position = 0
+                    started = time.monotonic()
+
+                if period:
+                    due = started + position / block * period
+                    late = time.monotonic() - due
+                    if late > period:
+                        skipped = int(late / period) * block
+                        position += skipped
+                        overflow = True
+                        continue
+                    if late < 0:
+                        self._stop.wait(-late)
+
+                indata = self._read(position, block)
+                time_info = SimpleNamespace(
+                    inputBufferAdcTime=position / self.samplerate,
+                    currentTime=(time.monotonic() - started) * max(self.speed, 1.0),
+                )
+                if self.callback is not None:
+                    self.callback(indata, len(indata), time_info, ReplayFlags(input_overflow=overflow))
+                overflow = False
+                position += block
+        except Exception as e:
+            logger.error(f"Replay device stopped: {str(e)}")
+        finally:
+            self.active = False
+
+
+def replay_stream_factory(path: str, speed: float = 1.0, loop: bool = False) -> Callable[..., ReplayInputStream]:
+    """An InputStream constructor replaying path, for audio_recorder.set_input_stream"""
+    return functools.partial(ReplayInputStream, path, speed=speed, loop=loop)
+
+
+def replay_from_env() -> Callable[..., ReplayInputStream] | None:
+    """Replay factory configured by SPEECH2TEXT_REPLAY_INPUT (and SPEECH2TEXT_REPLAY_SPEED), if set"""
+    path = os.environ.get(REPLAY_ENV)
+    if not path:
+        return None
+    return replay_stream_factory(path, float(os.environ.get(SPEED_ENV, "1.0")))
@@ -0,0 +1,167 @@
+"""Content-addressed on-disk cache of transcription results"""
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+from dataclasses import asdict
+from typing import Any
+
+import soundfile as sf
+
+from .audio_converter import iter_pyav
+from .logger import logger
+from .transcriber import TranscriptSegment
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "SPEECH2TEXT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "speech2text", "results")
+)
+DEFAULT_MAX_CACHE_MB = int(os.environ.get("SPEECH2TEXT_RESULT_CACHE_MB", "512"))
+
+HASH_BLOCK_FRAMES = 1 << 16
+HASH_BLOCK_BYTES = 1 << 20
+
+
+def hash_audio(path: str, sample_rate: int = 16000) -> str | None:
+    """Hash the decoded PCM of an audio file without loading it fully into memory
+
+    Files libsndfile can read (WAV, FLAC, OGG, MP3) are hashed block by block
+    as int16 samples together with their sample rate and channel count.
+    Anything else is decoded in-process by PyAV (or, failing that, by an
+    ffmpeg subprocess) to 16kHz mono int16 and hashed as it streams out.
+    Container metadata never affects the hash.
+
+    Returns:
+        Hex digest, or None if the file could not be decoded
+    """
+    digest = hashlib.sha256()
+    try:
+        info = sf.info(path)
+        digest.update(f"sf:{info.samplerate}:{info.channels}:".encode())
+        for block in sf.blocks(path, blocksize=HASH_BLOCK_FRAMES, dtype='int16'):
+            digest.update(block.tobytes())
+        return digest.hexdigest()
+    except Exception:
+        pass
+
+    try:
+        digest = hashlib.sha256(f"av:{sample_rate}:1:".encode())
+        for samples, _ in iter_pyav(path, "s16", sample_rate, "mono"):
+            digest.update(samples.tobytes())
+        return digest.hexdigest()
+    except Exception:
+        pass
+
+    cmd = [
+        'ffmpeg',
+        '-nostdin',
+        '-i', path,
+        '-f', 's16le',
+        '-ar', str(sample_rate),
+        '-ac', '1',
+        '-loglevel', 'error',
+        '-'
+    ]
+    try:
+        digest = hashlib.sha256(f"ffmpeg:{sample_rate}:1:".encode())
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as proc:
+            while proc.stdout and (chunk := proc.stdout.read(HASH_BLOCK_BYTES)):
+                digest.update(chunk)
+        if proc.returncode != 0:
+            return None
+        return digest.hexdigest()
+    except Exception as e:
+        logger.debug(f"Could not hash {path}: {str(e)}")
+        return None
+
+
+class ResultCache:
+    """Stores transcription segments keyed by audio content and decoding parameters
+
+    Entries are JSON files named after the key. Reading an entry refreshes its
+    modification time, and the least recently used entries are deleted once
+    the directory grows beyond max_mb.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_mb: int = DEFAULT_MAX_CACHE_MB) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_mb * 1024 * 1024
+
+    @staticmethod
+    def make_key(audio_hash: str, params: dict[str, Any]) -> str:
+        """Combine the audio hash with the transcription parameters"""
+        payload = json.dumps({"audio": audio_hash, "params": params}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def key_for(self, path: str, params: dict[str, Any]) -> str | None:
+        """Cache key for an audio file, or None if it cannot be hashed"""
+        audio_hash = hash_audio(path)
+        return self.make_key(audio_hash, params) if audio_hash else None
+
+    def get(self, key: str) -> list[TranscriptSegment] | None:
+        """Return cached segments, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {str(e)}")
+            return None
+
+        return [TranscriptSegment(**segment) for segment in data["segments"]]
+
+    def put(self, key: str, segments: list[TranscriptSegment]) -> None:
+        """Store segments and evict old entries if the cache is over its size limit"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Each writer gets its own temporary file, so concurrent puts of the same key never share one
+        fd, partial = tempfile.mkstemp(dir=os.path.dirname(path), prefix=key, suffix=".part")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"segments": [asdict(segment) for segment in segments]}, f)
+            os.replace(partial, path)
+        except BaseException:
+            os.remove(partial)
+            raise
+
+        self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits; returns how many were removed
+
+        Other processes may evict the same entries concurrently, so entries
+        that disappear between listing, stat and removal are skipped.
+        """
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+
+        if removed:
+            logger.debug(f"Result cache: evicted {removed} entries")
+        return removed
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
@@ -0,0 +1,162 @@
+"""Multi-process transcription scheduler with CPU-thread partitioning"""
+import multiprocessing
+import subprocess
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import soundfile as sf
+
+from .lazy import lazy_import
+from .logger import logger
+from .metrics import metrics
+from .model_cache import get_model, partition_threads
+from .model_store import model_store
+from .processor import ProcessArgs, process_input
+from .transcriber import ComputeType, DeviceType, ModelSize, resolve_compute_type
+
+if TYPE_CHECKING:
+    import av
+else:
+    av = lazy_import("av")
+
+
+@dataclass
+class JobResult:
+    """Outcome of one scheduled file"""
+
+    input: str
+    output: str
+    status: str  # done or failed
+    seconds: float
+    audio_seconds: float
+    error: str = ""
+
+
+def audio_duration(path: str) -> float:
+    """Return the duration of an audio file in seconds (0.0 if unknown)"""
+    try:
+        return float(sf.info(path).duration)
+    except Exception:
+        pass
+
+    try:
+        with av.open(path) as container:
+            if container.duration:
+                return float(container.duration / av.time_base)
+    except Exception:
+        pass
+
+    try:
+        cmd = [
+            'ffprobe',
+            '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1',
+            path
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return float(result.stdout.strip())
+    except Exception:
+        return 0.0
+
+
+def _init_worker(model: str, device: str, compute_type: str, cpu_threads: int) -> None:
+    """Load the worker's own model once, before any job runs"""
+    # The parent reports each job's timing, so workers stay quiet
+    metrics.configure(events_path="", prometheus_path="")
+    get_model(model, device, compute_type, cpu_threads)
+
+
+def _run_job(args: ProcessArgs) -> tuple[float, str]:
+    """Run process_input in a worker and return (seconds, error)"""
+    start = time.perf_counter()
+    try:
+        process_input(args)
+        return time.perf_counter() - start, ""
+    except Exception as e:
+        return time.perf_counter() - start, str(e)
+
+
+class TranscriptionScheduler:
+    """Runs process_input over many files in a pool of worker processes
+
+    Each worker owns a model loaded with its share of the CPU threads, and
+    files are submitted longest first so a long file started late does not
+    leave the other workers idle at the end of the run.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        model: ModelSize = "large-v3",
+        device: DeviceType = "cpu",
+        compute_type: ComputeType = "int8",
+        cpu_threads: int = 0,
+    ) -> None:
+        """
+        Args:
+            workers: Number of worker processes
+            model: Model size loaded by every worker
+            device: Processing device (cpu or cuda)
+            compute_type: Quantization type
+            cpu_threads: Total CPU threads to split between workers (0 = all cores)
+        """
+        self.workers = max(1, workers)
+        self.model = model
+        self.device = device
+        self.compute_type = resolve_compute_type(device, compute_type)
+        self.threads_per_worker = partition_threads(self.workers, cpu_threads or None)
+
+    def run(self, jobs: list[ProcessArgs]) -> list[JobResult]:
+        """Transcribe all jobs and return their results in input order
+
+        Each job's cpu_threads is replaced by the worker's share so it reuses
+        the model loaded by the worker initializer.
+        """
+        if not jobs:
+            return []
+
+        durations = [audio_duration(job.input) for job in jobs]
+        order = sorted(range(len(jobs)), key=lambda i: durations[i], reverse=True)
+        for job in jobs:
+            job.cpu_threads = self.threads_per_worker
+
+        logger.info(
+            f"Scheduling {len(jobs)} files on {self.workers} workers "
+            f"({self.threads_per_worker} CPU threads each, {sum(durations):.0f}s of audio)"
+        )
+
+        # Every worker loads the model from disk; read a stored model once up front
+        model_store.warm(self.model)
+
+        results: list[JobResult | None] = [None] * len(jobs)
+        start = time.perf_counter()
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.model, self.device, self.compute_type, self.threads_per_worker),
+        ) as pool:
+            futures: dict[Future[tuple[float, str]], int] = {pool.submit(_run_job, jobs[i]): i for i in order}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    seconds, error = future.result()
+                except Exception as e:
+                    seconds, error = 0.0, str(e)
+                status = "failed" if error else "done"
+                results[i] = JobResult(jobs[i].input, jobs[i].output, status, seconds, durations[i], error)
+                if error:
+                    logger.error(f"Failed to process {jobs[i].input}: {error}")
+                else:
+                    logger.info(f"Done {jobs[i].input} in {seconds:.1f}s")
+
+        elapsed = time.perf_counter() - start
+        audio_total = sum(r.audio_seconds for r in results if r is not None and r.status == "done")
+        rtf = elapsed / audio_total if audio_total > 0 else 0.0
+        logger.info(f"Scheduler finished in {elapsed:.1f}s, aggregate real-time factor {rtf:.3f}")
+
+        return [r for r in results if r is not None]
@@ -0,0 +1,558 @@
+"""Local HTTP transcription service: warm model pool, bounded job queue, dynamic batching
+
+Endpoints (JSON responses):
+    POST /jobs                 Upload audio in the request body (?filename=clip.mp3&format=srt),
+                               or submit a local file with {"path": ..., "format": ...};
+                               profile, language (and "options" in JSON) pick decoding settings
+    GET  /jobs/<id>            Job status, with the transcription once done
+    GET  /jobs/<id>/result     Transcription rendered as txt, jsonl, srt or vtt (?format=)
+    GET  /health               Queue depth, running jobs and model settings
+    GET  /metrics              Stage timings and totals in Prometheus text format
+"""
+import asyncio
+import bisect
+import io
+import json
+import os
+import tempfile
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from .audio_converter import SAMPLE_RATE, decode_audio
+from .lazy import lazy_import
+from .logger import logger
+from .metrics import metrics
+from .model_cache import get_model, partition_threads
+from .profiles import apply_overrides, decoding_options
+from .transcriber import (
+    TRANSCRIBE_OPTIONS,
+    ComputeType,
+    DeviceType,
+    ModelSize,
+    TranscriptSegment,
+    join_segments,
+    resolve_compute_type,
+)
+from .transcript_index import index_transcript
+from .writers import FORMATS, get_writer
+
+if TYPE_CHECKING:
+    import faster_whisper
+else:
+    faster_whisper = lazy_import("faster_whisper")
+
+
+def batch_options(options: dict[str, Any]) -> dict[str, Any]:
+    """Options understood by BatchedInferencePipeline when explicit clip boundaries are given"""
+    return {k: v for k, v in options.items() if k not in ("vad_filter", "vad_parameters")}
+
+
+BATCH_OPTIONS = batch_options(TRANSCRIBE_OPTIONS)
+
+STATUS_TEXT = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    404: "Not Found",
+    409: "Conflict",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity"""
+
+
+@dataclass
+class Job:
+    """A transcription request and its outcome"""
+
+    id: str
+    name: str
+    output_format: str = "txt"
+    source: str = ""  # key in the transcript index
+    status: str = "queued"  # queued, running, done or failed
+    duration: float = 0.0
+    created: float = field(default_factory=time.time)
+    started: float = 0.0
+    finished: float = 0.0
+    segments: list[TranscriptSegment] = field(default_factory=list)
+    error: str = ""
+    audio: np.ndarray | None = field(default=None, repr=False)
+    options: dict[str, Any] = field(default_factory=lambda: dict(TRANSCRIBE_OPTIONS), repr=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Status document returned by the API"""
+        info: dict[str, Any] = {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "format": self.output_format,
+            "duration": round(self.duration, 3),
+        }
+        if self.status == "done":
+            info["text"] = join_segments(self.segments)
+            info["seconds"] = round(self.finished - self.started, 3)
+        if self.error:
+            info["error"] = self.error
+        return info
+
+    def render(self, output_format: str | None = None) -> str:
+        """Transcription in one of the writer formats"""
+        stream = io.StringIO()
+        writer = get_writer(output_format or self.output_format, stream)
+        for segment in self.segments:
+            writer.write(segment)
+        writer.close()
+        return stream.getvalue()
+
+
+def split_batch_segments(
+    segments: list[TranscriptSegment], durations: list[float]
+) -> list[list[TranscriptSegment]]:
+    """Assign segments decoded from concatenated clips back to their clips
+
+    Clips are laid end to end, so a segment belongs to the clip whose span
+    contains its start; timestamps are shifted back to be clip-relative.
+    """
+    offsets = [0.0]
+    for duration in durations:
+        offsets.append(offsets[-1] + duration)
+
+    results: list[list[TranscriptSegment]] = [[] for _ in durations]
+    for segment in segments:
+        index = min(max(bisect.bisect_right(offsets, segment.start + 1e-3) - 1, 0), len(durations) - 1)
+        offset = offsets[index]
+        results[index].append(
+            TranscriptSegment(
+                start=max(segment.start - offset, 0.0),
+                end=min(segment.end - offset, durations[index]),
+                text=segment.text,
+                avg_logprob=segment.avg_logprob,
+                no_speech_prob=segment.no_speech_prob,
+                compression_ratio=segment.compression_ratio,
+            )
+        )
+    return results
+
+
+def transcribe_batch(
+    pipeline: "faster_whisper.BatchedInferencePipeline", audios: list[np.ndarray], options: dict[str, Any] | None = None
+) -> list[list[TranscriptSegment]]:
+    """Transcribe several short clips (up to 30s each) in one batched forward pass"""
+    durations = [len(audio) / SAMPLE_RATE for audio in audios]
+    offsets = np.cumsum([0.0] + durations)
+    clips = [{"start": float(offsets[i]), "end": float(offsets[i + 1])} for i in range(len(audios))]
+
+    segments, _ = pipeline.transcribe(
+        np.concatenate(audios), clip_timestamps=clips, batch_size=len(audios),
+        **(batch_options(options) if options else BATCH_OPTIONS),
+    )
+    return split_batch_segments([TranscriptSegment.from_whisper(s) for s in segments], durations)
+
+
+class TranscriptionService:
+    """Keeps one warm model and feeds it from a bounded queue
+
+    The model is loaded once with `workers` CTranslate2 replicas, so up to
+    `workers` jobs decode at the same time. Clips no longer than short_clip_s
+    that arrive within batch_window seconds of each other are grouped and
+    decoded as one batch, provided they share decoding options and a fixed
+    language (a batch detects its language once, so auto-detected clips are
+    decoded on their own). When the queue is full new jobs are refused, which
+    the HTTP layer reports as 503 so clients back off.
+    """
+
+    def __init__(
+        self,
+        model: ModelSize = "large-v3",
+        device: DeviceType = "cpu",
+        compute_type: ComputeType = "int8",
+        workers: int = 2,
+        cpu_threads: int = 0,
+        max_queue: int = 32,
+        batch_size: int = 8,
+        batch_window: float = 0.05,
+        short_clip_s: float = 30.0,
+        max_jobs_kept: int = 1000,
+        options: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Args:
+            model: Model size kept warm by the service
+            device: Processing device (cpu or cuda)
+            compute_type: Quantization type
+            workers: Jobs (or batches) decoded concurrently
+            cpu_threads: Total CPU threads to split between workers (0 = all cores)
+            max_queue: Jobs waiting before new submissions are refused
+            batch_size: Most short clips decoded in one batch (1 disables batching)
+            batch_window: Seconds to wait for more short clips to join a batch
+            short_clip_s: Clips up to this length are eligible for batching
+            max_jobs_kept: Finished jobs remembered for polling
+            options: Default WhisperModel.transcribe options (default: TRANSCRIBE_OPTIONS)
+        """
+        self.model = model
+        self.device = device
+        self.compute_type = resolve_compute_type(device, compute_type)
+        self.workers = max(1, workers)
+        self.cpu_threads = partition_threads(self.workers, cpu_threads or None)
+        self.max_queue = max_queue
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window
+        self.short_clip_s = short_clip_s
+        self.max_jobs_kept = max_jobs_kept
+        self.options = options or TRANSCRIBE_OPTIONS
+
+        self.jobs: OrderedDict[str, Job] = OrderedDict()
+        self.running = 0
+        self._queue: asyncio.Queue[Job] | None = None
+        self._held: deque[Job] = deque()  # taken off the queue while gathering a batch they could not join
+        self._slots: asyncio.Semaphore | None = None
+        self._dispatcher: asyncio.Task[None] | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="transcribe")
+        self._decoder = ThreadPoolExecutor(max_workers=2, thread_name_prefix="decode")
+        self._pipeline: faster_whisper.BatchedInferencePipeline | None = None
+
+    @property
+    def queued(self) -> int:
+        return (self._queue.qsize() if self._queue else 0) + len(self._held)
+
+    async def start(self) -> None:
+        """Load the model and start dispatching jobs"""
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._slots = asyncio.Semaphore(self.workers)
+
+        whisper = await loop.run_in_executor(
+            self._executor, get_model, self.model, self.device, self.compute_type, self.cpu_threads, self.workers
+        )
+        self._pipeline = faster_whisper.BatchedInferencePipeline(model=whisper)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        logger.info(f"Model {self.model} ready ({self.workers} workers, {self.cpu_threads} CPU threads each)")
+
+    async def stop(self) -> None:
+        """Stop dispatching and wait for running jobs"""
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=True)
+        self._decoder.shutdown(wait=True)
+
+    async def submit_file(
+        self,
+        path: str,
+        name: str | None = None,
+        output_format: str = "txt",
+        options: dict[str, Any] | None = None,
+    ) -> Job:
+        """Decode a file and queue it for transcription (options default to the service's)
+
+        Raises:
+            QueueFullError: The queue is at capacity
+            ValueError: Unknown format or undecodable audio
+        """
+        if self._queue is None:
+            raise RuntimeError("Service not started")
+        if output_format not in FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        # Refuse before paying for the decode
+        if self._queue.full():
+            raise QueueFullError("Transcription queue is full")
+
+        audio = await asyncio.get_running_loop().run_in_executor(self._decoder, decode_audio, path, SAMPLE_RATE)
+        if audio is None:
+            raise ValueError(f"Could not decode audio: {name or path}")
+
+        job = Job(uuid.uuid4().hex, name or os.path.basename(path), output_format,
+                  duration=len(audio) / SAMPLE_RATE, audio=audio, options=options or self.options)
+        job.source = os.path.abspath(path) if name is None else f"upload/{job.id}/{job.name}"
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError("Transcription queue is full") from None
+
+        self.jobs[job.id] = job
+        self._forget_old_jobs()
+        logger.info(f"Queued job {job.id} ({job.name}, {job.duration:.1f}s), {self.queued} waiting")
+        return job
+
+    async def submit_bytes(
+        self, data: bytes, name: str, output_format: str = "txt", options: dict[str, Any] | None = None
+    ) -> Job:
+        """Queue uploaded audio; the upload is spooled to a temporary file for decoding"""
+        suffix = os.path.splitext(name)[1] or ".audio"
+        fd, path = tempfile.mkstemp(suffix=suffix, prefix="speech2text_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            return await self.submit_file(path, name, output_format, options)
+        finally:
+            os.remove(path)
+
+    async def _dispatch(self) -> None:
+        """Take jobs from the queue, group short clips and start them as slots free up"""
+        assert self._queue is not None and self._slots is not None
+        loop = asyncio.get_running_loop()
+        while True:
+            job = self._held.popleft() if self._held else await self._queue.get()
+            batch = [job]
+            if self._batchable(job):
+                deadline = loop.time() + self.batch_window
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        following = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    if self._batchable(following) and following.options == job.options:
+                        batch.append(following)
+                    else:
+                        self._held.append(following)
+
+            await self._launch(batch)
+
+    def _batchable(self, job: Job) -> bool:
+        """Whether a job may share a batch: a short clip with a fixed language"""
+        return self.batch_size > 1 and job.duration <= self.short_clip_s and bool(job.options.get("language"))
+
+    async def _launch(self, batch: list[Job]) -> None:
+        """Wait for a free worker, then run the batch in the background"""
+        assert self._slots is not None
+        await self._slots.acquire()
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[Job]) -> None:
+        assert self._slots is not None
+        self.running += len(batch)
+        started = time.time()
+        for job in batch:
+            job.status, job.started = "running", started
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self._executor, self._transcribe, batch)
+            for job, segments in zip(batch, results, strict=True):
+                job.segments, job.status = segments, "done"
+            await asyncio.get_running_loop().run_in_executor(self._decoder, self._index, batch)
+        except Exception as e:
+            logger.error(f"Failed to transcribe {', '.join(job.name for job in batch)}: {str(e)}")
+            for job in batch:
+                job.status, job.error = "failed", str(e)
+        finally:
+            finished = time.time()
+            for job in batch:
+                job.finished, job.audio = finished, None
+            self.running -= len(batch)
+            self._slots.release()
+
+        audio_seconds = sum(job.duration for job in batch)
+        metrics.observe(
+            "transcribe",
+            finished - started,
+            ok=all(job.status == "done" for job in batch),
+            audio_seconds=audio_seconds,
+            segments=sum(len(job.segments) for job in batch),
+            jobs=len(batch),
+        )
+        rtf = (finished - started) / audio_seconds if audio_seconds else 0.0
+        logger.info(f"Transcribed {len(batch)} job(s), {audio_seconds:.1f}s of audio (real-time factor {rtf:.3f})")
+
+    def _transcribe(self, batch: list[Job]) -> list[list[TranscriptSegment]]:
+        """Decode one job on its own, or several short clips as one batch (worker thread)"""
+        assert self._pipeline is not None
+        audios = [job.audio for job in batch if job.audio is not None]
+        if len(audios) > 1:
+            return transcribe_batch(self._pipeline, audios, batch[0].options)
+
+        segments, _ = self._pipeline.model.transcribe(audios[0], **batch[0].options)
+        return [[TranscriptSegment.from_whisper(segment) for segment in segments]]
+
+    def _index(self, batch: list[Job]) -> None:
+        """Add finished jobs to the transcript index (decode thread)"""
+        for job in batch:
+            index_transcript(job.source, job.segments, job.name, params={"model": self.model, **job.options})
+
+    def _forget_old_jobs(self) -> None:
+        """Drop the oldest finished jobs beyond max_jobs_kept"""
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in ("done", "failed")]
+        for job_id in finished[:max(0, len(self.jobs) - self.max_jobs_kept)]:
+            del self.jobs[job_id]
+
+    def health(self) -> dict[str, Any]:
+        return {
+            "status": "ok" if self._pipeline is not None else "starting",
+            "model": self.model,
+            "device": self.device,
+            "compute_type": self.compute_type,
+            "workers": self.workers,
+            "queued": self.queued,
+            "running": self.running,
+            "max_queue": self.max_queue,
+        }
+
+
+class TranscriptionServer:
+    """Minimal HTTP/1.1 front end for a TranscriptionService (one request per connection)"""
+
+    def __init__(self, service: TranscriptionService, max_upload_mb: int = 512) -> None:
+        self.service = service
+        self.max_upload_bytes = max_upload_mb * 1024 * 1024
+        self._server: asyncio.Server | None = None
+
+    @property
+    def port(self) -> int:
+        """Bound port (useful when started on port 0)"""
+        assert self._server is not None
+        return int(self._server.sockets[0].getsockname()[1])
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        await self.service.start()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        logger.success(f"Listening on http://{host}:{self.port}")
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.service.stop()
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        await self.start(host, port)
+        assert self._server is not None
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            if not request_line:
+                return
+            method, target, _ = request_line.split(" ", 2)
+
+            headers: dict[str, str] = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", "0"))
+            if length > self.max_upload_bytes:
+                await self._respond(writer, 413, {"error": "Upload too large"})
+                return
+            body = await reader.readexactly(length) if length else b""
+
+            status, payload, extra = await self._route(method, target, headers, body)
+            await self._respond(writer, status, payload, extra)
+        except Exception as e:
+            logger.error(f"Bad request: {str(e)}")
+            await self._respond(writer, 400, {"error": str(e)})
+        finally:
+            writer.close()
+
+    async def _route(
+        self, method: str, target: str, headers: dict[str, str], body: bytes
+    ) -> tuple[int, Any, dict[str, str]]:
+        """Dispatch a request; returns (status, JSON payload or text, extra headers)"""
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        parts = [p for p in url.path.split("/") if p]
+
+        if method == "GET" and parts == ["health"]:
+            return 200, self.service.health(), {}
+
+        if method == "GET" and parts == ["metrics"]:
+            return 200, metrics.render_prometheus(), {}
+
+        if method == "POST" and parts == ["jobs"]:
+            try:
+                if headers.get("content-type", "").startswith("application/json"):
+                    request = json.loads(body or b"{}")
+                    path = request.get("path")
+                    if not path or not os.path.isfile(path):
+                        return 400, {"error": f"File not found: {path}"}, {}
+                    options = self._options(request, request.get("options"))
+                    job = await self.service.submit_file(
+                        path, output_format=request.get("format", "txt"), options=options
+                    )
+                else:
+                    if not body:
+                        return 400, {"error": "Empty upload"}, {}
+                    job = await self.service.submit_bytes(
+                        body, query.get("filename", "upload"), query.get("format", "txt"), self._options(query)
+                    )
+            except QueueFullError as e:
+                return 503, {"error": str(e)}, {"Retry-After": "5"}
+            except ValueError as e:
+                return 400, {"error": str(e)}, {}
+            return 202, job.to_dict(), {"Location": f"/jobs/{job.id}"}
+
+        if method == "GET" and len(parts) in (2, 3) and parts[0] == "jobs":
+            requested = self.service.jobs.get(parts[1])
+            if requested is None:
+                return 404, {"error": "Unknown job"}, {}
+            if len(parts) == 2:
+                return 200, requested.to_dict(), {}
+            if parts[2] == "result":
+                if requested.status != "done":
+                    return 409, requested.to_dict(), {}
+                output_format = query.get("format", requested.output_format)
+                if output_format not in FORMATS:
+                    return 400, {"error": f"Unsupported output format: {output_format}"}, {}
+                return 200, requested.render(output_format), {}
+
+        return 404, {"error": "Not found"}, {}
+
+    def _options(self, params: dict[str, Any], overrides: dict[str, Any] | None = None) -> dict[str, Any] | None:
+        """Per-job decoding options from profile/language parameters (None = service defaults)
+
+        A job naming a profile starts from that profile; otherwise its language
+        and overrides are layered on the service's own options, so the
+        service's --profile and --decode-option settings still apply. The
+        profile only selects decoding options; the model is the one the
+        service keeps loaded.
+        """
+        if not overrides and "profile" not in params and "language" not in params:
+            return None
+        language = params.get("language", self.service.options.get("language") or "auto")
+        if "profile" in params:
+            return decoding_options(params["profile"], language, overrides)
+        options = {**self.service.options, "language": None if language in ("", "auto") else language}
+        return apply_overrides(options, overrides)
+
+    async def _respond(
+        self, writer: asyncio.StreamWriter, status: int, payload: Any, extra: dict[str, str] | None = None
+    ) -> None:
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), "text/plain; charset=utf-8"
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json"
+
+        head = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+        ]
+        head += [f"{name}: {value}" for name, value in (extra or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
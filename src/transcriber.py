@@ -1,55 +1,150 @@
-from typing import Literal
+from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
+from typing import Any, Literal
+
+import numpy as np
 
-from faster_whisper import WhisperModel
 from .logger import logger
+from .metrics import metrics
+from .model_cache import get_model, model_cache
 
 ModelSize = Literal["tiny", "base", "small", "medium", "large-v3"]
 DeviceType = Literal["cpu", "cuda"]
 ComputeType = Literal["int8", "int8_float16", "float16", "float32"]
 
+# Decoding options passed to WhisperModel.transcribe
+TRANSCRIBE_OPTIONS: dict[str, Any] = {
+    "language": "pt",
+    "beam_size": 5,
+    "best_of": 5,
+    "temperature": 0.0,
+    "compression_ratio_threshold": 2.4,
+    "no_speech_threshold": 0.6,
+    "vad_filter": True,
+    "vad_parameters": {"min_silence_duration_ms": 500},
+}
 
-def transcribe_audio(
-    audio_path: str,
+
+@dataclass
+class TranscriptSegment:
+    """A transcribed segment with its timing (seconds) and decoder scores"""
+
+    start: float
+    end: float
+    text: str
+    avg_logprob: float = 0.0
+    no_speech_prob: float = 0.0
+    compression_ratio: float = 0.0
+
+    @classmethod
+    def from_whisper(cls, segment: Any) -> "TranscriptSegment":
+        """Build from a faster-whisper Segment"""
+        return cls(
+            start=segment.start,
+            end=segment.end,
+            text=segment.text,
+            avg_logprob=segment.avg_logprob,
+            no_speech_prob=segment.no_speech_prob,
+            compression_ratio=segment.compression_ratio,
+        )
+
+
+def resolve_compute_type(device: DeviceType, compute_type: ComputeType) -> ComputeType:
+    """Downgrade compute types that are not a good fit for the device"""
+    if device == "cpu" and compute_type == "float16":
+        logger.warning("float16 not optimal for CPU. Using int8.")
+        return "int8"
+    return compute_type
+
+
+def iter_segments(
+    audio: str | np.ndarray,
     model: ModelSize = "large-v3",
     device: DeviceType = "cpu",
     compute_type: ComputeType = "int8",
-) -> str:
-    """Transcribe audio to text in Portuguese using faster-whisper
+    cpu_threads: int = 0,
+    options: dict[str, Any] | None = None,
+    num_workers: int = 1,
+) -> Iterator[TranscriptSegment]:
+    """Transcribe audio (Portuguese by default), yielding segments as soon as they are decoded
 
     Args:
-        audio_path: Audio file path
+        audio: Audio file path, or 16kHz mono float32 samples already decoded
         model: Model size (tiny, base, small, medium, large-v3)
         device: Processing device (cpu or cuda)
         compute_type: Quantization type (int8, int8_float16, float16, float32)
+        cpu_threads: Number of CPU threads (0 = CTranslate2 default)
+        options: WhisperModel.transcribe options (default: TRANSCRIBE_OPTIONS, see src.profiles)
+        num_workers: CTranslate2 replicas of the model, when several threads transcribe at once
     """
     try:
         # Adjust compute_type based on device
-        if device == "cpu" and compute_type == "float16":
-            logger.warning("float16 not optimal for CPU. Using int8.")
-            compute_type = "int8"
-
-        logger.info(f"Loading model {model} ({device.upper()}, {compute_type})...")
-        model = WhisperModel(model, device=device, compute_type=compute_type)
-
-        logger.info("Starting transcription in Portuguese...")
-        segments, info = model.transcribe(
-            audio_path,
-            language="pt",
-            beam_size=5,
-            best_of=5,
-            temperature=0.0,
-            compression_ratio_threshold=2.4,
-            no_speech_threshold=0.6,
-            vad_filter=True,
-            vad_parameters=dict(min_silence_duration_ms=500)
-        )
+        compute_type = resolve_compute_type(device, compute_type)
+
+        whisper = get_model(model, device, compute_type, cpu_threads, num_workers)
+        stats = model_cache.stats
+        logger.debug(f"Model cache: {stats.hits} hits, {stats.misses} misses, {stats.load_time:.2f}s loading")
 
-        # Combine all segments into full text
-        transcription = " ".join([segment.text for segment in segments])
+        options = options or TRANSCRIBE_OPTIONS
+        if options.get("language"):
+            logger.info(f"Starting transcription ({options['language']})...")
+        else:
+            logger.info("Starting transcription (detecting language)...")
+        segments, info = whisper.transcribe(audio, **options)
 
-        logger.info(f"Detected language: {info.language} (confidence: {info.language_probability:.2%})")
+        if not options.get("language"):
+            logger.info(f"Detected language: {info.language} (confidence: {info.language_probability:.2%})")
 
-        return transcription.strip()
+        for segment in segments:
+            yield TranscriptSegment.from_whisper(segment)
     except Exception as e:
         logger.error(f"Transcription error: {str(e)}")
-        raise RuntimeError(f"Transcription error: {str(e)}")
\ No newline at end of file
+        raise RuntimeError(f"Transcription error: {str(e)}") from e
+
+
+def transcribe_segments(
+    audio: str | np.ndarray,
+    model: ModelSize = "large-v3",
+    device: DeviceType = "cpu",
+    compute_type: ComputeType = "int8",
+    cpu_threads: int = 0,
+    options: dict[str, Any] | None = None,
+) -> list[TranscriptSegment]:
+    """Transcribe audio using faster-whisper, keeping segment timings
+
+    Args:
+        audio: Audio file path, or 16kHz mono float32 samples already decoded
+        model: Model size (tiny, base, small, medium, large-v3)
+        device: Processing device (cpu or cuda)
+        compute_type: Quantization type (int8, int8_float16, float16, float32)
+        cpu_threads: Number of CPU threads (0 = CTranslate2 default)
+        options: WhisperModel.transcribe options (default: TRANSCRIBE_OPTIONS)
+    """
+    return list(iter_segments(audio, model, device, compute_type, cpu_threads, options))
+
+
+def join_segments(segments: Iterable[TranscriptSegment]) -> str:
+    """Combine segments into the full transcription text"""
+    return " ".join([segment.text.strip() for segment in segments]).strip()
+
+
+@metrics.timed("transcribe")
+def transcribe_audio(
+    audio: str | np.ndarray,
+    model: ModelSize = "large-v3",
+    device: DeviceType = "cpu",
+    compute_type: ComputeType = "int8",
+    cpu_threads: int = 0,
+    options: dict[str, Any] | None = None,
+) -> str:
+    """Transcribe audio to text using faster-whisper
+
+    Args:
+        audio: Audio file path, or 16kHz mono float32 samples already decoded
+        model: Model size (tiny, base, small, medium, large-v3)
+        device: Processing device (cpu or cuda)
+        compute_type: Quantization type (int8, int8_float16, float16, float32)
+        cpu_threads: Number of CPU threads (0 = CTranslate2 default)
+        options: WhisperModel.transcribe options (default: TRANSCRIBE_OPTIONS)
+    """
+    return join_segments(transcribe_segments(audio, model, device, compute_type, cpu_threads, options))
@@ -0,0 +1,311 @@
+"""Searchable SQLite FTS5 index of every transcript and its segment timestamps"""
+import json
+import os
+import re
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from .logger import logger
+from .transcriber import TranscriptSegment
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".cache", "speech2text", "transcripts.db")
+DISABLED_VALUES = ("", "0", "off", "none")
+
+TIMESTAMP_PATTERN = re.compile(r"((?:\d+:)?\d{1,2}:\d{2}[.,]\d{3}) --> ((?:\d+:)?\d{1,2}:\d{2}[.,]\d{3})")
+
+
+def default_index_path() -> str | None:
+    """Index shared by all entry points: SPEECH2TEXT_INDEX, or None when set to off"""
+    path = os.environ.get("SPEECH2TEXT_INDEX", DEFAULT_INDEX_PATH)
+    return None if path.strip().lower() in DISABLED_VALUES else path
+
+
+def fts_query(text: str) -> str:
+    """Quote each word, so user input matches as plain terms rather than FTS5 syntax"""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+@dataclass
+class SearchHit:
+    """A matching segment, with its position in the recording in milliseconds"""
+
+    source: str
+    name: str
+    start_ms: int
+    end_ms: int
+    text: str
+    snippet: str = ""
+    model: str = ""
+    output: str = ""
+
+
+@dataclass
+class IndexedTranscript:
+    """A transcript in the index"""
+
+    id: int
+    source: str
+    name: str
+    output: str
+    model: str
+    params: dict[str, Any]
+    created: float
+    segments: int
+    duration_ms: int
+
+
+class TranscriptIndex:
+    """Transcripts and their segments in SQLite, with an FTS5 full-text index
+
+    One transcript is kept per source (the audio path, or another identifier
+    for audio without one); indexing a source again replaces its segments.
+    Segment text goes through an external-content FTS5 table kept in step by
+    triggers, so the text is stored once. Timestamps are integer
+    milliseconds, indexed per transcript for time-range lookups.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA mmap_size=268435456")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS transcripts (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL UNIQUE,
+                name TEXT NOT NULL,
+                output TEXT NOT NULL DEFAULT '',
+                model TEXT NOT NULL DEFAULT '',
+                params TEXT NOT NULL DEFAULT '{}',
+                created REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS segments (
+                id INTEGER PRIMARY KEY,
+                transcript_id INTEGER NOT NULL REFERENCES transcripts (id),
+                start_ms INTEGER NOT NULL,
+                end_ms INTEGER NOT NULL,
+                text TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS segments_time ON segments (transcript_id, start_ms);
+            CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5 (
+                text, content='segments', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+            );
+            CREATE TRIGGER IF NOT EXISTS segments_insert AFTER INSERT ON segments BEGIN
+                INSERT INTO segments_fts (rowid, text) VALUES (new.id, new.text);
+            END;
+            CREATE TRIGGER IF NOT EXISTS segments_delete AFTER DELETE ON segments BEGIN
+                INSERT INTO segments_fts (segments_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            END;
+            """
+        )
+
+    def close(self) -> None:
+        self._db.close()
+
+    def begin(
+        self,
+        source: str,
+        name: str | None = None,
+        output: str = "",
+        params: dict[str, Any] | None = None,
+    ) -> int:
+        """Start (or restart) the transcript of source and return its id for append()"""
+        params = params or {}
+        with self._transaction():
+            existing = self._db.execute("SELECT id FROM transcripts WHERE source = ?", (source,)).fetchone()
+            if existing:
+                self._db.execute("DELETE FROM segments WHERE transcript_id = ?", existing)
+                self._db.execute("DELETE FROM transcripts WHERE id = ?", existing)
+            cursor = self._db.execute(
+                "INSERT INTO transcripts (source, name, output, model, params, created) VALUES (?, ?, ?, ?, ?, ?)",
+                (source, name or os.path.basename(source), output, str(params.get("model", "")),
+                 json.dumps(params, sort_keys=True, default=str), time.time()),
+            )
+        return cursor.lastrowid or 0
+
+    def append(self, transcript_id: int, segments: Iterable[TranscriptSegment]) -> int:
+        """Add segments to a transcript in one transaction; returns how many were added"""
+        rows = [
+            (transcript_id, round(segment.start * 1000), round(segment.end * 1000), segment.text.strip())
+            for segment in segments
+            if segment.text.strip()
+        ]
+        with self._transaction():
+            self._db.executemany(
+                "INSERT INTO segments (transcript_id, start_ms, end_ms, text) VALUES (?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def add(
+        self,
+        source: str,
+        segments: Iterable[TranscriptSegment],
+        name: str | None = None,
+        output: str = "",
+        params: dict[str, Any] | None = None,
+    ) -> int:
+        """Index a finished transcript, replacing any earlier one of the same source"""
+        transcript_id = self.begin(source, name, output, params)
+        self.append(transcript_id, segments)
+        return transcript_id
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        source: str | None = None,
+        model: str | None = None,
+        raw: bool = False,
+    ) -> list[SearchHit]:
+        """Best matching segments for query, most relevant first
+
+        Args:
+            query: Words that must all occur in a segment (FTS5 syntax if raw)
+            limit: Most hits returned
+            source: Glob the source must match, e.g. /archive/2024-*
+            model: Only transcripts made with this model
+            raw: Pass query to FTS5 unchanged (phrases, OR, NEAR, prefix*)
+        """
+        match = query if raw else fts_query(query)
+        if not match:
+            return []
+        sql = (
+            "SELECT t.source, t.name, s.start_ms, s.end_ms, s.text,"
+            " snippet(segments_fts, 0, '[', ']', '...', 16), t.model, t.output"
+            " FROM segments_fts JOIN segments s ON s.id = segments_fts.rowid"
+            " JOIN transcripts t ON t.id = s.transcript_id WHERE segments_fts MATCH ?"
+        )
+        values: list[Any] = [match]
+        if source:
+            sql += " AND t.source GLOB ?"
+            values.append(source)
+        if model:
+            sql += " AND t.model = ?"
+            values.append(model)
+        sql += " ORDER BY rank LIMIT ?"
+        values.append(limit)
+        return [SearchHit(*row) for row in self._db.execute(sql, values)]
+
+    def at(self, source: str, start_ms: int, end_ms: int | None = None) -> list[SearchHit]:
+        """Segments of a source overlapping [start_ms, end_ms] (the instant start_ms if no end)"""
+        end_ms = start_ms if end_ms is None else end_ms
+        rows = self._db.execute(
+            "SELECT t.source, t.name, s.start_ms, s.end_ms, s.text, s.text, t.model, t.output"
+            " FROM segments s JOIN transcripts t ON t.id = s.transcript_id"
+            " WHERE t.source = ? AND s.start_ms <= ? AND s.end_ms >= ? ORDER BY s.start_ms",
+            (source, end_ms, start_ms),
+        )
+        return [SearchHit(*row) for row in rows]
+
+    def transcripts(self, source: str | None = None) -> list[IndexedTranscript]:
+        """Indexed transcripts, optionally those whose source matches a glob"""
+        sql = (
+            "SELECT t.id, t.source, t.name, t.output, t.model, t.params, t.created,"
+            " COUNT(s.id), COALESCE(MAX(s.end_ms), 0)"
+            " FROM transcripts t LEFT JOIN segments s ON s.transcript_id = t.id"
+        )
+        values: list[Any] = []
+        if source:
+            sql += " WHERE t.source GLOB ?"
+            values.append(source)
+        sql += " GROUP BY t.id ORDER BY t.created"
+        return [
+            IndexedTranscript(row[0], row[1], row[2], row[3], row[4], json.loads(row[5]), *row[6:])
+            for row in self._db.execute(sql, values)
+        ]
+
+    def remove(self, source: str) -> bool:
+        with self._transaction():
+            existing = self._db.execute("SELECT id FROM transcripts WHERE source = ?", (source,)).fetchone()
+            if existing:
+                self._db.execute("DELETE FROM segments WHERE transcript_id = ?", existing)
+                self._db.execute("DELETE FROM transcripts WHERE id = ?", existing)
+        return existing is not None
+
+    def optimize(self) -> None:
+        """Merge the full-text index into a single b-tree (after large imports)"""
+        self._db.execute("INSERT INTO segments_fts (segments_fts) VALUES ('optimize')")
+        self._db.execute("PRAGMA optimize")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """BEGIN IMMEDIATE ... COMMIT, rolled back on error (the connection is in autocommit mode)"""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+
+def index_transcript(
+    source: str,
+    segments: Iterable[TranscriptSegment],
+    name: str | None = None,
+    output: str = "",
+    params: dict[str, Any] | None = None,
+) -> int | None:
+    """Add a transcript to the default index; failures are logged, never raised
+
+    Returns:
+        Transcript id, or None if indexing is off or failed
+    """
+    path = default_index_path()
+    if path is None:
+        return None
+    try:
+        with closing(TranscriptIndex(path)) as index:
+            return index.add(source, segments, name, output, params)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Could not index transcript of {source}: {str(e)}")
+        return None
+
+
+def parse_timestamp(text: str) -> float:
+    """Seconds from [HH:]MM:SS.mmm (a comma before the milliseconds, as in SRT, or plain seconds also work)"""
+    seconds = 0.0
+    for part in text.replace(",", ".").split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def load_transcript(path: str) -> list[TranscriptSegment]:
+    """Segments of a transcript written by any of the output writers (by extension)
+
+    JSONL, SRT and WebVTT keep their timings; a plain text file becomes a
+    single segment without them.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+
+    if extension == ".jsonl":
+        return [
+            TranscriptSegment(record["start"], record["end"], record["text"])
+            for record in map(json.loads, filter(None, content.splitlines()))
+        ]
+
+    if extension in (".srt", ".vtt"):
+        segments = []
+        for block in re.split(r"\n\s*\n", content):
+            lines = block.strip().splitlines()
+            for i, line in enumerate(lines):
+                timing = TIMESTAMP_PATTERN.search(line)
+                if timing:
+                    text = " ".join(lines[i + 1:])
+                    segments.append(
+                        TranscriptSegment(parse_timestamp(timing.group(1)), parse_timestamp(timing.group(2)), text)
+                    )
+                    break
+        return segments
+
+    text = content.strip()
+    return [TranscriptSegment(0.0, 0.0, text)] if text else []
@@ -0,0 +1,375 @@
+"""Watch-folder ingestion: detect finished recordings and transcribe them as they arrive"""
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any
+
+from .batch import AUDIO_EXTENSIONS, BatchItemArgs, output_path_for
+from .logger import logger
+from .model_cache import get_model, partition_threads
+from .processor import process_input
+from .transcriber import resolve_compute_type
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+
+def file_fingerprint(path: str, block_bytes: int = 1024 * 1024) -> str:
+    """SHA-256 of the whole file, read block_bytes at a time
+
+    Identical for copies of the same recording under other names. Every
+    byte counts: recordings of the same length whose first and last
+    seconds are silent only differ in the middle.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_bytes):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@dataclass
+class LedgerJob:
+    """A row of the job ledger"""
+
+    id: int
+    path: str
+    output: str
+    status: str  # queued, running, done, failed or duplicate
+    attempts: int = 0
+    error: str = ""
+
+
+class JobLedger:
+    """Persistent SQLite record of every file seen and what happened to it
+
+    Files are identified by path, size and mtime (so unchanged files are not
+    re-read on every scan) and deduplicated by content fingerprint. Jobs
+    left running by a crash are queued again on startup.
+    """
+
+    def __init__(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                fingerprint TEXT NOT NULL,
+                output TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                seconds REAL NOT NULL DEFAULT 0,
+                error TEXT NOT NULL DEFAULT '',
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_path ON jobs (path, size, mtime_ns);
+            CREATE INDEX IF NOT EXISTS jobs_fingerprint ON jobs (fingerprint);
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+            """
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def known(self, path: str, size: int, mtime_ns: int) -> bool:
+        """True if this exact version of the file has already been recorded"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM jobs WHERE path = ? AND size = ? AND mtime_ns = ?", (path, size, mtime_ns)
+            ).fetchone()
+        return row is not None
+
+    def add(self, path: str, size: int, mtime_ns: int, fingerprint: str, output: str) -> LedgerJob | None:
+        """Queue a new file, or record it as a duplicate of content already handled (returns None)"""
+        now = time.time()
+        with self._lock:
+            original = self._db.execute(
+                "SELECT path FROM jobs WHERE fingerprint = ? AND status IN ('queued', 'running', 'done')",
+                (fingerprint,),
+            ).fetchone()
+            status = "duplicate" if original else "queued"
+            cursor = self._db.execute(
+                "INSERT INTO jobs (path, size, mtime_ns, fingerprint, output, status, created, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, size, mtime_ns, fingerprint, output, status, now, now),
+            )
+        if original:
+            logger.info(f"Skipping {path}: same content as {original[0]}")
+            return None
+        return LedgerJob(cursor.lastrowid or 0, path, output, status)
+
+    def claim(self, limit: int) -> list[LedgerJob]:
+        """Mark up to limit queued jobs as running, oldest first, and return them"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, path, output, attempts FROM jobs WHERE status = 'queued' ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+            self._db.executemany(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated = ? WHERE id = ?",
+                [(time.time(), row[0]) for row in rows],
+            )
+        return [LedgerJob(row[0], row[1], row[2], "running", row[3] + 1) for row in rows]
+
+    def finish(self, job_id: int, status: str, seconds: float = 0.0, error: str = "") -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, seconds = ?, error = ?, updated = ? WHERE id = ?",
+                (status, seconds, error, time.time(), job_id),
+            )
+
+    def recover(self) -> int:
+        """Queue again jobs that were running when the previous daemon stopped"""
+        with self._lock:
+            cursor = self._db.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+        return cursor.rowcount
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def job(self, job_id: int) -> LedgerJob | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, path, output, status, attempts, error FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return LedgerJob(*row) if row else None
+
+
+class PollingWatcher:
+    """Change notification by timeout: every wait is followed by a full scan"""
+
+    def add(self, directory: str) -> None:
+        pass
+
+    def wait(self, timeout: float) -> bool:
+        time.sleep(timeout)
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify through libc, so new files are noticed without polling
+
+    Events are only used as a wake-up signal; the directory is scanned
+    afterwards, which keeps overflowed or coalesced events harmless.
+    """
+
+    def __init__(self) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watched: set[str] = set()
+
+    def add(self, directory: str) -> None:
+        """Watch a directory (subdirectories must be added separately)"""
+        if directory in self._watched:
+            return
+        if self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK) < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self._watched.add(directory)
+
+    def wait(self, timeout: float) -> bool:
+        """Block until something changes or timeout passes; True if there were events"""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            while os.read(self._fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def make_watcher(polling: bool = False) -> InotifyWatcher | PollingWatcher:
+    """inotify where available, polling otherwise (or when asked for, e.g. on network shares)"""
+    if not polling:
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError) as e:
+            logger.warning(f"inotify unavailable ({str(e)}), polling instead")
+    return PollingWatcher()
+
+
+class WatchFolder:
+    """Feeds files that appear in a directory through process_input
+
+    A file is picked up once its size and mtime have not changed for settle_s
+    seconds, so recordings still being copied or written are left alone.
+    New files are fingerprinted and recorded in the ledger, which also acts
+    as the queue: at most `workers` jobs run at a time on threads sharing the
+    process's warm model, and the rest wait in the ledger across restarts.
+    With several workers the model is loaded with one CTranslate2 replica per
+    worker and the CPU threads are split between them.
+    """
+
+    def __init__(
+        self,
+        input_dir: str,
+        output_dir: str,
+        template: BatchItemArgs,
+        ledger: JobLedger,
+        workers: int = 1,
+        settle_s: float = 2.0,
+        poll_interval: float = 2.0,
+        recursive: bool = False,
+        polling: bool = False,
+    ) -> None:
+        """
+        Args:
+            input_dir: Directory to watch
+            output_dir: Directory for transcriptions (subdirectories are mirrored)
+            template: Transcription settings; input and output are filled per file
+            ledger: Job ledger (queue and history)
+            workers: Jobs transcribed at the same time
+            settle_s: Seconds a file must stay unchanged before it is processed
+            poll_interval: Seconds between scans when polling (and the safety rescan with inotify)
+            recursive: Also watch subdirectories
+            polling: Scan on a timer instead of using inotify
+        """
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.ledger = ledger
+        self.workers = max(1, workers)
+        if self.workers > 1:
+            template = replace(
+                template,
+                cpu_threads=partition_threads(self.workers, template.cpu_threads or None),
+                model_workers=self.workers,
+            )
+        self.template = template
+        self.settle_s = settle_s
+        self.poll_interval = poll_interval
+        self.recursive = recursive
+        self.watcher = make_watcher(polling)
+
+        self._pending: dict[str, tuple[int, int, float]] = {}  # path -> (size, mtime_ns, unchanged since)
+        self._running: dict[Future[Any], LedgerJob] = {}
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="watch")
+
+    def prewarm(self) -> None:
+        """Load the models the workers share, with the settings their jobs look them up with"""
+        template = self.template
+        compute_type = resolve_compute_type(template.device, template.compute_type)
+        for model in filter(None, (template.model, template.draft_model)):
+            get_model(model, template.device, compute_type, template.cpu_threads, template.model_workers)
+
+    def scan(self, now: float | None = None) -> list[LedgerJob]:
+        """Scan the directory once, queueing files that have settled; returns the new jobs"""
+        now = time.monotonic() if now is None else now
+        queued: list[LedgerJob] = []
+        present: set[str] = set()
+
+        for directory, subdirs, files in os.walk(self.input_dir):
+            self.watcher.add(directory)
+            if not self.recursive:
+                subdirs.clear()
+            for name in files:
+                if not name.lower().endswith(AUDIO_EXTENSIONS):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                present.add(path)
+
+                if self.ledger.known(path, stat.st_size, stat.st_mtime_ns):
+                    self._pending.pop(path, None)
+                    continue
+                previous = self._pending.get(path)
+                if previous is None or previous[:2] != (stat.st_size, stat.st_mtime_ns):
+                    self._pending[path] = (stat.st_size, stat.st_mtime_ns, now)
+                    continue
+                if now - previous[2] < self.settle_s or stat.st_size == 0:
+                    continue
+
+                del self._pending[path]
+                output = output_path_for(path, self.output_dir, self.input_dir, self.template.format)
+                job = self.ledger.add(path, stat.st_size, stat.st_mtime_ns, file_fingerprint(path), output)
+                if job is not None:
+                    logger.info(f"Queued {path}")
+                    queued.append(job)
+
+        for path in set(self._pending) - present:
+            del self._pending[path]  # deleted or renamed before it settled
+        return queued
+
+    def dispatch(self) -> int:
+        """Start queued jobs while workers are free; returns how many were started"""
+        self._reap()
+        free = self.workers - len(self._running)
+        if free <= 0:
+            return 0
+        jobs = self.ledger.claim(free)
+        for job in jobs:
+            self._running[self._executor.submit(self._process, job)] = job
+        return len(jobs)
+
+    def run(self, stop_event: threading.Event) -> None:
+        """Scan, queue and dispatch until stop_event is set, then wait for running jobs"""
+        recovered = self.ledger.recover()
+        if recovered:
+            logger.info(f"Re-queued {recovered} job(s) interrupted by the last shutdown")
+        logger.info(f"Watching {self.input_dir} ({type(self.watcher).__name__}, {self.workers} worker(s))")
+
+        while not stop_event.is_set():
+            self.scan()
+            self.dispatch()
+            # Wake up for new events, in time to re-check files that are settling,
+            # or soon after a running job may have freed a worker
+            timeout = min(self.settle_s, self.poll_interval) if self._pending else self.poll_interval
+            self.watcher.wait(min(timeout, 0.5) if self._running else timeout)
+
+        logger.info(f"Stopping, waiting for {len(self._running)} running job(s)...")
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._reap()
+        self.watcher.close()
+
+    def _reap(self) -> None:
+        for future in [future for future in self._running if future.done()]:
+            del self._running[future]
+
+    def _process(self, job: LedgerJob) -> None:
+        """Transcribe one file on a worker thread and record the outcome"""
+        os.makedirs(os.path.dirname(job.output) or ".", exist_ok=True)
+        start = time.perf_counter()
+        try:
+            process_input(replace(self.template, input=job.path, output=job.output))
+            self.ledger.finish(job.id, "done", time.perf_counter() - start)
+            logger.success(f"Transcribed {job.path} -> {job.output} ({time.perf_counter() - start:.1f}s)")
+        except Exception as e:
+            self.ledger.finish(job.id, "failed", time.perf_counter() - start, str(e))
+            logger.error(f"Failed to process {job.path}: {str(e)}")
@@ -0,0 +1,105 @@
+"""Incremental transcription writers: plain text, JSONL, SRT and WebVTT"""
+import json
+import os
+from typing import TextIO
+
+from .transcriber import TranscriptSegment
+
+FORMATS = ("txt", "jsonl", "srt", "vtt")
+
+
+def format_timestamp(seconds: float, separator: str = ".") -> str:
+    """Format seconds as HH:MM:SS.mmm (SRT uses a comma separator)"""
+    milliseconds = int(round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{milliseconds:03d}"
+
+
+class SegmentWriter:
+    """Writes segments to a stream as they arrive, flushing after each one"""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self.count = 0
+
+    def write(self, segment: TranscriptSegment) -> None:
+        self._write(segment)
+        self.count += 1
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Write any trailer; the stream itself is owned by the caller"""
+        self.stream.flush()
+
+    def _write(self, segment: TranscriptSegment) -> None:
+        raise NotImplementedError
+
+
+class TxtWriter(SegmentWriter):
+    """Plain text, segments separated by spaces"""
+
+    def _write(self, segment: TranscriptSegment) -> None:
+        text = segment.text.strip()
+        if text:
+            self.stream.write(text if self.count == 0 else " " + text)
+
+
+class JsonlWriter(SegmentWriter):
+    """One JSON object per segment with timings and decoder scores"""
+
+    def _write(self, segment: TranscriptSegment) -> None:
+        record = {
+            "start": round(segment.start, 3),
+            "end": round(segment.end, 3),
+            "text": segment.text.strip(),
+            "avg_logprob": segment.avg_logprob,
+            "no_speech_prob": segment.no_speech_prob,
+        }
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class SrtWriter(SegmentWriter):
+    """SubRip subtitles"""
+
+    def _write(self, segment: TranscriptSegment) -> None:
+        start = format_timestamp(segment.start, ",")
+        end = format_timestamp(segment.end, ",")
+        self.stream.write(f"{self.count + 1}\n{start} --> {end}\n{segment.text.strip()}\n\n")
+
+
+class VttWriter(SegmentWriter):
+    """WebVTT subtitles"""
+
+    def __init__(self, stream: TextIO) -> None:
+        super().__init__(stream)
+        self.stream.write("WEBVTT\n\n")
+
+    def _write(self, segment: TranscriptSegment) -> None:
+        start = format_timestamp(segment.start)
+        end = format_timestamp(segment.end)
+        self.stream.write(f"{start} --> {end}\n{segment.text.strip()}\n\n")
+
+
+WRITERS: dict[str, type[SegmentWriter]] = {
+    "txt": TxtWriter,
+    "jsonl": JsonlWriter,
+    "srt": SrtWriter,
+    "vtt": VttWriter,
+}
+
+
+def get_writer(output_format: str, stream: TextIO) -> SegmentWriter:
+    """Create the writer for a format (txt, jsonl, srt, vtt)"""
+    if output_format not in WRITERS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    return WRITERS[output_format](stream)
+
+
+def resolve_format(output: str, output_format: str | None = None) -> str:
+    """Use the explicit format, else the output extension, else txt"""
+    if output_format:
+        return output_format
+    extension = os.path.splitext(output)[1].lower().lstrip(".")
+    return extension if extension in WRITERS else "txt"
@@ -5,11 +5,23 @@ Usage: python start.py [--duration SECONDS]
 """
 import argparse
 import os
+import sqlite3
 import sys
+import time
 from datetime import datetime
+from typing import Any
 from src.audio_recorder import record_system_audio
+from src.autotune import resolve_device
+from src.cascade import DEFAULT_DRAFT_MODEL
+from src.live import LiveTranscriber
+from src.model_cache import partition_threads, prewarm_model
+from src.pipeline import PipelinedTranscriber
 from src.processor import process_input
-from src.transcriber import ModelSize, DeviceType, ComputeType
+from src.profiles import DEFAULT_LANGUAGE, PROFILES, decoding_options, get_profile, parse_overrides
+from src.transcript_index import TranscriptIndex, default_index_path, index_transcript
+from src.transcriber import ModelSize, DeviceType, ComputeType, TranscriptSegment, join_segments, resolve_compute_type
+from src.writers import get_writer
+from src.metrics import metrics
 from src.logger import logger
 
 
@@ -24,6 +36,18 @@ class Args:
         device: DeviceType,
         compute_type: ComputeType,
         keep_wav: bool,
+        cpu_threads: int = 0,
+        no_cache: bool = False,
+        chunk_workers: int = 1,
+        output_format: str = "txt",
+        preprocess: bool = False,
+        denoise: bool = False,
+        profile: str | None = None,
+        language: str | None = DEFAULT_LANGUAGE,
+        decode_options: dict[str, Any] | None = None,
+        resume: bool = True,
+        draft_model: ModelSize | None = None,
+        model_workers: int = 1,
     ) -> None:
         self.input = input_file
         self.output = output_file
@@ -31,6 +55,163 @@ class Args:
         self.device = device
         self.compute_type = compute_type
         self.keep_wav = keep_wav
+        self.cpu_threads = cpu_threads
+        self.no_cache = no_cache
+        self.chunk_workers = chunk_workers
+        self.format = output_format
+        self.preprocess = preprocess
+        self.denoise = denoise
+        self.profile = profile
+        self.language = language
+        self.decode_options = decode_options or {}
+        self.resume = resume
+        self.draft_model = draft_model
+        self.model_workers = model_workers
+
+
+def run_live(args: argparse.Namespace, text_file: str) -> None:
+    """Live mode: stream system audio and append each final utterance to the text file and the index"""
+    index: TranscriptIndex | None = None
+    transcript_id = 0
+    index_path = default_index_path()
+    if index_path:
+        try:
+            index = TranscriptIndex(index_path)
+            transcript_id = index.begin(os.path.abspath(text_file), params={"model": args.model})
+        except (sqlite3.Error, OSError) as e:
+            # A broken or unwritable index must not stop the live transcription
+            logger.warning(f"Could not open the transcript index, live text will not be indexed: {str(e)}")
+            if index is not None:
+                index.close()
+            index = None
+    started = time.monotonic()
+    previous_end = 0.0
+
+    with open(text_file, "w", encoding="utf-8") as f:
+        def on_text(text: str, final: bool) -> None:
+            nonlocal previous_end
+            if final:
+                logger.success(text)
+                f.write(text + "\n")
+                f.flush()
+                if index is not None:
+                    # Utterances carry no timestamps; the time since start is close enough to find them again
+                    end = time.monotonic() - started
+                    try:
+                        index.append(transcript_id, [TranscriptSegment(previous_end, end, text)])
+                    except sqlite3.Error as e:
+                        logger.warning(f"Could not index utterance: {str(e)}")
+                    previous_end = end
+            else:
+                logger.info(f"... {text}")
+
+        try:
+            live = LiveTranscriber(
+                model=args.model,
+                device=args.device,
+                compute_type=args.compute_type,
+                cpu_threads=args.cpu_threads,
+                language=None if args.language == "auto" else args.language,
+                on_text=on_text,
+                options=decoding_options(args.profile, args.language, args.decode_options),
+            )
+            transcription = live.run(args.duration)
+        except Exception as e:
+            logger.error(f"Error: {str(e)}")
+            sys.exit(1)
+        finally:
+            if index is not None:
+                index.close()
+
+    logger.info("=" * 60)
+    logger.success("LIVE TRANSCRIPTION FINISHED!")
+    logger.info(f"Transcription ({len(transcription.split())} words) saved to: {text_file}")
+
+
+def run_sequential(args: argparse.Namespace, audio_file: str, text_file: str) -> list[TranscriptSegment]:
+    """Record the full duration, then transcribe the recording"""
+    if args.prewarm:
+        # Same settings transcribe_input uses, so the transcription hits the warm model
+        compute_type = resolve_compute_type(args.device, args.compute_type)
+        if args.chunk_workers > 1:
+            threads = partition_threads(args.chunk_workers, args.cpu_threads or None)
+            prewarm_model(args.model, args.device, compute_type, threads, args.chunk_workers)
+        else:
+            prewarm_model(args.model, args.device, compute_type, args.cpu_threads)
+
+    # Step 1: Record audio
+    logger.info("STEP 1/2: Recording system audio...")
+    success = record_system_audio(
+        audio_file,
+        duration=args.duration or None,
+        sample_rate=16000
+    )
+
+    if not success:
+        logger.error("Recording failed!")
+        sys.exit(1)
+
+    # Step 2: Transcribe
+    logger.info("STEP 2/2: Transcribing audio...")
+
+    # Create args object for processor
+    proc_args = Args(
+        input_file=audio_file,
+        output_file=text_file,
+        model=args.model,
+        device=args.device,
+        compute_type=args.compute_type,
+        keep_wav=args.keep_audio,
+        cpu_threads=args.cpu_threads,
+        no_cache=args.no_cache,
+        chunk_workers=args.chunk_workers,
+        preprocess=args.preprocess,
+        denoise=args.denoise,
+        profile=args.profile,
+        language=args.language,
+        decode_options=args.decode_options,
+        draft_model=args.draft_model,
+    )
+
+    return process_input(proc_args)
+
+
+def run_pipeline(args: argparse.Namespace, audio_file: str, text_file: str) -> list[TranscriptSegment]:
+    """Record and transcribe at the same time, window by window"""
+    pipeline = PipelinedTranscriber(
+        model=args.model,
+        device=args.device,
+        compute_type=args.compute_type,
+        cpu_threads=args.cpu_threads,
+        window_s=args.window,
+        options=decoding_options(args.profile, args.language, args.decode_options),
+        draft_model=args.draft_model,
+        preprocess=args.preprocess,
+        denoise=args.denoise,
+    )
+    pipeline.start()
+
+    logger.info("Recording system audio and transcribing as it arrives...")
+    success = record_system_audio(
+        audio_file,
+        duration=args.duration or None,
+        sample_rate=16000,
+        on_block=pipeline.feed,
+    )
+    segments = pipeline.finish()
+
+    if not success:
+        logger.error("Recording failed!")
+        sys.exit(1)
+
+    with open(text_file, "w", encoding="utf-8") as f:
+        writer = get_writer("txt", f)
+        for segment in segments:
+            writer.write(segment)
+        writer.close()
+    index_transcript(os.path.abspath(audio_file), segments, output=os.path.abspath(text_file),
+                     params={"model": args.model, "pipeline": True})
+    return segments
 
 
 def main() -> None:
@@ -39,19 +220,50 @@ def main() -> None:
     )
 
     parser.add_argument("--duration", "-d", type=int, default=30,
-                        help="Recording duration in seconds (default: 30)")
+                        help="Recording duration in seconds, 0 = until Ctrl+C (default: 30)")
+
+    parser.add_argument("--profile", "-p", default=None, choices=list(PROFILES),
+                        help="Decoding profile: fast, balanced or accurate (default: accurate)")
 
-    parser.add_argument("--model", "-m", default="large-v3",
+    parser.add_argument("--model", "-m", default=None,
                         choices=["tiny", "base", "small", "medium", "large-v3"],
-                        help="Whisper model (default: large-v3)")
+                        help="Whisper model (default: the profile's model, large-v3 for accurate)")
+
+    parser.add_argument("--language", "-l", default=DEFAULT_LANGUAGE,
+                        help="Language code, or auto to detect it (default: pt)")
+
+    parser.add_argument("--decode-option", action="append", default=None, metavar="KEY=VALUE",
+                        help="Override a WhisperModel.transcribe option, e.g. beam_size=3 (repeatable)")
 
     parser.add_argument("--device", default="cpu",
-                        choices=["cpu", "cuda"],
-                        help="Processing device (default: cpu)")
+                        choices=["cpu", "cuda", "auto"],
+                        help="Processing device; auto uses the fastest calibrated configuration (default: cpu)")
 
-    parser.add_argument("--compute-type", default="int8",
+    parser.add_argument("--compute-type", default=None,
                         choices=["int8", "int8_float16", "float16", "float32"],
-                        help="Quantization type (default: int8)")
+                        help="Quantization type (default: int8, or the tuned one with --device auto)")
+
+    parser.add_argument("--retune", action="store_true",
+                        help="With --device auto, calibrate again instead of using the stored result")
+
+    parser.add_argument("--cpu-threads", type=int, default=0,
+                        help="CPU threads for transcription (default: 0 = all cores)")
+
+    parser.add_argument("--chunk-workers", type=int, default=1,
+                        help="Transcribe long recordings as N parallel chunks (default: 1 = off)")
+
+    parser.add_argument("--cascade", dest="draft_model", nargs="?", const=DEFAULT_DRAFT_MODEL, default=None,
+                        choices=["tiny", "base", "small", "medium"], metavar="DRAFT_MODEL",
+                        help="Draft with a fast model (default: small), re-decode low-confidence parts with --model")
+
+    parser.add_argument("--preprocess", action="store_true",
+                        help="Trim silence, shorten long pauses and normalize loudness before transcribing")
+
+    parser.add_argument("--denoise", action="store_true",
+                        help="Also apply spectral-gating noise reduction (implies --preprocess)")
+
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always transcribe, ignoring and not storing cached results")
 
     parser.add_argument("--keep-audio", action="store_true",
                         help="Keep audio file after transcription")
@@ -59,7 +271,38 @@ def main() -> None:
     parser.add_argument("--output-dir", default="output",
                         help="Directory to save files (default: output/)")
 
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Transcribe rolling windows while recording, so little is left when recording ends "
+                             "(the model always loads while recording; results are not cached)")
+
+    parser.add_argument("--window", type=float, default=30.0,
+                        help="Pipeline mode: seconds of audio per transcribed window (default: 30)")
+
+    parser.add_argument("--prewarm", action="store_true",
+                        help="Load the model in the background while recording, so transcription starts right away")
+
+    parser.add_argument("--metrics-events", default=None, metavar="PATH",
+                        help="Append per-stage timing events as JSON lines to PATH (- for stderr)")
+
+    parser.add_argument("--metrics-file", default=None, metavar="PATH",
+                        help="Keep Prometheus text metrics in PATH (for node_exporter's textfile collector)")
+
+    parser.add_argument("--live", action="store_true",
+                        help="Transcribe while capturing, utterance by utterance (--duration 0 = until Ctrl+C)")
+
     args = parser.parse_args()
+    metrics.configure(args.metrics_events, args.metrics_file)
+    args.model = args.model or get_profile(args.profile).model
+    try:
+        args.decode_options = parse_overrides(args.decode_option)
+        decoding_options(args.profile, args.language, args.decode_options)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.pipeline and args.chunk_workers > 1:
+        parser.error("--chunk-workers cannot be combined with --pipeline, which decodes windows as they are recorded")
+    args.device, args.compute_type, args.cpu_threads = resolve_device(
+        args.model, args.device, args.compute_type, args.cpu_threads, args.retune
+    )
 
     # Create output directory if it doesn't exist
     os.makedirs(args.output_dir, exist_ok=True)
@@ -73,45 +316,26 @@ def main() -> None:
     logger.info("AUTOMATIC RECORDING AND TRANSCRIPTION")
     logger.info("=" * 60)
     logger.info(f"Duration: {args.duration} seconds")
-    logger.info(f"Model: {args.model}")
+    logger.info(f"Model: {args.model} ({get_profile(args.profile).name} profile, language: {args.language})")
     logger.info(f"Saving to: {args.output_dir}/")
     logger.info("=" * 60)
 
-    try:
-        # Step 1: Record audio
-        logger.info("STEP 1/2: Recording system audio...")
-        success = record_system_audio(
-            audio_file,
-            duration=args.duration,
-            sample_rate=16000
-        )
-
-        if not success:
-            logger.error("Recording failed!")
-            sys.exit(1)
-
-        # Step 2: Transcribe
-        logger.info("STEP 2/2: Transcribing audio...")
-
-        # Create args object for processor
-        proc_args = Args(
-            input_file=audio_file,
-            output_file=text_file,
-            model=args.model,
-            device=args.device,
-            compute_type=args.compute_type,
-            keep_wav=args.keep_audio
-        )
+    if args.live:
+        run_live(args, text_file)
+        return
 
-        process_input(proc_args)
+    try:
+        if args.pipeline:
+            segments = run_pipeline(args, audio_file, text_file)
+        else:
+            segments = run_sequential(args, audio_file, text_file)
 
         # Show results
         logger.info("=" * 60)
         logger.success("PROCESSING COMPLETED!")
         logger.info("=" * 60)
 
-        with open(text_file, 'r', encoding='utf-8') as f:
-            transcription = f.read()
+        transcription = join_segments(segments)
 
         logger.info(f"Transcription ({len(transcription.split())} words):")
         logger.info("-" * 60)
@@ -1,7 +1,17 @@
 import unittest
 import os
 import tempfile
-from src.audio_converter import converter_mp3_to_wav, verify_audio
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+from src.audio_converter import converter_mp3_to_wav, decode_audio, resample_poly, verify_audio
+
+
+def sine(frequency, seconds, sample_rate):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    return (0.3 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
 
 
 class TestAudioConverter(unittest.TestCase):
@@ -33,6 +43,42 @@ class TestAudioConverter(unittest.TestCase):
         result = verify_audio(wav_file)
         self.assertFalse(result)
 
+    def test_decode_audio_nonexistent_file(self):
+        """Test in-memory decoding with non-existent file"""
+        input_file = os.path.join(self.temp_dir, "nonexistent.mp3")
+
+        result = decode_audio(input_file)
+        self.assertIsNone(result)
+
+    def test_resample_poly_matches_signal(self):
+        """Test polyphase resampling of common rates to 16kHz"""
+        for rate in (8000, 22050, 44100, 48000):
+            resampled = resample_poly(sine(440, 2.0, rate), rate, 16000)
+
+            self.assertEqual(len(resampled), 32000)
+            expected = sine(440, 2.0, 16000)
+            # Ignore the filter edges
+            np.testing.assert_allclose(resampled[1000:-1000], expected[1000:-1000], atol=2e-3)
+
+    def test_resample_poly_removes_aliasing(self):
+        """Test that content above the new Nyquist frequency is filtered out"""
+        resampled = resample_poly(sine(12000, 1.0, 48000), 48000, 16000)
+
+        self.assertLess(np.abs(resampled[500:-500]).max(), 0.01)
+
+    @patch('src.audio_converter.subprocess.run')
+    def test_decode_audio_in_process(self, mock_run):
+        """Test that a stereo 44.1kHz FLAC is decoded to 16kHz mono without ffmpeg"""
+        input_file = os.path.join(self.temp_dir, "stereo.flac")
+        tone = sine(440, 1.5, 44100)
+        sf.write(input_file, np.stack([tone, tone], axis=1), 44100)
+
+        result = decode_audio(input_file)
+
+        mock_run.assert_not_called()
+        self.assertEqual(len(result), 24000)
+        self.assertAlmostEqual(float(np.abs(result).max()), 0.3, delta=0.01)
+
 
 if __name__ == '__main__':
     unittest.main()
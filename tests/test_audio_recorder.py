@@ -1,6 +1,29 @@
+import os
+import tempfile
+import threading
 import unittest
 from unittest.mock import patch, MagicMock
-from src.audio_recorder import find_monitor_device, list_audio_devices
+
+import numpy as np
+import soundfile as sf
+
+from src.audio_recorder import find_monitor_device, list_audio_devices, record_stream
+
+
+class FakeInputStream:
+    """Input stream that delivers a fixed number of blocks when entered"""
+
+    def __init__(self, samplerate, channels, device, dtype, blocksize, callback):
+        self.blocksize = blocksize
+        self.callback = callback
+
+    def __enter__(self):
+        for _ in range(4):
+            self.callback(np.full((self.blocksize, 1), 0.25, dtype=np.float32), self.blocksize, None, None)
+        return self
+
+    def __exit__(self, *exc):
+        return False
 
 
 class TestAudioRecorder(unittest.TestCase):
@@ -34,6 +57,32 @@ class TestAudioRecorder(unittest.TestCase):
         self.assertIsNotNone(device_id)
         self.assertIsNotNone(device_name)
 
+    @patch('src.audio_recorder.sd.InputStream', FakeInputStream)
+    def test_record_stream_stops_at_duration(self):
+        """Test that streamed recording writes exactly the requested duration"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, "out.flac")
+
+            result = record_stream(output, duration=1, sample_rate=16000, block_duration=0.4)
+
+            self.assertTrue(result)
+            data, sample_rate = sf.read(output)
+            self.assertEqual(sample_rate, 16000)
+            self.assertEqual(len(data), 16000)
+
+    @patch('src.audio_recorder.sd.InputStream', FakeInputStream)
+    def test_record_stream_open_ended_stops_on_event(self):
+        """Test that an open-ended recording ends when the stop event is set"""
+        stop_event = threading.Event()
+        stop_event.set()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, "out.wav")
+
+            result = record_stream(output, duration=None, stop_event=stop_event)
+
+            self.assertTrue(result)
+            self.assertTrue(os.path.exists(output))
+
 
 if __name__ == '__main__':
     unittest.main()
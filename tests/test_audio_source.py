@@ -0,0 +1,125 @@
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+import soundfile as sf
+
+from src.audio_source import AudioSource, open_source, transcribe_windows, write_wav
+from src.transcriber import TranscriptSegment
+
+SR = 16000
+
+
+class TestAudioSource(unittest.TestCase):
+    """Tests for memory-mapped audio sources"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.wav = os.path.join(self.temp_dir, "long.wav")
+        rng = np.random.default_rng(0)
+        self.pcm = rng.integers(-20000, 20000, SR * 12, dtype=np.int16)
+        sf.write(self.wav, self.pcm, SR, subtype="PCM_16")
+
+    def tearDown(self):
+        """Cleanup after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_matches_soundfile(self):
+        """Test that mapped windows equal the samples soundfile decodes"""
+        source = AudioSource.open(self.wav)
+        expected, _ = sf.read(self.wav, dtype="float32")
+
+        self.assertIsInstance(source.samples, np.memmap)
+        self.assertEqual(len(source), len(self.pcm))
+        self.assertAlmostEqual(source.duration, 12.0)
+        np.testing.assert_allclose(source[SR:2 * SR], expected[SR:2 * SR], atol=1e-6)
+        self.assertEqual(source[0:10].dtype, np.float32)
+
+    def test_view_shares_the_mapping(self):
+        """Test that a view is zero-copy over the same samples"""
+        source = AudioSource.open(self.wav)
+        view = source.view(SR * 2, SR * 4)
+
+        self.assertEqual(len(view), SR * 2)
+        self.assertTrue(np.shares_memory(view.samples, source.samples))
+        np.testing.assert_array_equal(view[0:5], source[SR * 2:SR * 2 + 5])
+
+    def test_stereo_is_mixed_down(self):
+        """Test that a stereo file is averaged to mono per window"""
+        stereo = os.path.join(self.temp_dir, "stereo.wav")
+        sf.write(stereo, np.stack([self.pcm[:SR], np.zeros(SR, dtype=np.int16)], axis=1), SR, subtype="PCM_16")
+
+        source = AudioSource.open(stereo)
+
+        np.testing.assert_allclose(source[0:100], self.pcm[:100] / 2 / 32768.0, atol=1e-6)
+
+    def test_raw_and_unclosed_wav(self):
+        """Test headerless PCM, and a WAV whose data size was never written"""
+        raw = os.path.join(self.temp_dir, "capture.raw")
+        self.pcm.tofile(raw)
+        with open(self.wav, "r+b") as f:
+            data = f.read()
+            f.seek(data.index(b"data") + 4)
+            f.write(struct.pack("<I", 0))
+
+        self.assertEqual(len(AudioSource.open(raw)), len(self.pcm))
+        self.assertEqual(len(AudioSource.open(self.wav)), len(self.pcm))
+
+    def test_other_formats_are_not_mapped(self):
+        """Test that files needing decoding or resampling are left to decode_audio"""
+        resampled = os.path.join(self.temp_dir, "44k.wav")
+        sf.write(resampled, self.pcm[:SR], 44100, subtype="PCM_16")
+        floats = os.path.join(self.temp_dir, "float.wav")
+        sf.write(floats, self.pcm[:SR] / 32768.0, SR, subtype="FLOAT")
+
+        self.assertIsNone(open_source(resampled))
+        self.assertIsNone(open_source(floats))
+        self.assertIsNone(open_source(os.path.join(self.temp_dir, "clip.mp3")))
+        self.assertIsNotNone(open_source(self.wav))
+
+    def test_windows_cover_the_audio_and_cut_in_silence(self):
+        """Test that windows are contiguous and end at the quietest point of their tail"""
+        pcm = self.pcm.copy()
+        pcm[int(4.3 * SR):int(4.5 * SR)] = 0
+        sf.write(self.wav, pcm, SR, subtype="PCM_16")
+        source = AudioSource.open(self.wav)
+
+        windows = list(source.windows(window_s=5.0, search_s=1.0))
+
+        starts = [start for start, _ in windows]
+        self.assertEqual(starts[1], int(4.35 * SR))
+        self.assertEqual(sum(len(window) for _, window in windows), len(pcm))
+        for (start, window), following in zip(windows, starts[1:], strict=False):
+            self.assertEqual(start + len(window), following)
+
+    def test_transcribe_windows_shifts_segments(self):
+        """Test that window-relative segments get source timestamps"""
+        source = AudioSource.open(self.wav)
+        calls = []
+
+        def transcribe(window):
+            calls.append(len(window))
+            return [TranscriptSegment(0.5, 1.0, f" {len(calls)}")]
+
+        segments = list(transcribe_windows(source, transcribe, window_s=5.0))
+
+        self.assertGreaterEqual(len(calls), 3)
+        self.assertEqual(segments[0].start, 0.5)
+        self.assertAlmostEqual(segments[1].start, calls[0] / SR + 0.5)
+
+    def test_write_wav_from_source(self):
+        """Test that a source is written back window by window"""
+        out = os.path.join(self.temp_dir, "copy.wav")
+
+        write_wav(out, AudioSource.open(self.wav), window_s=5.0)
+
+        np.testing.assert_array_equal(sf.read(out, dtype="int16")[0], self.pcm)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.autotune import Capabilities, TunedConfig, autotune, candidate_configs, load_tuned, resolve_device, save_tuned
+
+
+class TestAutotune(unittest.TestCase):
+    """Tests for automatic device and compute type selection"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "autotune.json")
+        self.caps = Capabilities(8, 0, {"cpu": ["float32", "int8", "int8_float32"]}, 16000)
+
+    def tearDown(self):
+        """Cleanup after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_cpu_candidates(self):
+        """Test that supported CPU compute types are tried with all and half the cores"""
+        candidates = candidate_configs("small", self.caps)
+
+        self.assertEqual(
+            [(c.device, c.compute_type, c.cpu_threads) for c in candidates],
+            [("cpu", "int8", 8), ("cpu", "int8", 4), ("cpu", "float32", 8), ("cpu", "float32", 4)],
+        )
+
+    def test_candidates_respect_memory_and_compute_type(self):
+        """Test that models that do not fit are skipped and an explicit compute type is kept"""
+        caps = Capabilities(2, 1, {"cpu": ["float32", "int8"], "cuda": ["float16", "int8"]}, 3000)
+
+        candidates = candidate_configs("large-v3", caps)
+        self.assertNotIn(("cpu", "float32"), [(c.device, c.compute_type) for c in candidates])
+        self.assertIn(("cuda", "float16"), [(c.device, c.compute_type) for c in candidates])
+
+        only_int8 = candidate_configs("large-v3", caps, "int8")
+        self.assertTrue(all(c.compute_type == "int8" for c in only_int8))
+
+    @patch('src.autotune.ctranslate2')
+    def test_stored_result_reused_on_same_host(self, mock_ct2):
+        """Test that a stored configuration is returned until the machine changes"""
+        mock_ct2.__version__ = "4.0.0"
+        save_tuned("small", self.caps, TunedConfig("cpu", "int8", 4, 0.1), self.path)
+
+        self.assertEqual(load_tuned("small", self.caps, self.path), TunedConfig("cpu", "int8", 4, 0.1))
+        self.assertIsNone(load_tuned("tiny", self.caps, self.path))
+
+        mock_ct2.__version__ = "4.1.0"
+        self.assertIsNone(load_tuned("small", self.caps, self.path))
+
+    @patch('src.autotune.ctranslate2')
+    @patch('src.autotune.calibrate')
+    @patch('src.autotune.probe_capabilities')
+    def test_autotune_calibrates_once(self, mock_probe, mock_calibrate, mock_ct2):
+        """Test that calibration runs on first use and is skipped afterwards"""
+        mock_ct2.__version__ = "4.0.0"
+        mock_probe.return_value = self.caps
+        mock_calibrate.return_value = [TunedConfig("cpu", "int8", 4, 0.1), TunedConfig("cpu", "int8", 8, 0.2)]
+
+        first = autotune("small", path=self.path)
+        second = autotune("small", path=self.path)
+
+        self.assertEqual(mock_calibrate.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(second.cpu_threads, 4)
+
+    def test_explicit_device_passes_through(self):
+        """Test that cpu/cuda skip tuning and default the compute type to int8"""
+        self.assertEqual(resolve_device("small", "cpu", None, 2), ("cpu", "int8", 2))
+        self.assertEqual(resolve_device("small", "cuda", "float16"), ("cuda", "float16", 0))
+
+    @patch('src.autotune.autotune')
+    def test_auto_keeps_explicit_threads(self, mock_autotune):
+        """Test that --device auto fills in only what the user did not set"""
+        mock_autotune.return_value = TunedConfig("cpu", "int8", 4, 0.1)
+
+        self.assertEqual(resolve_device("small", "auto", None), ("cpu", "int8", 4))
+        self.assertEqual(resolve_device("small", "auto", None, 6), ("cpu", "int8", 6))
+
+
+if __name__ == '__main__':
+    unittest.main()
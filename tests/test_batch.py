@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.batch import collect_inputs, output_path_for, process_batch
+
+
+class TestBatch(unittest.TestCase):
+    """Tests for batch transcription"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.temp_dir, "sub"))
+        for name in ["a.mp3", "b.wav", "notes.txt", os.path.join("sub", "c.flac")]:
+            open(os.path.join(self.temp_dir, name), "w").close()
+
+    def tearDown(self):
+        """Cleanup after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_collect_inputs_filters_audio(self):
+        """Test that the default pattern only keeps audio files"""
+        files = collect_inputs(self.temp_dir)
+        self.assertEqual([os.path.basename(f) for f in files], ["a.mp3", "b.wav"])
+
+    def test_collect_inputs_recursive_glob_and_manifest(self):
+        """Test recursive globs combined with a manifest"""
+        manifest = os.path.join(self.temp_dir, "manifest.txt")
+        with open(manifest, "w") as f:
+            f.write("# comment\n/data/x.mp3\n\n")
+
+        files = collect_inputs(self.temp_dir, "**/*.flac", manifest)
+
+        self.assertEqual(files, ["/data/x.mp3", os.path.join(self.temp_dir, "sub", "c.flac")])
+
+    def test_output_path_mirrors_subdirectories(self):
+        """Test output naming relative to the input directory"""
+        path = os.path.join(self.temp_dir, "sub", "c.flac")
+        self.assertEqual(output_path_for(path, "out", self.temp_dir), os.path.join("out", "sub", "c.flac.txt"))
+
+    def test_output_paths_of_manifest_entries_do_not_collide(self):
+        """Test that same-named inputs from other directories or with other extensions get their own outputs"""
+        outputs = {output_path_for(path, "out") for path in ("/data/a/x.mp3", "/data/b/x.mp3", "/data/a/x.wav")}
+
+        self.assertEqual(len(outputs), 3)
+        self.assertEqual(output_path_for(os.path.join("calls", "x.mp3"), "out", output_format="srt"),
+                         os.path.join("out", "calls", "x.mp3.srt"))
+
+    @patch('src.batch.get_model')
+    @patch('src.batch.process_input')
+    def test_process_batch_skips_finished_outputs(self, mock_process, mock_model):
+        """Test that existing outputs are skipped and failures are recorded"""
+        output_dir = os.path.join(self.temp_dir, "out")
+        os.makedirs(output_dir)
+        open(os.path.join(output_dir, "a.mp3.txt"), "w").close()
+        mock_process.side_effect = RuntimeError("boom")
+        inputs = [os.path.join(self.temp_dir, "a.mp3"), os.path.join(self.temp_dir, "b.wav")]
+        summary = os.path.join(output_dir, "summary.csv")
+
+        results = process_batch(inputs, output_dir, model="tiny", input_dir=self.temp_dir, summary_path=summary)
+
+        self.assertEqual([r.status for r in results], ["skipped", "failed"])
+        self.assertEqual(mock_process.call_count, 1)
+        self.assertEqual(mock_model.call_count, 1)
+        self.assertTrue(os.path.exists(summary))
+
+
+if __name__ == '__main__':
+    unittest.main()
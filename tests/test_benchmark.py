@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from src.benchmark import (
+    BenchmarkClip,
+    resolve_model_path,
+    run_combination,
+    synthetic_clips,
+    word_error_rate,
+    write_results,
+)
+
+
+class TestBenchmark(unittest.TestCase):
+    """Tests for the benchmark harness"""
+
+    def test_word_error_rate(self):
+        """Test WER with a substitution, a deletion and normalization"""
+        self.assertEqual(word_error_rate("Olá, mundo!", "olá mundo"), 0.0)
+        self.assertAlmostEqual(word_error_rate("um dois três quatro", "um dos três"), 0.5)
+        self.assertEqual(word_error_rate("", ""), 0.0)
+
+    def test_synthetic_clips(self):
+        """Test that synthetic clips have the requested durations"""
+        clips = synthetic_clips((1.0, 2.5))
+
+        self.assertEqual([clip.duration for clip in clips], [1.0, 2.5])
+        self.assertTrue(all(clip.reference is None for clip in clips))
+        self.assertFalse(any(clip.vad_filter for clip in clips))
+
+    @patch('src.benchmark.faster_whisper.WhisperModel')
+    def test_synthetic_clips_decode_without_vad(self, mock_model):
+        """Test that VAD is turned off for synthetic clips but kept for real ones"""
+        mock_model.return_value.transcribe.return_value = ([], None)
+        clips = synthetic_clips((1.0,)) + [BenchmarkClip("real", np.zeros(16000, dtype=np.float32), "texto")]
+
+        result = run_combination(clips, "tiny", "int8", 1, options={"vad_filter": True})
+
+        self.assertEqual(result.error, "")
+        calls = mock_model.return_value.transcribe.call_args_list
+        self.assertEqual([call.kwargs["vad_filter"] for call in calls], [False, True])
+
+    def test_resolve_model_path_offline(self):
+        """Test that a model directory forces offline loading"""
+        with tempfile.TemporaryDirectory() as model_dir:
+            self.assertEqual(resolve_model_path("tiny", None), ("tiny", {}))
+            self.assertEqual(
+                resolve_model_path("tiny", model_dir),
+                ("tiny", {"download_root": model_dir, "local_files_only": True}),
+            )
+
+            os.makedirs(os.path.join(model_dir, "tiny"))
+            open(os.path.join(model_dir, "tiny", "model.bin"), "w").close()
+            self.assertEqual(resolve_model_path("tiny", model_dir), (os.path.join(model_dir, "tiny"), {}))
+
+    def test_write_results_empty(self):
+        """Test that result files are written even without results"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            json_path = os.path.join(temp_dir, "bench.json")
+            csv_path = os.path.join(temp_dir, "bench.csv")
+
+            write_results([], json_path, csv_path)
+
+            self.assertTrue(os.path.exists(json_path))
+            self.assertTrue(os.path.exists(csv_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
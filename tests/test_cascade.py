@@ -0,0 +1,128 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from src.cascade import CascadeStats, CascadeThresholds, escalation_ranges, needs_escalation, transcribe_cascade
+from src.transcriber import TranscriptSegment
+
+SR = 16000
+
+
+def segment(start, end, text, avg_logprob=-0.2, no_speech_prob=0.05, compression_ratio=1.5):
+    return TranscriptSegment(start, end, text, avg_logprob, no_speech_prob, compression_ratio)
+
+
+class TestCascade(unittest.TestCase):
+    """Tests for two-pass cascade decoding"""
+
+    def test_needs_escalation(self):
+        """Test that each low score on its own triggers escalation"""
+        thresholds = CascadeThresholds()
+
+        self.assertFalse(needs_escalation(segment(0, 1, " ok"), thresholds))
+        self.assertTrue(needs_escalation(segment(0, 1, " ?", avg_logprob=-1.2), thresholds))
+        self.assertTrue(needs_escalation(segment(0, 1, " la la la", compression_ratio=3.0), thresholds))
+        self.assertTrue(needs_escalation(segment(0, 1, " obrigado", no_speech_prob=0.9), thresholds))
+
+    def test_ranges_group_and_pad_without_overlapping_kept_segments(self):
+        """Test that consecutive low-confidence segments form one padded range"""
+        segments = [
+            segment(0.0, 2.0, " um"),
+            segment(2.2, 4.0, " dois", avg_logprob=-1.0),
+            segment(5.0, 6.0, " três", avg_logprob=-1.0),
+            segment(8.0, 9.0, " quatro"),
+        ]
+
+        ranges = escalation_ranges(segments, CascadeThresholds(padding_s=0.5), duration=10.0)
+
+        self.assertEqual(ranges, [(1, 3, 2.0, 6.5)])
+
+    def test_close_ranges_are_merged(self):
+        """Test that runs a few seconds apart are re-decoded as one range, and distant ones are not"""
+        segments = [
+            segment(0.0, 2.0, " um", avg_logprob=-1.0),
+            segment(2.5, 3.5, " dois"),
+            segment(4.0, 5.0, " três", avg_logprob=-1.0),
+            segment(6.0, 10.0, " quatro"),
+            segment(14.0, 15.0, " cinco", avg_logprob=-1.0),
+        ]
+
+        ranges = escalation_ranges(segments, CascadeThresholds(padding_s=0.5, merge_gap_s=3.0), duration=20.0)
+
+        self.assertEqual(ranges, [(0, 3, 0.0, 5.5), (4, 5, 13.5, 15.5)])
+
+    def test_last_range_is_padded_up_to_the_end(self):
+        """Test that a range at the end of the audio is clipped to its duration"""
+        segments = [segment(0.0, 2.0, " um"), segment(3.0, 9.8, " dois", avg_logprob=-1.0)]
+
+        self.assertEqual(escalation_ranges(segments, CascadeThresholds(), duration=10.0), [(1, 2, 2.5, 10.0)])
+
+    @patch('src.cascade.iter_segments')
+    def test_only_escalated_ranges_are_redecoded(self, mock_iter):
+        """Test that the full model sees only the low-confidence audio and its text replaces the draft"""
+        draft = [
+            segment(0.0, 2.0, " o rato roeu"),
+            segment(3.0, 4.0, " a ropa", avg_logprob=-1.1),
+            segment(6.0, 8.0, " do rei de Roma"),
+        ]
+        mock_iter.side_effect = [iter(draft), iter([segment(0.5, 1.5, " a roupa")])]
+        audio = np.zeros(10 * SR, dtype=np.float32)
+        stats = CascadeStats()
+
+        merged = list(transcribe_cascade(audio, "large-v3", "small", options={"language": "pt"}, stats=stats))
+
+        self.assertEqual([s.text for s in merged], [" o rato roeu", " a roupa", " do rei de Roma"])
+        self.assertEqual((merged[1].start, merged[1].end), (3.0, 4.0))
+        refine_call = mock_iter.call_args_list[1]
+        self.assertEqual(refine_call[0][1], "large-v3")
+        self.assertEqual(len(refine_call[0][0]), 2 * SR)
+        self.assertEqual(refine_call[0][5]["initial_prompt"], "o rato roeu")
+        self.assertAlmostEqual(stats.escalated_fraction, 0.2)
+        self.assertEqual((stats.segments, stats.escalated_segments), (3, 1))
+
+    @patch('src.cascade.iter_segments')
+    def test_confident_draft_is_kept(self, mock_iter):
+        """Test that the full model is not used when the draft is confident"""
+        mock_iter.return_value = iter([segment(0.0, 2.0, " tudo certo")])
+        stats = CascadeStats()
+
+        merged = list(transcribe_cascade(np.zeros(3 * SR, dtype=np.float32), stats=stats))
+
+        self.assertEqual([s.text for s in merged], [" tudo certo"])
+        self.assertEqual(mock_iter.call_count, 1)
+        self.assertEqual(stats.escalated_fraction, 0.0)
+        self.assertIsNone(stats.speedup)
+
+    @patch('src.cascade.iter_segments')
+    def test_segments_are_yielded_as_they_settle(self, mock_iter):
+        """Test that settled segments come out before the draft pass has finished"""
+        drafted = []
+
+        def draft():
+            for s in [segment(0.0, 2.0, " um"), segment(2.5, 4.0, " dois", avg_logprob=-1.0),
+                      segment(8.0, 9.0, " três"), segment(10.0, 11.0, " quatro")]:
+                drafted.append(s.text)
+                yield s
+
+        mock_iter.side_effect = [draft(), iter([segment(0.2, 1.0, " dois!")])]
+        merged = transcribe_cascade(np.zeros(12 * SR, dtype=np.float32))
+
+        self.assertEqual(next(merged).text, " um")
+        self.assertEqual(drafted, [" um"])
+        self.assertEqual([next(merged).text, next(merged).text], [" dois!", " três"])
+        self.assertEqual(drafted, [" um", " dois", " três"])
+        self.assertEqual(mock_iter.call_args_list[1][0][5]["initial_prompt"], "um")
+        self.assertEqual([s.text for s in merged], [" quatro"])
+
+    def test_speedup_extrapolates_full_model_rate_per_window(self):
+        """Test that the estimated speedup counts 30s encoder windows, not seconds of escalated audio"""
+        stats = CascadeStats(audio_seconds=120.0, escalated_seconds=4.0, escalated_windows=2,
+                             draft_seconds=10.0, refine_seconds=5.0)
+
+        # Full model: 2.5s per window -> 4 windows take 10s, cascade took 15s
+        self.assertAlmostEqual(stats.speedup, 10.0 / 15.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
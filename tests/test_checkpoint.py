@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.checkpoint import Checkpoint, checkpoint_key
+from src.transcriber import TranscriptSegment
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Tests for resumable transcription checkpoints"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output = os.path.join(self.temp_dir, "long.txt")
+
+    def tearDown(self):
+        """Cleanup after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_segments_survive_and_offset_advances(self):
+        """Test that tracked segments are reloaded with the offset they reached"""
+        checkpoint = Checkpoint.open(self.output, "key")
+        list(checkpoint.track([TranscriptSegment(0.0, 2.0, " um"), TranscriptSegment(2.0, 4.5, " dois")]))
+        checkpoint.close()
+
+        resumed = Checkpoint.open(self.output, "key")
+
+        self.assertEqual([s.text for s in resumed.segments], [" um", " dois"])
+        self.assertEqual(resumed.offset, 4.5)
+        resumed.close()
+
+    def test_torn_line_is_dropped(self):
+        """Test that a partially written last line from a crash is ignored"""
+        checkpoint = Checkpoint.open(self.output, "key")
+        checkpoint.append(TranscriptSegment(0.0, 2.0, " um"))
+        checkpoint.close()
+        with open(checkpoint.path, "a", encoding="utf-8") as f:
+            f.write('{"start": 2.0, "end"')
+
+        resumed = Checkpoint.open(self.output, "key")
+        resumed.append(TranscriptSegment(2.0, 3.0, " dois"))
+        resumed.close()
+
+        self.assertEqual([s.text for s in Checkpoint.load(checkpoint.path, "key")], [" um", " dois"])
+
+    def test_other_settings_or_no_resume_start_over(self):
+        """Test that a checkpoint for other settings, or resume=False, is not used"""
+        checkpoint = Checkpoint.open(self.output, "key")
+        checkpoint.append(TranscriptSegment(0.0, 2.0, " um"))
+        checkpoint.close()
+
+        other = Checkpoint.open(self.output, "other")
+        self.assertEqual(other.segments, [])
+        other.close()
+        fresh = Checkpoint.open(self.output, "key", resume=False)
+        self.assertEqual(fresh.offset, 0.0)
+        fresh.close()
+
+    def test_remove_and_key(self):
+        """Test that remove deletes the file and the key follows the input and parameters"""
+        checkpoint = Checkpoint.open(self.output, "key")
+        checkpoint.remove()
+        self.assertFalse(os.path.exists(checkpoint.path))
+
+        with open(self.output, "w", encoding="utf-8") as f:
+            f.write("audio")
+        self.assertEqual(checkpoint_key(self.output, {"beam_size": 5}), checkpoint_key(self.output, {"beam_size": 5}))
+        self.assertNotEqual(checkpoint_key(self.output, {"beam_size": 5}), checkpoint_key(self.output, {"beam_size": 1}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from src.audio_source import AudioSource
+from src.chunking import Chunk, dedupe_boundary, plan_chunks, speech_timestamps, stitch_segments, transcribe_chunked
+from src.transcriber import TranscriptSegment
+
+SR = 16000
+
+
+class TestChunking(unittest.TestCase):
+    """Tests for long-audio chunk planning and stitching"""
+
+    def test_plan_cuts_in_silence(self):
+        """Test that chunks are closed in the middle of a pause after the target length"""
+        speech = [{"start": 0, "end": 40 * SR}, {"start": 42 * SR, "end": 72 * SR}, {"start": 74 * SR, "end": 80 * SR}]
+
+        chunks = plan_chunks(speech, 90 * SR, target_samples=30 * SR, max_samples=120 * SR, overlap_samples=2 * SR)
+
+        self.assertEqual(chunks, [Chunk(0, 41 * SR), Chunk(41 * SR, 73 * SR), Chunk(73 * SR, 90 * SR)])
+
+    def test_plan_hard_cut_overlaps(self):
+        """Test that speech without pauses is cut hard with an overlap"""
+        speech = [{"start": 0, "end": 250 * SR}]
+
+        chunks = plan_chunks(speech, 250 * SR, target_samples=60 * SR, max_samples=100 * SR, overlap_samples=2 * SR)
+
+        self.assertEqual(chunks[0], Chunk(0, 100 * SR, 0))
+        self.assertEqual(chunks[1], Chunk(98 * SR, 198 * SR, 2 * SR))
+        self.assertEqual(chunks[-1].end, 250 * SR)
+
+    def test_plan_without_speech(self):
+        """Test that silent audio is a single chunk"""
+        self.assertEqual(plan_chunks([], 10 * SR, 30 * SR, 60 * SR, SR), [Chunk(0, 10 * SR)])
+        self.assertEqual(plan_chunks([], 0, 30 * SR, 60 * SR, SR), [])
+
+    def test_plan_rejects_overlap_not_shorter_than_limit(self):
+        """Test that hard cuts which could never advance are refused"""
+        with self.assertRaises(ValueError):
+            plan_chunks([{"start": 0, "end": 10 * SR}], 10 * SR, 2 * SR, 2 * SR, 2 * SR)
+
+    def test_stitch_shifts_timestamps(self):
+        """Test that chunk-relative timestamps become global"""
+        chunks = [Chunk(0, 10 * SR), Chunk(10 * SR, 20 * SR)]
+        results = [[TranscriptSegment(1.0, 2.0, " um")], [TranscriptSegment(0.5, 1.5, " dois")]]
+
+        stitched = stitch_segments(chunks, results)
+
+        self.assertEqual([(s.start, s.end, s.text) for s in stitched], [(1.0, 2.0, " um"), (10.5, 11.5, " dois")])
+
+    def test_stitch_dedupes_overlap(self):
+        """Test that words repeated across a hard cut appear once"""
+        chunks = [Chunk(0, 10 * SR), Chunk(8 * SR, 20 * SR, 2 * SR)]
+        results = [
+            [TranscriptSegment(6.0, 9.8, " o rato roeu a roupa")],
+            [TranscriptSegment(0.1, 0.8, " roupa"), TranscriptSegment(1.5, 4.0, " a roupa do rei de Roma")],
+        ]
+
+        stitched = stitch_segments(chunks, results)
+
+        self.assertEqual(" ".join(s.text.strip() for s in stitched), "o rato roeu a roupa do rei de Roma")
+        self.assertGreaterEqual(stitched[1].start, stitched[0].end)
+
+    def test_dedupe_boundary_without_repeat(self):
+        """Test that unrelated text is left untouched"""
+        previous = [TranscriptSegment(0.0, 1.0, " bom dia")]
+        self.assertEqual(dedupe_boundary(previous, TranscriptSegment(1.0, 2.0, " boa noite")), " boa noite")
+
+    @patch('src.chunking.VAD_WINDOW_S', 10.0)
+    @patch('faster_whisper.vad.get_speech_timestamps')
+    def test_vad_scans_sources_in_windows(self, mock_vad):
+        """Test that a mapped source is scanned window by window and speech across a boundary is merged"""
+        mock_vad.side_effect = [
+            [{"start": 2 * SR, "end": 10 * SR}],
+            [{"start": 0, "end": 3 * SR}, {"start": 6 * SR, "end": 8 * SR}],
+        ]
+        vad = type("Vad", (), {"min_silence_duration_ms": 300})()
+
+        speech = speech_timestamps(AudioSource(np.zeros(20 * SR, dtype=np.int16)), vad)
+
+        self.assertEqual([len(call[0][0]) for call in mock_vad.call_args_list], [10 * SR, 10 * SR])
+        self.assertEqual(speech, [{"start": 2 * SR, "end": 13 * SR}, {"start": 16 * SR, "end": 18 * SR}])
+
+    @patch('src.chunking.find_chunks')
+    @patch('src.chunking.get_model')
+    def test_chunked_yields_in_order_as_chunks_finish(self, mock_get_model, mock_find_chunks):
+        """Test that the first chunk's segments are yielded while a later chunk is still decoding"""
+        release = threading.Event()
+
+        def transcribe(audio, **options):
+            if len(audio) == 5 * SR:
+                release.wait(timeout=5)
+            return iter([TranscriptSegment(0.5, 1.0, f" {len(audio) // SR}s")]), None
+
+        mock_get_model.return_value.transcribe.side_effect = transcribe
+        mock_find_chunks.return_value = [Chunk(0, 10 * SR), Chunk(10 * SR, 15 * SR)]
+
+        segments = transcribe_chunked(np.zeros(15 * SR, dtype=np.float32), "tiny", workers=2)
+
+        self.assertEqual((next(segments).start, release.is_set()), (0.5, False))
+        release.set()
+        self.assertEqual([(s.start, s.text) for s in segments], [(10.5, " 5s")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+from src.lazy import lazy_import
+
+
+class TestLazyImport(unittest.TestCase):
+    """Tests for deferred imports"""
+
+    def run_python(self, code):
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+
+    def test_module_executed_on_first_use(self):
+        """Test that the module body only runs on attribute access"""
+        output = self.run_python(
+            "from src.lazy import lazy_import; m = lazy_import('wave'); "
+            "before = type(m).__name__; m.Wave_read; print(before, type(m).__name__)"
+        )
+        self.assertEqual(output, "_LazyModule module")
+
+    def test_returns_loaded_module(self):
+        """Test that an already imported module is returned as is"""
+        self.assertIs(lazy_import("sys"), sys)
+
+    def test_missing_module(self):
+        """Test that a missing module fails at import time"""
+        with self.assertRaises(ImportError):
+            lazy_import("no_such_module_speech2text")
+
+    def make_module(self, name, source):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with open(os.path.join(directory, f"{name}.py"), "w") as f:
+            f.write(source)
+        sys.path.insert(0, directory)
+        self.addCleanup(sys.path.remove, directory)
+        self.addCleanup(sys.modules.pop, name, None)
+        return directory
+
+    def test_failed_import_raises_on_every_access(self):
+        """Test that a module failing on first use keeps raising its own error, not AttributeError"""
+        self.make_module("speech2text_broken", "raise OSError('PortAudio library not found')\n")
+        module = lazy_import("speech2text_broken")
+
+        for _ in range(2):
+            with self.assertRaisesRegex(OSError, "PortAudio"):
+                _ = module.query_devices
+        self.assertNotIn("speech2text_broken", sys.modules)
+
+    def test_concurrent_first_use_imports_once(self):
+        """Test that threads racing to use a lazy module run its body once"""
+        directory = self.make_module(
+            "speech2text_slow",
+            "import os, time\nopen(os.path.join(os.path.dirname(__file__), 'runs'), 'a').write('x')\n"
+            "time.sleep(0.1)\nvalue = 42\n",
+        )
+        module = lazy_import("speech2text_slow")
+        values = []
+
+        threads = [threading.Thread(target=lambda: values.append(module.value)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(values, [42] * 4)
+        with open(os.path.join(directory, "runs")) as f:
+            self.assertEqual(f.read(), "x")
+
+    def test_cli_modules_do_not_load_faster_whisper(self):
+        """Test that importing the processing modules does not load CTranslate2"""
+        output = self.run_python(
+            "import sys; import src.batch, src.live, src.audio_recorder, src.server; print('ctranslate2' in sys.modules)"
+        )
+        self.assertEqual(output, "False")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from src.live import LiveTranscriber, RingBuffer, UtteranceChunker
+from src.profiles import decoding_options
+
+
+class TestRingBuffer(unittest.TestCase):
+    """Tests for the live capture ring buffer"""
+
+    def test_read_returns_samples_in_order_across_wraparound(self):
+        """Test reads after the write position wraps around"""
+        ring = RingBuffer(8)
+        ring.write(np.arange(6, dtype=np.float32))
+        ring.read()
+        ring.write(np.arange(6, 11, dtype=np.float32))
+
+        np.testing.assert_array_equal(ring.read(), np.arange(6, 11, dtype=np.float32))
+        self.assertEqual(ring.dropped, 0)
+
+    def test_overrun_drops_oldest_samples(self):
+        """Test that unread samples beyond capacity are counted as dropped"""
+        ring = RingBuffer(4)
+        ring.write(np.arange(6, dtype=np.float32))
+
+        np.testing.assert_array_equal(ring.read(), np.arange(2, 6, dtype=np.float32))
+        self.assertEqual(ring.dropped, 2)
+
+
+class TestUtteranceChunker(unittest.TestCase):
+    """Tests for the energy-based utterance chunker"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.sample_rate = 16000
+        self.speech = 0.1 * np.sin(np.linspace(0, 2000 * np.pi, self.sample_rate)).astype(np.float32)
+        self.silence = np.zeros(self.sample_rate, dtype=np.float32)
+
+    def test_utterance_closed_by_silence(self):
+        """Test that a pause after speech emits a final chunk"""
+        chunker = UtteranceChunker(self.sample_rate, partial_interval_s=10.0)
+
+        chunks = chunker.feed(np.concatenate([self.silence, self.speech, self.silence]))
+
+        finals = [audio for audio, final in chunks if final]
+        self.assertEqual(len(finals), 1)
+        self.assertGreaterEqual(len(finals[0]), len(self.speech))
+        self.assertIsNone(chunker.flush())
+
+    def test_partials_emitted_during_long_speech(self):
+        """Test that partial chunks are emitted before the speaker pauses"""
+        chunker = UtteranceChunker(self.sample_rate, partial_interval_s=0.5)
+
+        chunks = chunker.feed(np.concatenate([self.speech, self.speech]))
+
+        self.assertTrue(chunks)
+        self.assertTrue(all(not final for _, final in chunks))
+        self.assertIsNotNone(chunker.flush())
+
+    def test_silence_only_emits_nothing(self):
+        """Test that silence never opens an utterance"""
+        chunker = UtteranceChunker(self.sample_rate)
+
+        self.assertEqual(chunker.feed(self.silence), [])
+        self.assertIsNone(chunker.flush())
+
+
+class TestLiveTranscriber(unittest.TestCase):
+    """Tests for live transcription decoding settings"""
+
+    @patch('src.live.get_model')
+    def test_profile_and_overrides_apply_to_final_passes(self, mock_get_model):
+        """Test that finals decode with the profile options and partials only swap in greedy decoding"""
+        whisper = MagicMock()
+        whisper.transcribe.return_value = ([MagicMock(text=" hello")], None)
+        mock_get_model.return_value = whisper
+        texts = []
+        live = LiveTranscriber(options=decoding_options("balanced", "en", {"beam_size": 3}),
+                               on_text=lambda text, final: texts.append((text, final)))
+        audio = np.zeros(1600, dtype=np.float32)
+        live._jobs.put((audio, True))
+        live._jobs.put(None)
+
+        live._transcribe_loop()
+
+        options = whisper.transcribe.call_args[1]
+        self.assertEqual((options["beam_size"], options["language"], options["vad_filter"]), (3, "en", False))
+        self.assertEqual(texts, [("hello", True)])
+        self.assertEqual((live.partial_options["beam_size"], live.partial_options["language"]), (1, "en"))
+
+
+if __name__ == '__main__':
+    unittest.main()
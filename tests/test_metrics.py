@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.metrics import Metrics
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests for stage timers and metric export"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.events = os.path.join(self.temp_dir, "events.jsonl")
+        self.prometheus = os.path.join(self.temp_dir, "speech2text.prom")
+        self.metrics = Metrics(self.events, self.prometheus)
+
+    def tearDown(self):
+        """Cleanup after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def read_events(self):
+        with open(self.events, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_observe_emits_event_with_rtf(self):
+        """Test that an observation becomes a JSON event with a real-time factor and totals"""
+        self.metrics.observe("transcribe", 2.0, audio_seconds=10.0, segments=3, model="tiny")
+
+        event = self.read_events()[0]
+        self.assertEqual((event["stage"], event["ok"], event["rtf"], event["model"]), ("transcribe", True, 0.2, "tiny"))
+        self.assertIn("peak_rss_mb", event)
+        snapshot = self.metrics.snapshot()
+        self.assertEqual((snapshot["audio_seconds"], snapshot["segments"]), (10.0, 3))
+
+    def test_timed_keeps_behavior_and_counts_failures(self):
+        """Test that decorated functions return and raise as before"""
+        @self.metrics.timed("convert")
+        def convert(ok):
+            return ok
+
+        @self.metrics.timed("verify")
+        def verify():
+            raise ValueError("bad file")
+
+        self.assertTrue(convert(True))
+        self.assertFalse(convert(False))
+        with self.assertRaises(ValueError):
+            verify()
+
+        stages = self.metrics.snapshot()["stages"]
+        self.assertEqual((stages["convert"]["runs"], stages["convert"]["failures"]), (2, 1))
+        self.assertEqual(stages["verify"]["failures"], 1)
+        self.assertEqual(self.read_events()[-1]["error"], "bad file")
+
+    def test_prometheus_text(self):
+        """Test that the text file uses the Prometheus exposition format"""
+        self.metrics.observe("model_load", 1.5)
+        self.metrics.observe("transcribe", 3.0, audio_seconds=30.0, segments=4)
+
+        with open(self.prometheus, encoding="utf-8") as f:
+            text = f.read()
+        self.assertIn("# TYPE speech2text_stage_seconds_total counter", text)
+        self.assertIn('speech2text_stage_seconds_total{stage="model_load"} 1.5', text)
+        self.assertIn("speech2text_audio_seconds_total 30", text)
+        self.assertIn("speech2text_last_real_time_factor 0.1", text)
+        self.assertEqual(os.listdir(self.temp_dir).count("speech2text.prom"), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.model_cache import ModelCache, estimate_model_memory, prewarm_model
+
+
+class TestModelCache(unittest.TestCase):
+    """Tests for the WhisperModel cache"""
+
+    @patch('src.model_cache.faster_whisper.WhisperModel')
+    def test_reuses_loaded_model(self, mock_model):
+        """Test that a second request hits the cache"""
+        mock_model.return_value = MagicMock()
+        cache = ModelCache(max_memory_mb=10000)
+
+        first = cache.get("tiny", "cpu", "int8")
+        second = cache.get("tiny", "cpu", "int8")
+
+        self.assertIs(first, second)
+        self.assertEqual(mock_model.call_count, 1)
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(cache.stats.misses, 1)
+
+    @patch('src.model_cache.model_store.warm')
+    @patch('src.model_cache.faster_whisper.WhisperModel')
+    def test_misses_warm_the_model_store(self, mock_model, mock_warm):
+        """Test that stored model files are read ahead on a miss, and not again on a hit"""
+        mock_model.return_value = MagicMock()
+        cache = ModelCache(max_memory_mb=10000)
+
+        cache.get("tiny", "cpu", "int8")
+        cache.get("tiny", "cpu", "int8")
+
+        mock_warm.assert_called_once_with("tiny")
+
+    @patch('src.model_cache.faster_whisper.WhisperModel')
+    def test_key_includes_cpu_threads(self, mock_model):
+        """Test that different thread counts load separate models"""
+        mock_model.side_effect = lambda *a, **kw: MagicMock()
+        cache = ModelCache(max_memory_mb=10000)
+
+        cache.get("tiny", "cpu", "int8", cpu_threads=2)
+        cache.get("tiny", "cpu", "int8", cpu_threads=4)
+
+        self.assertEqual(mock_model.call_count, 2)
+        self.assertEqual(len(cache), 2)
+
+    @patch('src.model_cache.faster_whisper.WhisperModel')
+    def test_evicts_least_recently_used(self, mock_model):
+        """Test LRU eviction when the memory budget is exceeded"""
+        mock_model.side_effect = lambda *a, **kw: MagicMock()
+        budget = estimate_model_memory("small", "int8") * 2
+        cache = ModelCache(max_memory_mb=budget)
+
+        cache.get("small", "cpu", "int8", cpu_threads=1)
+        cache.get("small", "cpu", "int8", cpu_threads=2)
+        cache.get("small", "cpu", "int8", cpu_threads=1)  # refresh first entry
+        cache.get("small", "cpu", "int8", cpu_threads=3)
+
+        self.assertIn(("small", "cpu", "int8", 1, 1), cache)
+        self.assertNotIn(("small", "cpu", "int8", 2, 1), cache)
+        self.assertEqual(cache.stats.evictions, 1)
+
+    @patch('src.model_cache.faster_whisper.WhisperModel')
+    def test_loads_do_not_block_hits(self, mock_model):
+        """Test that a slow load neither blocks hits on other models nor runs twice for one model"""
+        release = threading.Event()
+
+        def load(path, **kwargs):
+            if kwargs["cpu_threads"] == 2:
+                release.wait(timeout=5)
+            return MagicMock()
+
+        mock_model.side_effect = load
+        cache = ModelCache(max_memory_mb=10000)
+        warm = cache.get("tiny", "cpu", "int8", cpu_threads=1)
+        results = []
+        loaders = [threading.Thread(target=lambda: results.append(cache.get("tiny", "cpu", "int8", cpu_threads=2)))
+                   for _ in range(2)]
+        for thread in loaders:
+            thread.start()
+
+        self.assertIs(cache.get("tiny", "cpu", "int8", cpu_threads=1), warm)  # returns while the load is running
+        release.set()
+        for thread in loaders:
+            thread.join(timeout=5)
+
+        self.assertEqual(mock_model.call_count, 2)
+        self.assertIs(results[0], results[1])
+
+    @patch('src.model_cache.get_model')
+    def test_prewarm_loads_in_background(self, mock_get_model):
+        """Test that prewarming loads the model on a daemon thread"""
+        thread = prewarm_model("small", "cpu", "int8", cpu_threads=4)
+        thread.join(timeout=5)
+
+        self.assertTrue(thread.daemon)
+        mock_get_model.assert_called_once_with("small", "cpu", "int8", 4, 1)
+
+    @patch('src.model_cache.get_model', side_effect=RuntimeError("no network"))
+    def test_prewarm_failure_is_not_raised(self, mock_get_model):
+        """Test that a failed prewarm only logs a warning"""
+        thread = prewarm_model("small")
+        thread.join(timeout=5)
+
+        self.assertFalse(thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.model_cache import ModelCache
+from src.model_store import ModelStore
+
+
+def fake_download(name, output_dir):
+    for file_name, data in (("model.bin", b"weights" * 100), ("config.json", b"{}"), ("tokenizer.json", b"{}")):
+        with open(os.path.join(output_dir, file_name), "wb") as f:
+            f.write(data)
+    os.makedirs(os.path.join(output_dir, ".cache", "huggingface"))
+    return output_dir
+
+
+class TestModelStore(unittest.TestCase):
+    """Tests for the local model store"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ModelStore(os.path.join(self.temp_dir, "models"))
+        patcher = patch('src.model_store.faster_whisper.download_model', side_effect=fake_download)
+        self.mock_download = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Cleanup after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_fetch_records_checksums(self):
+        """Test that a fetched model lands in the store with a manifest of its files"""
+        stored = self.store.fetch("tiny")
+
+        self.assertEqual(sorted(stored.files), ["config.json", "model.bin", "tokenizer.json"])
+        self.assertEqual(stored.files["model.bin"]["size"], 700)
+        self.assertEqual([model.name for model in self.store.models()], ["tiny"])
+        self.assertEqual(self.store.verify("tiny"), [])
+        self.assertEqual(os.listdir(self.store.root), ["tiny"])  # no staging directory left
+
+    def test_verify_detects_damage(self):
+        """Test that changed or missing files are reported"""
+        self.store.fetch("tiny")
+        with open(os.path.join(self.store.path("tiny"), "model.bin"), "r+b") as f:
+            f.write(b"W")
+        os.remove(os.path.join(self.store.path("tiny"), "tokenizer.json"))
+
+        problems = self.store.verify("tiny")
+
+        self.assertEqual(problems, ["model.bin does not match its checksum", "tokenizer.json is missing"])
+        with self.assertRaises(RuntimeError):
+            self.store.resolve("tiny")
+
+    def test_resolve(self):
+        """Test that stored models resolve to their directory and others fall back unless offline"""
+        self.store.fetch("Systran/faster-whisper-small")
+
+        self.assertEqual(self.store.resolve("Systran/faster-whisper-small"),
+                         os.path.join(self.store.root, "Systran--faster-whisper-small"))
+        self.assertEqual(self.store.resolve("base"), "base")
+        with patch.dict(os.environ, {"SPEECH2TEXT_OFFLINE": "1"}):
+            with self.assertRaises(FileNotFoundError):
+                self.store.resolve("base")
+
+    def test_warm_reads_every_file(self):
+        """Test that warming reads all stored bytes"""
+        stored = self.store.fetch("tiny")
+
+        self.assertEqual(self.store.warm("tiny"), stored.size_bytes)
+        self.assertEqual(self.store.warm("base"), 0)
+
+    def test_failed_fetch_leaves_nothing(self):
+        """Test that an incomplete download is not added to the store"""
+        self.mock_download.side_effect = lambda name, output_dir: output_dir
+
+        with self.assertRaises(RuntimeError):
+            self.store.fetch("tiny")
+        self.assertEqual(os.listdir(self.store.root), [])
+
+    @patch('src.model_cache.faster_whisper.WhisperModel')
+    def test_model_cache_loads_from_store(self, mock_model):
+        """Test that the model cache loads stored models from disk without hub lookups"""
+        mock_model.return_value = MagicMock()
+        self.store.fetch("tiny")
+
+        with patch('src.model_cache.model_store', self.store):
+            ModelCache(max_memory_mb=10000).get("tiny", "cpu", "int8")
+
+        self.assertEqual(mock_model.call_args[0][0], self.store.path("tiny"))
+        self.assertTrue(mock_model.call_args[1]["local_files_only"])
+
+
+if __name__ == '__main__':
+    unittest.main()
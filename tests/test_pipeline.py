@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from src.pipeline import PipelinedTranscriber, quietest_cut
+from src.transcriber import TranscriptSegment
+
+SAMPLE_RATE = 16000
+
+
+def tone(seconds):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+class TestPipeline(unittest.TestCase):
+    """Tests for pipelined record + transcribe"""
+
+    def setUp(self):
+        """Mock a model that returns one segment per window"""
+        self.windows = []
+
+        def transcribe(audio, **kwargs):
+            self.windows.append(len(audio))
+            duration = len(audio) / SAMPLE_RATE
+            segment = MagicMock(start=0.0, end=duration, text=f" window {len(self.windows)}",
+                                avg_logprob=0.0, no_speech_prob=0.0, compression_ratio=1.0)
+            return [segment], None
+
+        self.whisper = MagicMock()
+        self.whisper.transcribe.side_effect = transcribe
+        patcher = patch('src.pipeline.get_model', return_value=self.whisper)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_quietest_cut(self):
+        """Test that the cut lands in the silent frame"""
+        audio = tone(2.0)
+        audio[16000:16480] = 0.0  # one silent 30ms frame at 1.0s
+
+        cut = quietest_cut(audio, 11200, 32000, 480)
+
+        self.assertEqual(cut, 16240)
+
+    def test_windows_cut_at_silence_and_shifted(self):
+        """Test that windows are cut at pauses and segments use recording time"""
+        recording = np.concatenate([tone(9.0), np.zeros(4800, dtype=np.float32), tone(5.0)])
+        pipeline = PipelinedTranscriber(model="tiny", window_s=10.0, search_s=3.0)
+        pipeline.start()
+
+        for start in range(0, len(recording), 8000):
+            pipeline.feed(recording[start:start + 8000].reshape(-1, 1))
+        segments = pipeline.finish()
+
+        self.assertEqual(len(self.windows), 2)
+        self.assertEqual(sum(self.windows), len(recording))
+        self.assertGreater(self.windows[0], 9 * SAMPLE_RATE)
+        self.assertLess(self.windows[0], 9.3 * SAMPLE_RATE)
+        self.assertEqual([s.text for s in segments], [" window 1", " window 2"])
+        self.assertAlmostEqual(segments[1].start, self.windows[0] / SAMPLE_RATE)
+
+    def test_transcription_error_raised_on_finish(self):
+        """Test that a decoding error is reported when the pipeline finishes"""
+        self.whisper.transcribe.side_effect = RuntimeError("out of memory")
+        pipeline = PipelinedTranscriber(model="tiny", window_s=1.0, search_s=0.5)
+        pipeline.start()
+        pipeline.feed(tone(2.5))
+
+        with self.assertRaises(RuntimeError):
+            pipeline.finish()
+
+    def test_preprocessed_windows_keep_recording_time(self):
+        """Test that silence is trimmed from each window and segments still use recording time"""
+        recording = np.concatenate([np.zeros(3 * SAMPLE_RATE, dtype=np.float32), tone(2.0)])
+        pipeline = PipelinedTranscriber(model="tiny", window_s=10.0, preprocess=True)
+        pipeline.start()
+
+        pipeline.feed(recording)
+        segments = pipeline.finish()
+
+        self.assertLess(self.windows[0], 2.5 * SAMPLE_RATE)
+        self.assertAlmostEqual(segments[0].start, 2.8, delta=0.05)
+        self.assertAlmostEqual(segments[0].end, 5.0, delta=0.05)
+
+    def test_cascade_windows(self):
+        """Test that a draft model sends each window through the cascade"""
+        with patch('src.pipeline.transcribe_cascade', return_value=iter([TranscriptSegment(0.5, 1.0, " draft")])) as cascade:
+            pipeline = PipelinedTranscriber(model="large-v3", window_s=10.0, draft_model="tiny")
+            pipeline.start()
+            pipeline.feed(tone(2.0))
+            segments = pipeline.finish()
+
+        self.assertEqual([s.text for s in segments], [" draft"])
+        self.assertEqual(cascade.call_args.args[1:3], ("large-v3", "tiny"))
+        self.whisper.transcribe.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+
+import numpy as np
+
+from src.preprocess import TimeMap, preprocess_audio, silence_threshold, spectral_gate, speech_ranges
+from src.transcriber import TranscriptSegment
+
+SAMPLE_RATE = 16000
+
+
+def tone(seconds, amplitude=0.1):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 300 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+class TestPreprocess(unittest.TestCase):
+    """Tests for the audio preprocessing stage"""
+
+    def test_speech_ranges(self):
+        """Test that edges are trimmed and only long gaps are shortened"""
+        voiced = np.array([0, 0, 0, 1, 1, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0], dtype=bool)
+
+        ranges = speech_ranges(voiced, frame=10, total=150, pad_frames=1, min_gap_frames=3)
+
+        np.testing.assert_array_equal(ranges, [[20, 80], [110, 140]])
+
+    def test_removes_silence_and_reports_it(self):
+        """Test trimming of leading, trailing and long interior silence"""
+        audio = np.concatenate([silence(3), tone(2), silence(0.5), tone(1), silence(5), tone(2), silence(4)])
+
+        result = preprocess_audio(audio, pad_s=0.2, min_gap_s=1.0)
+
+        self.assertAlmostEqual(result.original_seconds, 17.5)
+        self.assertGreater(result.removed_seconds, 11.0)
+        self.assertEqual(len(result.time_map.kept), 2)  # the 0.5s pause is kept
+
+    def test_time_map_round_trip(self):
+        """Test that processed times map back to the original recording"""
+        time_map = TimeMap(np.array([[16000, 48000], [160000, 192000]]), SAMPLE_RATE)
+
+        self.assertAlmostEqual(time_map.to_original(0.5), 1.5)
+        self.assertAlmostEqual(time_map.to_original(2.5), 10.5)
+        self.assertAlmostEqual(time_map.to_original(2.0), 10.0)
+        self.assertAlmostEqual(time_map.to_original(2.0, end=True), 3.0)
+
+        segment = time_map.remap(TranscriptSegment(1.0, 2.0, "olá"))
+        self.assertEqual((segment.start, segment.end), (2.0, 3.0))
+
+    def test_normalizes_loudness(self):
+        """Test that quiet speech is brought up to the target level without clipping"""
+        result = preprocess_audio(tone(2, amplitude=0.01), threshold_db=-60, target_db=-20)
+
+        rms_db = 20 * np.log10(np.sqrt(np.mean(result.audio ** 2)))
+        self.assertAlmostEqual(rms_db, -20, delta=0.5)
+        self.assertLess(np.abs(result.audio).max(), 1.0)
+
+    def test_keeps_quiet_speech(self):
+        """Test that a quiet capture is kept and only its own silence is trimmed"""
+        rng = np.random.default_rng(0)
+        audio = np.concatenate([silence(3), tone(5, amplitude=0.004), silence(3)])
+        audio += 0.0003 * rng.standard_normal(len(audio)).astype(np.float32)  # noise floor around -70 dBFS
+
+        result = preprocess_audio(audio)
+
+        self.assertEqual(len(result.time_map.kept), 1)
+        self.assertAlmostEqual(len(result.audio) / SAMPLE_RATE, 5.4, delta=0.1)
+        rms_db = 20 * np.log10(np.sqrt(np.mean(result.audio ** 2)))
+        self.assertGreater(rms_db, -22)  # -51 dBFS brought up by the 30 dB gain cap
+
+    def test_keeps_continuous_quiet_speech(self):
+        """Test that a quiet recording without pauses is not mistaken for silence"""
+        result = preprocess_audio(tone(5, amplitude=0.004))
+
+        self.assertAlmostEqual(result.removed_seconds, 0.0, places=2)
+
+    def test_silence_threshold_follows_noise_floor(self):
+        """Test that the threshold sits a margin above the quiet frames"""
+        levels = np.concatenate([np.full(50, -70.0), np.full(50, -50.0)])
+
+        self.assertAlmostEqual(silence_threshold(levels, margin_db=15), -55.0)
+        self.assertAlmostEqual(silence_threshold(np.full(100, -50.0), floor_db=-80), -80.0)
+
+    def test_all_silence(self):
+        """Test that silent audio yields nothing to transcribe"""
+        result = preprocess_audio(silence(3))
+
+        self.assertEqual(len(result.audio), 0)
+        self.assertAlmostEqual(result.removed_seconds, 3.0)
+
+    def test_spectral_gate_reduces_noise(self):
+        """Test that stationary noise is attenuated while the tone is kept"""
+        rng = np.random.default_rng(0)
+        clean = np.concatenate([silence(3), tone(2)])
+        noisy = clean + 0.01 * rng.standard_normal(len(clean)).astype(np.float32)
+
+        denoised = spectral_gate(noisy)
+
+        self.assertEqual(len(denoised), len(noisy))
+        noise_before = np.sqrt(np.mean(noisy[:SAMPLE_RATE * 2] ** 2))
+        noise_after = np.sqrt(np.mean(denoised[:SAMPLE_RATE * 2] ** 2))
+        self.assertLess(noise_after, noise_before / 2)
+        middle = slice(SAMPLE_RATE * 3 + 2000, -2000)
+        self.assertLess(np.sqrt(np.mean((denoised[middle] - clean[middle]) ** 2)), 0.006)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+from src.batch import BatchItemArgs
+from src.processor import process_input
+from src.result_cache import ResultCache
+from src.transcriber import TranscriptSegment
+from src.transcript_index import TranscriptIndex
+
+
+class TestProcessor(unittest.TestCase):
+    """Tests for the processing workflow"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.input = os.path.join(self.temp_dir, "clip.wav")
+        self.output = os.path.join(self.temp_dir, "clip.txt")
+        sf.write(self.input, np.zeros(1600, dtype=np.int16), 16000)
+        cache_dir = os.path.join(self.temp_dir, "cache")
+        patcher = patch('src.processor.ResultCache', lambda: ResultCache(cache_dir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.index_path = os.path.join(self.temp_dir, "transcripts.db")
+        patcher = patch.dict(os.environ, {"SPEECH2TEXT_INDEX": self.index_path})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Cleanup after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def make_args(self, no_cache=False, preprocess=False):
+        return BatchItemArgs(self.input, self.output, "tiny", "cpu", "int8", False, no_cache=no_cache,
+                             preprocess=preprocess)
+
+    def test_nonexistent_input(self):
+        """Test that a missing input raises FileNotFoundError"""
+        args = self.make_args()
+        args.input = os.path.join(self.temp_dir, "missing.wav")
+
+        with self.assertRaises(FileNotFoundError):
+            process_input(args)
+
+    @patch('src.processor.iter_segments')
+    def test_second_run_uses_cache(self, mock_transcribe):
+        """Test that identical audio and parameters are not transcribed twice"""
+        mock_transcribe.return_value = [TranscriptSegment(0.0, 0.1, " olá ")]
+
+        first = process_input(self.make_args())
+        second = process_input(self.make_args())
+
+        self.assertEqual(mock_transcribe.call_count, 1)
+        self.assertEqual([s.text for s in second], [s.text for s in first])
+        with open(self.output, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "olá")
+
+    @patch('src.processor.iter_segments')
+    def test_transcript_is_indexed(self, mock_transcribe):
+        """Test that finished transcripts are searchable with their timestamps"""
+        mock_transcribe.return_value = [TranscriptSegment(0.0, 0.05, " bom dia "), TranscriptSegment(0.05, 0.1, " olá ")]
+
+        process_input(self.make_args())
+
+        index = TranscriptIndex(self.index_path)
+        self.addCleanup(index.close)
+        hits = index.search("olá")
+        self.assertEqual([(hit.source, hit.start_ms, hit.end_ms) for hit in hits], [(self.input, 50, 100)])
+        self.assertEqual(hits[0].model, "tiny")
+        self.assertEqual(hits[0].output, self.output)
+
+    @patch('src.processor.metrics.observe')
+    @patch('src.processor.iter_segments')
+    def test_decoding_is_timed(self, mock_transcribe, mock_observe):
+        """Test that decoding the input is reported as its own stage"""
+        mock_transcribe.return_value = [TranscriptSegment(0.0, 0.1, " olá ")]
+
+        process_input(self.make_args())
+
+        stages = [call.args[0] for call in mock_observe.call_args_list]
+        self.assertIn("decode", stages)
+        self.assertEqual(mock_observe.call_args_list[stages.index("decode")].kwargs["mapped"], True)
+
+    @patch('src.processor.iter_segments')
+    def test_model_workers_reach_the_model_lookup(self, mock_transcribe):
+        """Test that jobs sharing a model with replicas look it up with the same settings"""
+        mock_transcribe.return_value = [TranscriptSegment(0.0, 0.1, " olá ")]
+        args = self.make_args(no_cache=True)
+        args.cpu_threads, args.model_workers = 4, 2
+
+        process_input(args)
+
+        call = mock_transcribe.call_args[0]
+        self.assertEqual((call[4], call[6]), (4, 2))
+
+    @patch('src.processor.iter_segments')
+    def test_no_cache_always_transcribes(self, mock_transcribe):
+        """Test that --no-cache bypasses the cache"""
+        mock_transcribe.return_value = [TranscriptSegment(0.0, 0.1, "olá")]
+
+        process_input(self.make_args(no_cache=True))
+        process_input(self.make_args(no_cache=True))
+
+        self.assertEqual(mock_transcribe.call_count, 2)
+
+    @patch('src.processor.iter_segments')
+    def test_preprocess_maps_timestamps_back(self, mock_transcribe):
+        """Test that silence is removed before decoding and segments keep original times"""
+        t = np.arange(16000) / 16000
+        tone = 0.2 * np.sin(2 * np.pi * 300 * t)
+        sf.write(self.input, np.concatenate([np.zeros(16000 * 5), tone]), 16000)
+        mock_transcribe.return_value = [TranscriptSegment(0.25, 1.0, " olá")]
+
+        segments = process_input(self.make_args(no_cache=True, preprocess=True))
+
+        decoded = mock_transcribe.call_args[0][0]
+        self.assertLess(len(decoded), 16000 * 1.5)
+        self.assertAlmostEqual(segments[0].start, 5.05, places=2)
+
+    @patch('src.processor.iter_segments')
+    def test_interrupted_run_resumes_from_checkpoint(self, mock_transcribe):
+        """Test that a re-run skips audio decoded before a crash and keeps those segments"""
+        sf.write(self.input, np.zeros(16000 * 3, dtype=np.int16), 16000)
+
+        def crash(*args, **kwargs):
+            yield TranscriptSegment(0.0, 1.0, " primeira")
+            raise RuntimeError("preempted")
+
+        mock_transcribe.side_effect = crash
+        with self.assertRaises(RuntimeError):
+            process_input(self.make_args(no_cache=True))
+        self.assertTrue(os.path.exists(self.output + ".ckpt"))
+
+        mock_transcribe.side_effect = None
+        mock_transcribe.return_value = [TranscriptSegment(0.0, 1.5, " segunda")]
+        segments = process_input(self.make_args(no_cache=True))
+
+        self.assertEqual(len(mock_transcribe.call_args[0][0]), 16000 * 2)
+        self.assertEqual([(s.start, s.end, s.text) for s in segments],
+                         [(0.0, 1.0, " primeira"), (1.0, 2.5, " segunda")])
+        self.assertFalse(os.path.exists(self.output + ".ckpt"))
+
+    @patch('src.processor.transcribe_cascade')
+    def test_cascade_mode_uses_draft_model(self, mock_cascade):
+        """Test that a draft model switches decoding to the cascade with fast draft options"""
+        mock_cascade.return_value = [TranscriptSegment(0.0, 0.1, " olá")]
+        args = self.make_args(no_cache=True)
+        args.draft_model = "small"
+
+        process_input(args)
+
+        call = mock_cascade.call_args
+        self.assertEqual(call[0][1:3], ("tiny", "small"))
+        self.assertEqual(call[1]["draft_options"]["beam_size"], 1)
+        self.assertEqual(call[1]["options"]["beam_size"], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
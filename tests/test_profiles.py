@@ -0,0 +1,60 @@
+import unittest
+
+from src.profiles import PROFILES, decoding_options, get_profile, parse_overrides
+from src.transcriber import TRANSCRIBE_OPTIONS
+
+
+class TestProfiles(unittest.TestCase):
+    """Tests for decoding profiles and overrides"""
+
+    def test_accurate_matches_original_options(self):
+        """Test that the default profile keeps the original decoding settings"""
+        self.assertEqual(decoding_options(), TRANSCRIBE_OPTIONS)
+        self.assertEqual(get_profile(None).model, "large-v3")
+
+    def test_fast_is_greedy_without_fallback(self):
+        """Test that the fast profile decodes greedily on a smaller model"""
+        options = decoding_options("fast")
+
+        self.assertEqual(options["beam_size"], 1)
+        self.assertEqual(options["temperature"], 0.0)
+        self.assertFalse(options["condition_on_previous_text"])
+        self.assertEqual(PROFILES["fast"].model, "small")
+
+    def test_language_auto_detects(self):
+        """Test that auto (or None) leaves the language to detection"""
+        self.assertIsNone(decoding_options(language="auto")["language"])
+        self.assertIsNone(decoding_options(language=None)["language"])
+        self.assertEqual(decoding_options(language="en")["language"], "en")
+
+    def test_overrides_replace_profile_values(self):
+        """Test that overrides win over the profile and do not modify it"""
+        options = decoding_options("fast", overrides={"beam_size": 3, "initial_prompt": "Reunião"})
+
+        self.assertEqual(options["beam_size"], 3)
+        self.assertEqual(options["initial_prompt"], "Reunião")
+        self.assertEqual(PROFILES["fast"].options["beam_size"], 1)
+
+    def test_unknown_profile_and_option(self):
+        """Test that typos are reported instead of silently ignored"""
+        with self.assertRaises(ValueError):
+            decoding_options("turbo")
+        with self.assertRaises(ValueError):
+            decoding_options(overrides={"beam": 3})
+
+    def test_parse_overrides(self):
+        """Test KEY=VALUE parsing with JSON values and plain strings"""
+        overrides = parse_overrides(["beam_size=3", "vad_filter=false", "temperature=[0.0, 0.2]", "initial_prompt=a=b"])
+
+        self.assertEqual(overrides, {
+            "beam_size": 3,
+            "vad_filter": False,
+            "temperature": [0.0, 0.2],
+            "initial_prompt": "a=b",
+        })
+        with self.assertRaises(ValueError):
+            parse_overrides(["beam_size"])
+
+
+if __name__ == '__main__':
+    unittest.main()
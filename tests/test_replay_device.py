@@ -0,0 +1,144 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+from src.audio_recorder import CaptureStats, open_input_stream, record_stream, set_input_stream
+from src.replay_device import ReplayInputStream, replay_stream_factory
+
+SR = 16000
+
+
+class TestReplayDevice(unittest.TestCase):
+    """Tests for the simulated input device and capture statistics"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.wav = os.path.join(self.temp_dir, "speech.wav")
+        rng = np.random.default_rng(0)
+        self.pcm = rng.integers(-20000, 20000, SR * 2, dtype=np.int16)
+        sf.write(self.wav, self.pcm, SR, subtype="PCM_16")
+        self.addCleanup(set_input_stream, None)
+
+    def tearDown(self):
+        """Cleanup after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_record_stream_from_replay(self):
+        """Test that recording a replayed file reproduces it and ends at the end of the file"""
+        set_input_stream(replay_stream_factory(self.wav, speed=0))
+        output = os.path.join(self.temp_dir, "out.wav")
+        stats = CaptureStats()
+
+        result = record_stream(output, duration=None, block_duration=0.25, stats=stats)
+
+        self.assertTrue(result)
+        np.testing.assert_array_equal(sf.read(output, dtype="int16")[0], self.pcm)
+        self.assertEqual(stats.callbacks, 8)
+        self.assertEqual(stats.frames, len(self.pcm))
+        self.assertFalse(stats.dropouts)
+        self.assertGreaterEqual(stats.max_queue_blocks, 1)
+
+    def test_accelerated_replay(self):
+        """Test that speed scales the delivery rate"""
+        blocks = []
+        stream = ReplayInputStream(self.wav, SR, blocksize=SR // 10, speed=10,
+                                   callback=lambda indata, frames, time_info, status: blocks.append(frames))
+
+        start = time.monotonic()
+        with stream:
+            while stream.active:
+                time.sleep(0.01)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(sum(blocks), len(self.pcm))
+        self.assertGreater(elapsed, 0.15)
+        self.assertLess(elapsed, 1.5)
+
+    @patch('src.replay_device.decode_audio')
+    def test_replay_reads_blocks_from_the_file(self, mock_decode):
+        """Test that a WAV at the stream rate is read block by block, duplicated on every channel"""
+        blocks = []
+        stream = ReplayInputStream(self.wav, SR, channels=2, blocksize=SR // 4, speed=0,
+                                   callback=lambda indata, frames, time_info, status: blocks.append(indata.copy()))
+
+        with stream:
+            while stream.active:
+                time.sleep(0.01)
+
+        mock_decode.assert_not_called()
+        audio = np.concatenate(blocks)
+        self.assertEqual(audio.shape, (len(self.pcm), 2))
+        np.testing.assert_array_equal(audio[:, 0], audio[:, 1])
+        np.testing.assert_allclose(audio[:, 0], self.pcm / 32768, atol=1e-6)
+
+    def test_replay_resamples_other_rates(self):
+        """Test that a file at another rate is decoded and resampled to the stream rate"""
+        frames = []
+        stream = ReplayInputStream(self.wav, 8000, blocksize=800, speed=0,
+                                   callback=lambda indata, count, time_info, status: frames.append(count))
+
+        with stream:
+            while stream.active:
+                time.sleep(0.01)
+
+        self.assertEqual(sum(frames), len(self.pcm) // 2)
+
+    def test_slow_callback_overflows(self):
+        """Test that a callback falling behind loses blocks and is told so, like a real device"""
+        stats = CaptureStats()
+
+        def callback(indata, frames, time_info, status):
+            stats.on_callback(frames, time_info, status)
+            if stats.callbacks == 2:
+                time.sleep(0.1)
+
+        stream = ReplayInputStream(self.wav, SR, blocksize=SR // 10, speed=5, callback=callback)
+        with stream:
+            while stream.active:
+                time.sleep(0.01)
+
+        self.assertGreaterEqual(stats.overflows, 1)
+        self.assertGreater(stats.dropped_frames, 0)
+        self.assertEqual(stats.frames + stats.dropped_frames, len(self.pcm))
+        self.assertTrue(stats.dropouts)
+
+    def test_capture_stats_timing(self):
+        """Test jitter, callback gaps and latency from callback timestamps"""
+        stats = CaptureStats(sample_rate=SR)
+        for now in (0.0, 0.1, 0.2, 0.4):
+            stats.on_callback(1600, SimpleNamespace(inputBufferAdcTime=now + 1, currentTime=now + 1.01), None, now=now)
+
+        self.assertAlmostEqual(stats.max_interval_ms, 200.0)
+        self.assertAlmostEqual(stats.jitter_ms, np.std([100, 100, 200], ddof=1), places=6)
+        self.assertAlmostEqual(stats.max_latency_ms, 10.0, places=6)
+        self.assertEqual(stats.dropped_frames, 1600)  # the block between 0.2s and 0.4s never arrived
+
+    def test_capture_stats_ignore_timestamp_jitter(self):
+        """Test that ADC timestamps a little late are not counted as lost audio"""
+        stats = CaptureStats(sample_rate=SR)
+        for adc in (0.0, 0.1003, 0.2001, 0.3004):
+            stats.on_callback(1600, SimpleNamespace(inputBufferAdcTime=adc, currentTime=adc + 0.01), None, now=adc)
+
+        self.assertEqual(stats.dropped_frames, 0)
+
+    def test_open_input_stream_from_environment(self):
+        """Test that SPEECH2TEXT_REPLAY_INPUT swaps in the replay device"""
+        with patch.dict(os.environ, {"SPEECH2TEXT_REPLAY_INPUT": self.wav, "SPEECH2TEXT_REPLAY_SPEED": "4"}):
+            stream = open_input_stream(samplerate=SR, channels=1, device=None, dtype="float32",
+                                       blocksize=SR // 10, callback=None)
+
+        self.assertIsInstance(stream, ReplayInputStream)
+        self.assertEqual(stream.speed, 4.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
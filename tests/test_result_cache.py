@@ -0,0 +1,117 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+from src.result_cache import ResultCache, hash_audio
+from src.transcriber import TranscriptSegment
+
+
+class TestResultCache(unittest.TestCase):
+    """Tests for the content-addressed transcription cache"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.audio = (3000 * np.random.default_rng(0).standard_normal(16000)).astype(np.int16)
+
+    def tearDown(self):
+        """Cleanup after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_hash_ignores_container(self):
+        """Test that the same audio in WAV and FLAC hashes identically"""
+        wav = os.path.join(self.temp_dir, "a.wav")
+        flac = os.path.join(self.temp_dir, "a.flac")
+        sf.write(wav, self.audio, 16000)
+        sf.write(flac, self.audio, 16000)
+
+        self.assertEqual(hash_audio(wav), hash_audio(flac))
+
+    def test_hash_changes_with_content(self):
+        """Test that different audio produces a different hash"""
+        first = os.path.join(self.temp_dir, "a.wav")
+        second = os.path.join(self.temp_dir, "b.wav")
+        sf.write(first, self.audio, 16000)
+        sf.write(second, self.audio // 2, 16000)
+
+        self.assertNotEqual(hash_audio(first), hash_audio(second))
+
+    def test_key_depends_on_params(self):
+        """Test that transcription parameters are part of the key"""
+        self.assertNotEqual(
+            ResultCache.make_key("abc", {"model": "tiny"}),
+            ResultCache.make_key("abc", {"model": "small"}),
+        )
+
+    def test_put_and_get(self):
+        """Test a cache round trip"""
+        cache = ResultCache(os.path.join(self.temp_dir, "cache"))
+        segments = [TranscriptSegment(0.0, 1.5, " Olá"), TranscriptSegment(1.5, 3.0, " mundo")]
+
+        self.assertIsNone(cache.get("ff00"))
+        cache.put("ff00", segments)
+
+        self.assertEqual(cache.get("ff00"), segments)
+
+    def test_evicts_least_recently_used(self):
+        """Test size-bounded eviction of the oldest entries"""
+        cache = ResultCache(os.path.join(self.temp_dir, "cache"), max_mb=1)
+        segments = [TranscriptSegment(0.0, 1.0, "x" * 400_000)]
+
+        cache.put("aa01", segments)
+        time.sleep(0.01)
+        cache.put("bb02", segments)
+        time.sleep(0.01)
+        cache.get("aa01")
+        time.sleep(0.01)
+        cache.put("cc03", segments)
+
+        self.assertIsNotNone(cache.get("aa01"))
+        self.assertIsNone(cache.get("bb02"))
+        self.assertIsNotNone(cache.get("cc03"))
+
+    def test_concurrent_puts_of_same_key(self):
+        """Test that writers storing the same key at once do not trip over each other's temporary file"""
+        cache = ResultCache(os.path.join(self.temp_dir, "cache"))
+        segments = [TranscriptSegment(0.0, 1.0, "x" * 10_000)]
+        errors = []
+
+        def write():
+            try:
+                for _ in range(20):
+                    cache.put("dd04", segments)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(cache.get("dd04"), segments)
+        self.assertEqual(os.listdir(os.path.join(self.temp_dir, "cache", "dd")), ["dd04.json"])
+
+    def test_evict_skips_entries_removed_concurrently(self):
+        """Test that entries deleted by another process during eviction are not an error"""
+        cache = ResultCache(os.path.join(self.temp_dir, "cache"))
+        cache.put("ee05", [TranscriptSegment(0.0, 1.0, " a")])
+        cache.max_bytes = 0
+        walk = [(os.path.join(self.temp_dir, "cache", "ee"), [], ["ee05.json", "gone.json"])]
+
+        with patch('src.result_cache.os.walk', return_value=walk):
+            with patch('src.result_cache.os.remove', side_effect=FileNotFoundError):
+                self.assertEqual(cache.evict(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import Future
+from unittest.mock import patch
+
+import numpy as np
+import soundfile as sf
+
+from src.batch import BatchItemArgs
+from src.scheduler import TranscriptionScheduler, audio_duration, partition_threads
+
+
+class InlinePool:
+    """ProcessPoolExecutor stand-in that runs each job in this process as it is submitted"""
+
+    instances = []
+
+    def __init__(self, max_workers, mp_context, initializer, initargs):
+        self.initargs = initargs
+        self.submitted = []
+        InlinePool.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, args):
+        self.submitted.append(args.input)
+        future = Future()
+        future.set_result(fn(args))
+        return future
+
+
+class TestScheduler(unittest.TestCase):
+    """Tests for the multi-process transcription scheduler"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Cleanup after each test"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_partition_threads(self):
+        """Test that CPU threads are split evenly between workers"""
+        self.assertEqual(partition_threads(4, 32), 8)
+        self.assertEqual(partition_threads(3, 32), 10)
+        self.assertEqual(partition_threads(64, 32), 1)
+
+    def test_audio_duration_wav(self):
+        """Test duration lookup for a WAV file"""
+        path = os.path.join(self.temp_dir, "clip.wav")
+        sf.write(path, np.zeros(16000 * 2, dtype=np.float32), 16000)
+
+        self.assertAlmostEqual(audio_duration(path), 2.0)
+
+    def make_jobs(self, seconds):
+        jobs = []
+        for i, duration in enumerate(seconds):
+            path = os.path.join(self.temp_dir, f"clip{i}.wav")
+            sf.write(path, np.zeros(int(16000 * duration), dtype=np.int16), 16000)
+            jobs.append(BatchItemArgs(path, path + ".txt", "tiny", "cpu", "int8", False))
+        return jobs
+
+    @patch('src.scheduler.model_store.warm')
+    @patch('src.scheduler.process_input')
+    @patch('src.scheduler.ProcessPoolExecutor', InlinePool)
+    def test_run_schedules_longest_first(self, mock_process, mock_warm):
+        """Test that files are submitted longest first and results come back in input order"""
+        jobs = self.make_jobs([1.0, 3.0, 2.0])
+
+        results = TranscriptionScheduler(2, "tiny", cpu_threads=8).run(jobs)
+
+        pool = InlinePool.instances[-1]
+        self.assertEqual(pool.submitted, [jobs[1].input, jobs[2].input, jobs[0].input])
+        self.assertEqual(pool.initargs, ("tiny", "cpu", "int8", 4))
+        self.assertEqual([r.input for r in results], [job.input for job in jobs])
+        self.assertEqual([r.audio_seconds for r in results], [1.0, 3.0, 2.0])
+        self.assertTrue(all(r.status == "done" for r in results))
+        self.assertTrue(all(job.cpu_threads == 4 for job in jobs))
+        mock_warm.assert_called_once_with("tiny")
+
+    @patch('src.scheduler.model_store.warm')
+    @patch('src.scheduler.process_input')
+    @patch('src.scheduler.ProcessPoolExecutor', InlinePool)
+    def test_run_isolates_failures(self, mock_process, mock_warm):
+        """Test that a failing file is reported without affecting the others"""
+        jobs = self.make_jobs([1.0, 2.0, 1.5])
+
+        def process(args):
+            if args.input == jobs[1].input:
+                raise RuntimeError("corrupt audio")
+
+        mock_process.side_effect = process
+
+        results = TranscriptionScheduler(2, "tiny").run(jobs)
+
+        self.assertEqual([r.status for r in results], ["done", "failed", "done"])
+        self.assertEqual(results[1].error, "corrupt audio")
+        self.assertEqual(mock_process.call_count, 3)
+
+    def test_run_without_jobs(self):
+        """Test that an empty run starts no workers"""
+        self.assertEqual(TranscriptionScheduler(2).run([]), [])
+
+    def test_audio_duration_unknown_file(self):
+        """Test that unreadable files report zero duration"""
+        self.assertEqual(audio_duration(os.path.join(self.temp_dir, "missing.mp3")), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
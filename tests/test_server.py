@@ -0,0 +1,225 @@
+import asyncio
+import json
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from src.profiles import decoding_options
+from src.server import TranscriptionServer, TranscriptionService, split_batch_segments
+from src.transcriber import TranscriptSegment
+
+
+def whisper_segment(start, end, text):
+    return MagicMock(start=start, end=end, text=text, avg_logprob=-0.1, no_speech_prob=0.0, compression_ratio=1.0)
+
+
+async def request(port, method, path, body=b"", content_type="application/octet-stream"):
+    """Send one HTTP request and return (status, headers, body)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n"
+    writer.write(head.encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    head, _, payload = response.partition(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, payload.decode()
+
+
+class TestSplitBatchSegments(unittest.TestCase):
+    """Tests for mapping batched segments back to their clips"""
+
+    def test_segments_shifted_to_their_clips(self):
+        """Test that each segment lands in the clip containing its start"""
+        segments = [
+            TranscriptSegment(0.0, 2.0, " one"),
+            TranscriptSegment(2.0, 4.5, " two"),
+            TranscriptSegment(5.0, 9.0, " three"),
+        ]
+
+        results = split_batch_segments(segments, [2.0, 3.0, 4.0])
+
+        self.assertEqual([[s.text for s in r] for r in results], [[" one"], [" two"], [" three"]])
+        self.assertEqual((results[1][0].start, results[1][0].end), (0.0, 2.5))
+        self.assertEqual((results[2][0].start, results[2][0].end), (0.0, 4.0))
+
+
+class TestTranscriptionServer(unittest.IsolatedAsyncioTestCase):
+    """Tests for the HTTP transcription service on localhost"""
+
+    async def asyncSetUp(self):
+        """Start a server on a free port with a mocked model"""
+        self.whisper = MagicMock()
+        self.whisper.transcribe.return_value = ([whisper_segment(0.0, 1.5, " Olá mundo.")], None)
+        self.pipeline = MagicMock(model=self.whisper)
+
+        patches = [
+            patch('src.server.get_model', return_value=self.whisper),
+            patch('src.server.faster_whisper.BatchedInferencePipeline', return_value=self.pipeline),
+            patch('src.server.decode_audio', return_value=np.zeros(16000 * 2, dtype=np.float32)),
+            patch('src.server.index_transcript'),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    async def start_server(self, **options):
+        service = TranscriptionService(model="tiny", workers=1, **options)
+        self.server = TranscriptionServer(service)
+        await self.server.start(port=0)
+        self.addAsyncCleanup(self.server.stop)
+        return self.server.port
+
+    async def wait_done(self, port, job_id):
+        for _ in range(100):
+            _, _, body = await request(port, "GET", f"/jobs/{job_id}")
+            job = json.loads(body)
+            if job["status"] in ("done", "failed"):
+                return job
+            await asyncio.sleep(0.01)
+        self.fail("job did not finish")
+
+    async def test_upload_and_poll(self):
+        """Test that an uploaded clip is queued, transcribed and rendered"""
+        port = await self.start_server(batch_size=1)
+
+        status, headers, body = await request(port, "POST", "/jobs?filename=clip.wav&format=srt", b"RIFF")
+        self.assertEqual(status, 202)
+        job_id = json.loads(body)["id"]
+        self.assertEqual(headers["Location"], f"/jobs/{job_id}")
+
+        job = await self.wait_done(port, job_id)
+        self.assertEqual(job["text"], "Olá mundo.")
+
+        status, _, body = await request(port, "GET", f"/jobs/{job_id}/result")
+        self.assertEqual(status, 200)
+        self.assertEqual(body, "1\n00:00:00,000 --> 00:00:01,500\nOlá mundo.\n\n")
+
+    async def test_short_clips_batched(self):
+        """Test that short clips arriving together are decoded in one batch"""
+        self.pipeline.transcribe.return_value = (
+            [whisper_segment(0.0, 2.0, " first"), whisper_segment(2.0, 4.0, " second")], None
+        )
+        port = await self.start_server(batch_size=4, batch_window=0.2)
+
+        responses = await asyncio.gather(
+            request(port, "POST", "/jobs?filename=a.wav", b"a"),
+            request(port, "POST", "/jobs?filename=b.wav", b"b"),
+        )
+        jobs = [await self.wait_done(port, json.loads(body)["id"]) for _, _, body in responses]
+
+        self.pipeline.transcribe.assert_called_once()
+        self.assertEqual(sorted(job["text"] for job in jobs), ["first", "second"])
+        self.whisper.transcribe.assert_not_called()
+
+    async def test_auto_language_clips_not_batched(self):
+        """Test that clips detecting their own language are decoded one by one"""
+        port = await self.start_server(batch_size=4, batch_window=0.2)
+
+        responses = await asyncio.gather(
+            request(port, "POST", "/jobs?filename=a.wav&language=auto", b"a"),
+            request(port, "POST", "/jobs?filename=b.wav&language=auto", b"b"),
+        )
+        for _, _, body in responses:
+            await self.wait_done(port, json.loads(body)["id"])
+
+        self.pipeline.transcribe.assert_not_called()
+        self.assertEqual(self.whisper.transcribe.call_count, 2)
+
+    async def test_long_clip_does_not_break_batch(self):
+        """Test that a clip too long to batch waits its turn while short clips keep gathering"""
+        self.pipeline.transcribe.return_value = (
+            [whisper_segment(0.0, 2.0, " first"), whisper_segment(2.0, 4.0, " second")], None
+        )
+        long_audio = np.zeros(16000 * 60, dtype=np.float32)
+        short_audio = np.zeros(16000 * 2, dtype=np.float32)
+        patcher = patch('src.server.decode_audio', side_effect=lambda path, _: long_audio if path.endswith(".mp3") else short_audio)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        port = await self.start_server(batch_size=4, batch_window=0.3)
+
+        bodies = []
+        for name in ("a.wav", "long.mp3", "b.wav"):
+            _, _, body = await request(port, "POST", f"/jobs?filename={name}", name.encode())
+            bodies.append(body)
+        jobs = [await self.wait_done(port, json.loads(body)["id"]) for body in bodies]
+
+        self.pipeline.transcribe.assert_called_once()
+        self.assertEqual(len(self.pipeline.transcribe.call_args.args[0]), 16000 * 4)
+        self.whisper.transcribe.assert_called_once()
+        self.assertEqual([job["text"] for job in jobs], ["first", "Olá mundo.", "second"])
+
+    async def test_per_job_profile_and_language(self):
+        """Test that profile and language query parameters select the job's decoding options"""
+        port = await self.start_server(batch_size=1)
+
+        _, _, body = await request(port, "POST", "/jobs?filename=clip.wav&profile=fast&language=auto", b"RIFF")
+        await self.wait_done(port, json.loads(body)["id"])
+
+        options = self.whisper.transcribe.call_args.kwargs
+        self.assertEqual(options["beam_size"], 1)
+        self.assertIsNone(options["language"])
+
+    async def test_per_job_language_keeps_service_options(self):
+        """Test that a job changing only the language keeps the service's profile and overrides"""
+        port = await self.start_server(
+            batch_size=1, options=decoding_options("fast", "pt", {"initial_prompt": "Reunião de orçamento."})
+        )
+
+        _, _, body = await request(port, "POST", "/jobs?filename=clip.wav&language=en", b"RIFF")
+        await self.wait_done(port, json.loads(body)["id"])
+
+        options = self.whisper.transcribe.call_args.kwargs
+        self.assertEqual((options["beam_size"], options["language"]), (1, "en"))
+        self.assertEqual(options["initial_prompt"], "Reunião de orçamento.")
+
+    async def test_unknown_profile_rejected(self):
+        """Test that an unknown profile is a 400, not a queued job"""
+        port = await self.start_server()
+
+        status, _, body = await request(port, "POST", "/jobs?filename=clip.wav&profile=turbo", b"RIFF")
+
+        self.assertEqual(status, 400)
+        self.assertIn("turbo", json.loads(body)["error"])
+
+    async def test_queue_full_returns_503(self):
+        """Test backpressure when the worker is busy and the queue is at capacity"""
+        release = threading.Event()
+        self.whisper.transcribe.side_effect = lambda *args, **kwargs: (release.wait(5), ([], None))[1]
+        port = await self.start_server(max_queue=1, batch_size=1)
+        self.addCleanup(release.set)
+
+        # One job running, one held by the dispatcher waiting for the worker, one queued
+        for _ in range(3):
+            status, _, _ = await request(port, "POST", "/jobs?filename=clip.wav", b"RIFF")
+            self.assertEqual(status, 202)
+            await asyncio.sleep(0.05)
+
+        status, headers, _ = await request(port, "POST", "/jobs?filename=clip.wav", b"RIFF")
+
+        self.assertEqual(status, 503)
+        self.assertIn("Retry-After", headers)
+        release.set()
+
+    async def test_unknown_job_and_health(self):
+        """Test 404 for unknown jobs and the health document"""
+        port = await self.start_server()
+
+        status, _, _ = await request(port, "GET", "/jobs/missing")
+        self.assertEqual(status, 404)
+
+        status, _, body = await request(port, "GET", "/health")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body)["status"], "ok")
+
+        status, _, body = await request(port, "GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertIn("speech2text_stage_seconds_total", body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.transcriber import TranscriptSegment
+from src.transcript_index import TranscriptIndex, index_transcript, load_transcript
+from src.writers import get_writer
+
+
+class TestTranscriptIndex(unittest.TestCase):
+    """Tests for the full-text transcript index"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.index = TranscriptIndex(os.path.join(self.temp_dir, "transcripts.db"))
+        self.index.add("/archive/2024-01-10.wav", [
+            TranscriptSegment(0.0, 2.5, " Bom dia a todos."),
+            TranscriptSegment(2.5, 6.25, " Vamos falar do orçamento."),
+            TranscriptSegment(6.25, 9.0, " A reunião termina às cinco."),
+        ], params={"model": "large-v3", "beam_size": 5})
+        self.index.add("/archive/2024-02-03.wav", [
+            TranscriptSegment(60.0, 61.5, " O orçamento foi aprovado."),
+        ], params={"model": "small"})
+
+    def tearDown(self):
+        """Cleanup after each test"""
+        self.index.close()
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_search_returns_timestamps_in_milliseconds(self):
+        """Test that every matching segment is found with its source and timing"""
+        hits = self.index.search("orçamento")
+
+        self.assertEqual(sorted((hit.source, hit.start_ms, hit.end_ms) for hit in hits), [
+            ("/archive/2024-01-10.wav", 2500, 6250),
+            ("/archive/2024-02-03.wav", 60000, 61500),
+        ])
+        self.assertIn("[orçamento]", hits[0].snippet)
+
+    def test_search_ignores_case_and_accents(self):
+        """Test that queries match regardless of case and diacritics"""
+        self.assertEqual(len(self.index.search("ORCAMENTO")), 2)
+        self.assertEqual(len(self.index.search("reuniao cinco")), 1)
+        self.assertEqual(self.index.search("orçamento aprovado")[0].source, "/archive/2024-02-03.wav")
+
+    def test_search_filters(self):
+        """Test source globs, model filters and FTS5 syntax in raw mode"""
+        self.assertEqual(len(self.index.search("orçamento", source="/archive/2024-01-*")), 1)
+        self.assertEqual([hit.model for hit in self.index.search("orçamento", model="small")], ["small"])
+        self.assertEqual(len(self.index.search('"bom dia" OR aprovado', raw=True)), 2)
+        self.assertEqual(self.index.search('"unbalanced'), [])  # plain queries never raise syntax errors
+
+    def test_reindexing_replaces_a_source(self):
+        """Test that indexing a source again replaces its segments in the full-text index too"""
+        self.index.add("/archive/2024-02-03.wav", [TranscriptSegment(0.0, 1.0, " Outra coisa.")])
+
+        self.assertEqual(len(self.index.search("orçamento")), 1)
+        self.assertEqual(len(self.index.search("outra")), 1)
+        self.assertEqual(len(self.index.transcripts()), 2)
+        self.assertTrue(self.index.remove("/archive/2024-02-03.wav"))
+        self.assertEqual(self.index.search("outra"), [])
+
+    def test_at_returns_overlapping_segments(self):
+        """Test lookups by time within a recording"""
+        self.assertEqual([hit.text for hit in self.index.at("/archive/2024-01-10.wav", 3000)],
+                         ["Vamos falar do orçamento."])
+        self.assertEqual(len(self.index.at("/archive/2024-01-10.wav", 2000, 7000)), 3)
+
+    def test_transcripts_listing(self):
+        """Test the per-transcript summary"""
+        transcript = self.index.transcripts("/archive/2024-01-*")[0]
+
+        self.assertEqual((transcript.segments, transcript.duration_ms, transcript.model), (3, 9000, "large-v3"))
+        self.assertEqual(transcript.params["beam_size"], 5)
+        self.assertEqual(transcript.name, "2024-01-10.wav")
+
+    def test_incremental_append(self):
+        """Test that segments appended one by one are searchable immediately"""
+        transcript_id = self.index.begin("/live/transcription.txt")
+        self.index.append(transcript_id, [TranscriptSegment(0.0, 1.2, "primeira frase")])
+        self.assertEqual(len(self.index.search("primeira")), 1)
+
+        self.index.append(transcript_id, [TranscriptSegment(1.2, 3.0, "segunda frase")])
+        self.assertEqual(len(self.index.search("frase")), 2)
+
+    def test_index_transcript_respects_environment(self):
+        """Test the default index path and that SPEECH2TEXT_INDEX=off disables indexing"""
+        path = os.path.join(self.temp_dir, "default.db")
+        with patch.dict(os.environ, {"SPEECH2TEXT_INDEX": path}):
+            self.assertIsNotNone(index_transcript("/a.wav", [TranscriptSegment(0.0, 1.0, "texto")]))
+        with patch.dict(os.environ, {"SPEECH2TEXT_INDEX": "off"}):
+            self.assertIsNone(index_transcript("/b.wav", [TranscriptSegment(0.0, 1.0, "texto")]))
+
+        index = TranscriptIndex(path)
+        self.addCleanup(index.close)
+        self.assertEqual([t.source for t in index.transcripts()], ["/a.wav"])
+
+    def test_load_transcript_round_trips_writer_formats(self):
+        """Test that existing outputs can be indexed with their timings"""
+        segments = [TranscriptSegment(1.0, 2.5, " Olá."), TranscriptSegment(3661.25, 3662.0, " Tchau.")]
+        for output_format in ("jsonl", "srt", "vtt", "txt"):
+            path = os.path.join(self.temp_dir, f"out.{output_format}")
+            with open(path, "w", encoding="utf-8") as f:
+                writer = get_writer(output_format, f)
+                for segment in segments:
+                    writer.write(segment)
+                writer.close()
+
+            loaded = load_transcript(path)
+
+            if output_format == "txt":
+                self.assertEqual([s.text for s in loaded], ["Olá. Tchau."])
+            else:
+                self.assertEqual([(s.start, s.end, s.text.strip()) for s in loaded],
+                                 [(1.0, 2.5, "Olá."), (3661.25, 3662.0, "Tchau.")], output_format)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.batch import BatchItemArgs
+from src.watcher import JobLedger, PollingWatcher, WatchFolder, file_fingerprint, make_watcher
+
+
+class TestJobLedger(unittest.TestCase):
+    """Tests for the SQLite job ledger"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.ledger = JobLedger(os.path.join(self.temp_dir, "ledger.sqlite3"))
+
+    def tearDown(self):
+        """Cleanup after each test"""
+        self.ledger.close()
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def test_duplicate_content_is_not_queued(self):
+        """Test that a second file with an already queued fingerprint is recorded as a duplicate"""
+        job = self.ledger.add("a.wav", 10, 1, "abc", "a.txt")
+        duplicate = self.ledger.add("copy of a.wav", 10, 2, "abc", "copy of a.txt")
+
+        self.assertIsNotNone(job)
+        self.assertIsNone(duplicate)
+        self.assertTrue(self.ledger.known("copy of a.wav", 10, 2))
+        self.assertEqual(self.ledger.counts(), {"queued": 1, "duplicate": 1})
+
+    def test_claim_respects_limit_and_recover_requeues(self):
+        """Test that claim marks jobs running up to the limit, and recover queues them again"""
+        for name in ("a", "b", "c"):
+            self.ledger.add(f"{name}.wav", 10, 1, name, f"{name}.txt")
+
+        claimed = self.ledger.claim(2)
+
+        self.assertEqual([job.path for job in claimed], ["a.wav", "b.wav"])
+        self.assertEqual(claimed[0].attempts, 1)
+        self.assertEqual(self.ledger.recover(), 2)
+        self.assertEqual(self.ledger.counts(), {"queued": 3})
+
+    def test_failed_content_can_be_queued_again(self):
+        """Test that a file whose content previously failed is not treated as a duplicate"""
+        job = self.ledger.add("a.wav", 10, 1, "abc", "a.txt")
+        assert job is not None
+        self.ledger.finish(job.id, "failed", error="boom")
+
+        self.assertIsNotNone(self.ledger.add("a.wav", 10, 2, "abc", "a.txt"))
+        self.assertEqual(self.ledger.job(job.id).error, "boom")
+
+
+class TestWatchFolder(unittest.TestCase):
+    """Tests for watch-folder ingestion"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.input_dir = os.path.join(self.temp_dir, "inbox")
+        self.output_dir = os.path.join(self.temp_dir, "out")
+        os.makedirs(self.input_dir)
+        self.ledger = JobLedger(os.path.join(self.temp_dir, "ledger.sqlite3"))
+        template = BatchItemArgs("", "", "tiny", "cpu", "int8", False)
+        self.folder = WatchFolder(self.input_dir, self.output_dir, template, self.ledger, settle_s=2.0, polling=True)
+
+    def tearDown(self):
+        """Cleanup after each test"""
+        self.folder.close()
+        self.ledger.close()
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+
+    def write(self, name, data=b"audio"):
+        path = os.path.join(self.input_dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_file_is_queued_after_it_settles(self):
+        """Test that a file is only queued once it has been unchanged for settle_s"""
+        path = self.write("clip.wav")
+        self.write("notes.txt")
+
+        self.assertEqual(self.folder.scan(now=0.0), [])
+        self.assertEqual(self.folder.scan(now=1.0), [])
+        jobs = self.folder.scan(now=2.5)
+
+        self.assertEqual([job.path for job in jobs], [path])
+        self.assertEqual(jobs[0].output, os.path.join(self.output_dir, "clip.wav.txt"))
+        self.assertEqual(self.folder.scan(now=10.0), [])
+
+    def test_growing_file_restarts_settle_timer(self):
+        """Test that a file still being written is not queued"""
+        path = self.write("clip.wav")
+        self.folder.scan(now=0.0)
+        with open(path, "ab") as f:
+            f.write(b"more")
+
+        self.assertEqual(self.folder.scan(now=2.5), [])
+        self.assertEqual(len(self.folder.scan(now=5.0)), 1)
+
+    def test_copies_are_deduplicated(self):
+        """Test that a copy of an already queued recording is skipped"""
+        self.write("clip.wav")
+        self.write("clip copy.wav")
+        self.folder.scan(now=0.0)
+
+        self.assertEqual(len(self.folder.scan(now=3.0)), 1)
+        self.assertEqual(self.ledger.counts(), {"queued": 1, "duplicate": 1})
+
+    @patch('src.watcher.process_input')
+    def test_dispatch_processes_and_records_result(self, mock_process):
+        """Test that dispatched jobs run process_input and are marked done"""
+        path = self.write("clip.wav")
+        self.folder.scan(now=0.0)
+        job = self.folder.scan(now=3.0)[0]
+
+        self.assertEqual(self.folder.dispatch(), 1)
+        self.folder.close()
+
+        args = mock_process.call_args[0][0]
+        self.assertEqual((args.input, args.output, args.model), (path, job.output, "tiny"))
+        self.assertEqual(self.ledger.job(job.id).status, "done")
+
+    @patch('src.watcher.process_input', side_effect=RuntimeError("decode failed"))
+    def test_failures_are_recorded(self, mock_process):
+        """Test that a failing job is marked failed with its error"""
+        self.write("clip.wav")
+        self.folder.scan(now=0.0)
+        job = self.folder.scan(now=3.0)[0]
+
+        self.folder.dispatch()
+        self.folder.close()
+
+        self.assertEqual(self.ledger.job(job.id).status, "failed")
+        self.assertEqual(self.ledger.job(job.id).error, "decode failed")
+
+    @patch('src.watcher.get_model')
+    @patch('src.watcher.process_input')
+    def test_workers_share_one_model_with_replicas(self, mock_process, mock_get_model):
+        """Test that several workers get a model replica each and their jobs use the same settings"""
+        template = BatchItemArgs("", "", "tiny", "cpu", "int8", False, cpu_threads=8, draft_model="base")
+        folder = WatchFolder(self.input_dir, self.output_dir, template, self.ledger, workers=2, polling=True)
+        self.addCleanup(folder.close)
+        self.write("clip.wav")
+        folder.scan(now=0.0)
+        folder.scan(now=3.0)
+
+        folder.prewarm()
+        folder.dispatch()
+        folder.close()
+
+        self.assertEqual([call.args for call in mock_get_model.call_args_list],
+                         [("tiny", "cpu", "int8", 4, 2), ("base", "cpu", "int8", 4, 2)])
+        args = mock_process.call_args[0][0]
+        self.assertEqual((args.cpu_threads, args.model_workers), (4, 2))
+
+    def test_fingerprint_ignores_name(self):
+        """Test that identical content under different names has the same fingerprint"""
+        first = self.write("a.wav", b"x" * 3000)
+        second = self.write("b.wav", b"x" * 3000)
+        third = self.write("c.wav", b"x" * 2999 + b"y")
+
+        self.assertEqual(file_fingerprint(first, 1024), file_fingerprint(second, 1024))
+        self.assertNotEqual(file_fingerprint(first, 1024), file_fingerprint(third, 1024))
+
+    def test_fingerprint_covers_the_middle(self):
+        """Test that same-length files differing only away from their ends are told apart"""
+        silence = b"\x00" * 4096
+        first = self.write("a.wav", silence + b"bom dia" + silence)
+        second = self.write("b.wav", silence + b"boa dia" + silence)
+
+        self.assertNotEqual(file_fingerprint(first, 1024), file_fingerprint(second, 1024))
+
+    def test_polling_fallback(self):
+        """Test that polling is used when asked for"""
+        self.assertIsInstance(make_watcher(polling=True), PollingWatcher)
+
+
+if __name__ == '__main__':
+    unittest.main()
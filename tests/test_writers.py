@@ -0,0 +1,71 @@
+import io
+import json
+import unittest
+
+from src.transcriber import TranscriptSegment
+from src.writers import format_timestamp, get_writer, resolve_format
+
+
+class TestWriters(unittest.TestCase):
+    """Tests for incremental output writers"""
+
+    def setUp(self):
+        """Setup before each test"""
+        self.segments = [
+            TranscriptSegment(0.0, 2.5, " Olá a todos.", avg_logprob=-0.2, no_speech_prob=0.01),
+            TranscriptSegment(3661.25, 3663.0, " Até logo."),
+        ]
+
+    def render(self, output_format):
+        stream = io.StringIO()
+        writer = get_writer(output_format, stream)
+        for segment in self.segments:
+            writer.write(segment)
+        writer.close()
+        return stream.getvalue()
+
+    def test_format_timestamp(self):
+        """Test timestamp formatting for SRT and VTT"""
+        self.assertEqual(format_timestamp(3661.25), "01:01:01.250")
+        self.assertEqual(format_timestamp(59.9996, ","), "00:01:00,000")
+
+    def test_txt(self):
+        """Test plain text joins segments with single spaces"""
+        self.assertEqual(self.render("txt"), "Olá a todos. Até logo.")
+
+    def test_jsonl(self):
+        """Test one JSON record per segment with timings and scores"""
+        records = [json.loads(line) for line in self.render("jsonl").splitlines()]
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["text"], "Olá a todos.")
+        self.assertEqual(records[0]["avg_logprob"], -0.2)
+        self.assertEqual(records[1]["start"], 3661.25)
+
+    def test_srt(self):
+        """Test SubRip numbering and timestamps"""
+        self.assertEqual(
+            self.render("srt"),
+            "1\n00:00:00,000 --> 00:00:02,500\nOlá a todos.\n\n2\n01:01:01,250 --> 01:01:03,000\nAté logo.\n\n",
+        )
+
+    def test_vtt(self):
+        """Test WebVTT header and cues"""
+        output = self.render("vtt")
+
+        self.assertTrue(output.startswith("WEBVTT\n\n00:00:00.000 --> 00:00:02.500\nOlá a todos."))
+
+    def test_resolve_format(self):
+        """Test format selection from flag or extension"""
+        self.assertEqual(resolve_format("out.srt"), "srt")
+        self.assertEqual(resolve_format("out.srt", "jsonl"), "jsonl")
+        self.assertEqual(resolve_format("out.dat"), "txt")
+
+    def test_unknown_format(self):
+        """Test that unknown formats are rejected"""
+        with self.assertRaises(ValueError):
+            get_writer("docx", io.StringIO())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import argparse
+import os
+import signal
+import threading
+
+from src.autotune import resolve_device
+from src.batch import BatchItemArgs
+from src.cascade import DEFAULT_DRAFT_MODEL
+from src.logger import logger
+from src.metrics import metrics
+from src.profiles import DEFAULT_LANGUAGE, PROFILES, decoding_options, get_profile, parse_overrides
+from src.watcher import JobLedger, WatchFolder
+from src.writers import FORMATS
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Watch a folder and transcribe recordings as they arrive")
+
+    parser.add_argument("--input-dir", dest="input_dir", required=True,
+                        help="Directory to watch for audio files")
+
+    parser.add_argument("--output-dir", dest="output_dir", default="transcriptions",
+                        help="Directory for transcriptions (default: transcriptions/)")
+
+    parser.add_argument("--ledger", dest="ledger", default=None,
+                        help="SQLite job ledger (default: OUTPUT_DIR/ledger.sqlite3)")
+
+    parser.add_argument("--recursive", dest="recursive", action="store_true",
+                        help="Also watch subdirectories (mirrored in the output directory)")
+
+    parser.add_argument("--workers", dest="workers", type=int, default=1,
+                        help="Files transcribed at the same time on the shared model (default: 1)")
+
+    parser.add_argument("--settle", dest="settle", type=float, default=2.0,
+                        help="Seconds a file must stay unchanged before it is transcribed (default: 2)")
+
+    parser.add_argument("--poll-interval", dest="poll_interval", type=float, default=2.0,
+                        help="Seconds between scans when polling (default: 2)")
+
+    parser.add_argument("--polling", dest="polling", action="store_true",
+                        help="Scan on a timer instead of using inotify (e.g. for network shares)")
+
+    parser.add_argument("--format", dest="format", default="txt", choices=FORMATS,
+                        help="Output format: txt, jsonl, srt, vtt (default: txt)")
+
+    parser.add_argument("--profile", dest="profile", default=None, choices=list(PROFILES),
+                        help="Decoding profile: fast, balanced or accurate (default: accurate)")
+
+    parser.add_argument("--model", dest="model", default=None,
+                        choices=["tiny", "base", "small", "medium", "large-v3"],
+                        help="Whisper model (default: the profile's model)")
+
+    parser.add_argument("--language", dest="language", default=DEFAULT_LANGUAGE,
+                        help="Language code, or auto to detect it per file (default: pt)")
+
+    parser.add_argument("--decode-option", dest="decode_option", action="append", default=None, metavar="KEY=VALUE",
+                        help="Override a WhisperModel.transcribe option, e.g. beam_size=3 (repeatable)")
+
+    parser.add_argument("--device", dest="device", default="cpu", choices=["cpu", "cuda", "auto"],
+                        help="Processing device; auto uses the fastest calibrated configuration (default: cpu)")
+
+    parser.add_argument("--compute-type", dest="compute_type", default=None,
+                        choices=["int8", "int8_float16", "float16", "float32"],
+                        help="Quantization type (default: int8, or the tuned one with --device auto)")
+
+    parser.add_argument("--cpu-threads", dest="cpu_threads", type=int, default=0,
+                        help="CPU threads for transcription (default: 0 = all cores)")
+
+    parser.add_argument("--cascade", dest="draft_model", nargs="?", const=DEFAULT_DRAFT_MODEL, default=None,
+                        choices=["tiny", "base", "small", "medium"], metavar="DRAFT_MODEL",
+                        help="Draft with a fast model (default: small), re-decode low-confidence parts with --model")
+
+    parser.add_argument("--preprocess", dest="preprocess", action="store_true",
+                        help="Trim silence, shorten long pauses and normalize loudness before transcribing")
+
+    parser.add_argument("--denoise", dest="denoise", action="store_true",
+                        help="Also apply spectral-gating noise reduction (implies --preprocess)")
+
+    parser.add_argument("--no-cache", dest="no_cache", action="store_true",
+                        help="Always transcribe, ignoring and not storing cached results")
+
+    parser.add_argument("--metrics-events", dest="metrics_events", default=None, metavar="PATH",
+                        help="Append per-stage timing events as JSON lines to PATH (- for stderr)")
+
+    parser.add_argument("--metrics-file", dest="metrics_file", default=None, metavar="PATH",
+                        help="Keep Prometheus text metrics in PATH (for node_exporter's textfile collector)")
+
+    args = parser.parse_args()
+    metrics.configure(args.metrics_events, args.metrics_file)
+    model = args.model or get_profile(args.profile).model
+    try:
+        decode_options = parse_overrides(args.decode_option)
+        decoding_options(args.profile, args.language, decode_options)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if not os.path.isdir(args.input_dir):
+        logger.error(f"Directory {args.input_dir} not found!")
+        exit(1)
+
+    try:
+        device, compute_type, cpu_threads = resolve_device(model, args.device, args.compute_type, args.cpu_threads)
+        template = BatchItemArgs(
+            "", "", model, device, compute_type, keep_wav=False, cpu_threads=cpu_threads, no_cache=args.no_cache,
+            format=args.format, preprocess=args.preprocess, denoise=args.denoise, profile=args.profile,
+            language=args.language, decode_options=decode_options, draft_model=args.draft_model,
+        )
+        ledger = JobLedger(args.ledger or os.path.join(args.output_dir, "ledger.sqlite3"))
+        watcher = WatchFolder(
+            args.input_dir,
+            args.output_dir,
+            template,
+            ledger,
+            workers=args.workers,
+            settle_s=args.settle,
+            poll_interval=args.poll_interval,
+            recursive=args.recursive,
+            polling=args.polling,
+        )
+        # Load the model before the first file arrives
+        watcher.prewarm()
+    except Exception as e:
+        logger.error(f"Failed to start: {str(e)}")
+        exit(1)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    try:
+        watcher.run(stop)
+    except KeyboardInterrupt:
+        stop.set()
+        watcher.close()
+    finally:
+        logger.info(f"Ledger: {ledger.counts()}")
+        ledger.close()
+
+
+if __name__ == "__main__":
+    main()